@@ -8,9 +8,8 @@ Created on Mon Jun  1 19:27:43 2020.
 
 
 import numpy as _np
-import numba as _nb
 from ossom import Recorder, Player, Audio, Monitor, Configurations
-from ossom.utils import max_abs, rms, dB, Logger
+from ossom.utils import rms, dB, Logger, MetricsLog, WhiteNoise
 
 
 config = Configurations()
@@ -20,7 +19,7 @@ class LogMonitor(Logger, Monitor):
     """File logger based monitor."""
 
     def __init__(self, name: str = 'example', ext: str = 'log',
-                 samplerate: int = config.samplerate, waittime: float = 0.125,
+                 samplerate: int = None, waittime: float = 0.125,
                  title: str = 'Example logging.', logend: str = 'D End.') -> None:
         Logger.__init__(self, name, ext, title, logend)
         self.fclose()  # On windows it fails if the file is open on process start.
@@ -28,36 +27,27 @@ class LogMonitor(Logger, Monitor):
         return
 
     def setup(self):
-        """Open log file."""
+        """Open log files."""
         self.fopen()
         self.start_log()
+        self.metrics = MetricsLog(self.name, 'mlog', self._buffer.nchannels, ('rms', 'dB'))
         return
 
     def do_logging(self, data):
-        """Process and log."""
+        """Process and log, read back with `ossom.utils.load_metrics`."""
         RMS = rms(data)
-        db = dB(RMS)
-        self.log(f'Data shape={data.shape}\tRMS={RMS}\tdB={db}')
+        self.metrics.append(_np.vstack((RMS, dB(RMS))))
         return
 
     def tear_down(self):
-        """End the log and close file."""
+        """End the log and close files."""
+        self.metrics.close()
         self.end_log()
         self.fclose()
         return
 
 
-@_nb.njit
-def _noise(gain: float, samplerate: int, tlen: float, nchannels: int) -> _np.ndarray:
-    shape = (int(samplerate*tlen), nchannels)
-    noise = _np.zeros(shape, dtype=_np.float32)
-    noise[:] = _np.random.randn(*shape)
-    noise[:, ] /= max_abs(noise)
-    grms = 10**(gain/20)
-    return grms*noise
-
-
-def noise(gain: float = -6,
+def noise(gain: float = -15,
           samplerate: int = 48000,
           blocksize: int = 64,
           tlen: float = 5.0,
@@ -68,7 +58,7 @@ def noise(gain: float = -6,
     Parameters
     ----------
     gain : float, optional
-        DESCRIPTION. The default is 1/(2**0.5).
+        RMS level in dBFS. The default is -15., peaks stay under full scale.
     samplerate : int, optional
         DESCRIPTION. The default is 44100.
     buffersize : int, optional
@@ -84,7 +74,8 @@ def noise(gain: float = -6,
         DESCRIPTION.
 
     """
-    data = _noise(gain, samplerate, tlen, nchannels)
+    nsamples = int(samplerate*tlen)
+    data = WhiteNoise(samplerate, nchannels, gain, nsamples).read(nsamples)
     return Audio(data, samplerate, blocksize)
 
 
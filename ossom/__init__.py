@@ -7,13 +7,25 @@ Author: João Vitor Gutkoski Paes
 
 from . import utils
 from .configurations import Configurations
+from .devices import DeviceRegistry
+from .shmpool import SegmentPool
 from .audio import Audio, AudioBuffer
 from .streamer import Recorder, Player
-from .monitor import Monitor
+from .monitor import Monitor, MonitorStats
+from .results import ResultRing
+from .trigger import Trigger, LevelDetector, CrestDetector, EventSaver
+from .pipeline import Pipeline, Stage, StageBuffer
+from .measurement import SweepMeasurement
+from .tuner import AutoTuner, VirtualDevice
 
 __all__ = ['Audio', 'AudioBuffer',
            'Recorder', 'Player',
-           'Monitor',
-           'Configurations',
+           'Monitor', 'MonitorStats',
+           'ResultRing',
+           'Trigger', 'LevelDetector', 'CrestDetector', 'EventSaver',
+           'Pipeline', 'Stage', 'StageBuffer',
+           'SweepMeasurement',
+           'AutoTuner', 'VirtualDevice',
+           'Configurations', 'DeviceRegistry', 'SegmentPool',
            'utils']
 
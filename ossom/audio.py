@@ -3,7 +3,7 @@
 These classes are designed to provide objects that will handle reading and writing of audio data as numpy arrays.
 
 They are two: `Audio`, which is a read-only object, and `AudioBuffer`, that is a subclass
-of `Audio` and `multiprocessing.shared_memory.SharedMemory`, thus providing a cross-processes data read and write functionality.
+of `Audio` over a `multiprocessing.shared_memory.SharedMemory` segment, thus providing a cross-processes data read and write functionality.
 
 Created on Fri May 29 16:07:04 2020.
 
@@ -14,6 +14,7 @@ import numpy as np
 import multiprocessing as mp
 from multiprocessing import shared_memory as sm
 from ossom import Configurations
+from ossom.shmpool import pool
 
 
 config = Configurations()
@@ -23,7 +24,8 @@ class Audio(object):
     """Audio data interface."""
 
     def __init__(self, data: np.ndarray, samplerate: int,
-                 blocksize: int = config.blocksize) -> None:
+                 blocksize: int = None,
+                 source: 'AudioBuffer' = None) -> None:
         """
         Audio objects are a representation of a waveform and a sample rate.
 
@@ -37,7 +39,10 @@ class Audio(object):
             Audio sample rate, or how many data represent one second of data.
         blocksize : int, optional
             Amount of samples to read on each call to `next`.
-            The default is config.blocksize.
+            The default is None, which means config.blocksize.
+        source : AudioBuffer, optional
+            Buffer being written that `data` is a view of. Reading stops at its `available`
+            samples. The default is None.
 
         Returns
         -------
@@ -45,9 +50,10 @@ class Audio(object):
 
         """
         self._samplerate = int(samplerate)
-        self._blocksize = blocksize
+        self._blocksize = config.blocksize if blocksize is None else blocksize
         self._data = data.reshape((-1, 1)) if data.ndim < 2 else data
         self._ridx = int()
+        self._source = source
         return
 
     def __getitem__(self, key):
@@ -88,6 +94,97 @@ class Audio(object):
         self.ridx += blocksize
         return data
 
+    def frames(self, size: int, hop: int = None,
+               start: int = 0, stop: int = None,
+               pad: bool = False) -> np.ndarray:
+        """
+        Overlapping frames of data, as a strided view.
+
+        Frame `k` holds samples `start + k*hop` to `start + k*hop + size`, so the whole
+        batch can be processed by a single vectorized call.
+
+            >>> frms = audio.frames(1024, 256)
+            >>> frms.shape
+            (nframes, 1024, nchannels)
+
+        Parameters
+        ----------
+        size : int
+            Samples on each frame.
+        hop : int, optional
+            Samples between the start of consecutive frames. The default is None, which means `size`.
+        start : int, optional
+            First sample of the first frame. The default is 0.
+        stop : int, optional
+            Frames do not go past this sample. The default is None, which means `nsamples`.
+        pad : bool, optional
+            If True, a last incomplete frame is zero padded instead of dropped.
+            Padding needs a copy of data from `start` to `stop`. The default is False.
+
+        Raises
+        ------
+        ValueError
+            If `size` or `hop` are not positive.
+
+        Returns
+        -------
+        np.ndarray
+            Read-only array with shape `(nframes, size, nchannels)`.
+
+        """
+        hop = size if hop is None else int(hop)
+        if size < 1 or hop < 1:
+            raise ValueError("Frame size and hop must be positive.")
+        data = self.data[start:stop]
+        nsamples = data.shape[0]
+        if pad and nsamples > 0:
+            nframes = max(-(-(nsamples - size) // hop), 0) + 1
+            padded = np.zeros(((nframes - 1) * hop + size, self.nchannels), dtype=self.dtype)
+            padded[:nsamples] = data
+            data = padded
+        else:
+            nframes = (nsamples - size) // hop + 1 if nsamples >= size else 0
+        sstride, cstride = data.strides
+        return np.lib.stride_tricks.as_strided(data, (nframes, size, self.nchannels),
+                                               (hop * sstride, sstride, cstride),
+                                               writeable=False)
+
+    def read_frames(self, size: int, hop: int = None) -> np.ndarray:
+        """
+        Read all complete frames available from `ridx` on.
+
+        `ridx` advances by `nframes * hop`, so the next call continues exactly where
+        the last frame hop stopped and overlap is kept between calls.
+
+        Parameters
+        ----------
+        size : int
+            Samples on each frame.
+        hop : int, optional
+            Samples between the start of consecutive frames. The default is None, which means `size`.
+
+        Returns
+        -------
+        np.ndarray
+            Read-only array with shape `(nframes, size, nchannels)`. Can have zero frames.
+
+        """
+        hop = size if hop is None else int(hop)
+        frms = self.frames(size, hop, self.ridx, self.ridx + self.ready2read)
+        self.ridx += frms.shape[0] * hop
+        return frms
+
+    @property
+    def available(self) -> int:
+        """Samples that can be read, all of them or up to the `available` samples of the source buffer."""
+        return self.nsamples if self._source is None else min(self._source.available, self.nsamples)
+
+    @property
+    def ready2read(self) -> int:
+        """How many samples are left to read, up to `available`."""
+        dif = self.available - self.ridx
+        return dif if dif > 0 else 0
+
     @property
     def ridx(self) -> int:
         """Read data index."""
@@ -144,15 +241,26 @@ class Audio(object):
         return self.data.nbytes
 
 
-class AudioBuffer(Audio, sm.SharedMemory):
+class AudioBuffer(Audio):
     """Audio data in a shared memory buffer."""
 
+    _shm = None
+    _lease = None
+    _attached = False
+    _unlink = False
+
     def __init__(self, name: str, samplerate: int,
                  buffersize: int, nchannels: int,
-                 blocksize: int, dtype: np.dtype = config.dtype) -> None:
+                 blocksize: int, dtype: np.dtype = None,
+                 pooled: bool = True) -> None:
         """
         Buffer object intended to read and write audio samples.
 
+        Unnamed buffers take their memory from `ossom.shmpool.pool` and give it back
+        when deleted, instead of creating and unlinking a segment each time. Buffers
+        attached by name to a pool segment never unlink it, the pool owns it, and
+        the pool never hands it out again, see `SegmentPool.attach`.
+
         Parameters
         ----------
         name : str
@@ -166,34 +274,88 @@ class AudioBuffer(Audio, sm.SharedMemory):
         blocksize : int
             Amount of samples to read on each call to `next`
         dtype : np.dtype
-            Sample data type. The default is config.dtype.
+            Sample data type. The default is None, which means config.dtype.
+        pooled : bool, optional
+            Use the segment pool for unnamed buffers. The default is True.
 
         Returns
         -------
         None.
 
         """
+        dtype = config.dtype if dtype is None else np.dtype(dtype)
         sz = dtype.itemsize * buffersize * nchannels
 
-        if name is not None:
+        if name is not None and pool.owns(name):
+            self._shm, self._lease = pool.attach(name, sz)
+            self._attached = True
+        elif name is not None:
             try:
-                sm.SharedMemory.__init__(self, name)
+                self._shm = sm.SharedMemory(name)
             except FileNotFoundError:
-                sm.SharedMemory.__init__(self, name, create=True, size=sz)
+                self._shm = sm.SharedMemory(name, create=True, size=sz)
+            self._unlink = True
+        elif pooled:
+            self._name, self._lease = pool.acquire(sz)
         else:
-            sm.SharedMemory.__init__(self, create=True, size=sz)
-        buffer = np.ndarray((buffersize, nchannels),
-                            dtype=dtype, buffer=self.buf)
-        Audio.__init__(self, buffer, samplerate, buffersize)
+            self._shm = sm.SharedMemory(create=True, size=sz)
+            self._unlink = True
+        # Arrays from `frombuffer` hold the memory map, which cannot be closed under them.
+        buffer = np.frombuffer(self.buf, dtype=dtype, count=buffersize * nchannels)
+        Audio.__init__(self, buffer.reshape((buffersize, nchannels)), samplerate, blocksize)
         self._widx = mp.Value('i', int())
         self._full = mp.Event()
         self._full.clear()
         return
 
     def __del__(self):
-        """Guarantee that SharedMemory calls close and unlink."""
-        self.close()
-        self.unlink()
+        """Guarantee that SharedMemory calls close and unlink, or that the pool gets the segment back."""
+        try:
+            self.close()
+        except BufferError:
+            # Arrays taken from the buffer still use the memory, it is unmapped along with them.
+            pass
+        if self._unlink:
+            self.unlink()
+        return
+
+    @property
+    def name(self) -> str:
+        """Shared memory segment name, to attach to the buffer from other processes."""
+        return self._name if self._shm is None else self._shm.name
+
+    @property
+    def buf(self) -> memoryview:
+        """The buffer memory."""
+        return self._shm.buf if self._lease is None else memoryview(self._lease)
+
+    @property
+    def size(self) -> int:
+        """Size, in bytes, of `buf`."""
+        return self._shm.size if self._lease is None else self._lease.nbytes
+
+    def close(self) -> None:
+        """Unmap the shared memory, or hand a pool segment back once no array uses it."""
+        self._data = None
+        if self._attached:
+            self._attached = False
+            self._lease = None
+            pool.detach(self._shm)
+        elif self._lease is not None:
+            # The pool takes the segment back once arrays on the lease are gone too.
+            self._lease = None
+        elif self._shm is not None:
+            self._shm.close()
+        return
+
+    def unlink(self) -> None:
+        """Remove a segment created or attached by name, pool segments are removed by their pool."""
+        if self._unlink:
+            self._unlink = False
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
         return
 
     @property
@@ -208,6 +370,11 @@ class AudioBuffer(Audio, sm.SharedMemory):
             self._full.set()
         return
 
+    @property
+    def available(self) -> int:
+        """Samples other readers can use, the written ones. See `Audio.ready2read`."""
+        return self.widx
+
     @property
     def ready2read(self) -> int or None:
         """
@@ -221,7 +388,7 @@ class AudioBuffer(Audio, sm.SharedMemory):
             Amount of samples available to read.
 
         """
-        dif = self.widx - self.ridx
+        dif = self.available - self.ridx
         return dif if dif > 0 else 0
 
     @property
@@ -248,11 +415,13 @@ class AudioBuffer(Audio, sm.SharedMemory):
         Returns
         -------
         Audio
-            The buffer as a read-only Audio object.
+            The buffer as a read-only Audio object. Frames read from a view stop at the
+            samples written so far, see `available`.
 
         """
         return Audio(self.data if not copy else self.data.copy(),
-                     self.samplerate, blocksize=blocksize if blocksize else self.blocksize)
+                     self.samplerate, blocksize=blocksize if blocksize else self.blocksize,
+                     source=None if copy else self)
 
     def write_next(self, data: np.ndarray) -> int or None:
         """
@@ -10,9 +10,12 @@ Created on Sun Jun 28 21:40:13 2020
 """
 
 
+import os
+import json
 import numpy as _np
 import warnings
-from typing import Dict, List
+from typing import Dict, List, Tuple
+from .devices import registry as _registry
 
 
 _default = {
@@ -21,7 +24,9 @@ _default = {
     'buffersize': 480000,
     'dtype': _np.dtype('float32'),
     'channels': {'in': [0, 1],
-                 'out': [0, 1]}
+                 'out': [0, 1]},
+    'device': {'in': None,
+               'out': None}
 }
 
 
@@ -33,6 +38,7 @@ class Configurations:
     _buffersize: int = None
     _dtype: _np.dtype = None
     _channels: Dict[str, List[int]] = None
+    _device: Dict[str, str] = None
 
     _instance = None
 
@@ -66,7 +72,7 @@ class Configurations:
         return cls._instance
 
     def __repr__(self):
-        s = f"Configurations(\n\tsamplerate={self.samplerate},\n\tblocksize={self.blocksize},\n\tbuffersize={self.buffersize},\n\tdtype={self.dtype},\n\tchannels={self.channels})"
+        s = f"Configurations(\n\tsamplerate={self.samplerate},\n\tblocksize={self.blocksize},\n\tbuffersize={self.buffersize},\n\tdtype={self.dtype},\n\tchannels={self.channels},\n\tdevice={self.device})"
         return s
 
     @property
@@ -78,6 +84,7 @@ class Configurations:
     def samplerate(self, new: int):
         if 11025 <= new and new <= 192000:
             new = int(new)
+            self._check(samplerate=new)
             self._samplerate = new
         else:
             raise ValueError("Sample rate out of acceptable range [11025, 192000].")
@@ -136,7 +143,8 @@ class Configurations:
         if not isinstance(new, list):
             if not isinstance(new, int):
                 raise ValueError("The input channels must be an integer or a list of integers representing the device channels. Zero indexed.")
-            new = list(range(int))
+            new = list(range(new))
+        self._check(inChannels=new)
         self._channels['in'] = new
         return
 
@@ -150,8 +158,147 @@ class Configurations:
         if not isinstance(new, list):
             if not isinstance(new, int):
                 raise ValueError("The output channels must be an integer or a list of integers representing the device channels. Zero indexed.")
-            new = list(range(int))
-        self._channels['in'] = new
+            new = list(range(new))
+        self._check(outChannels=new)
+        self._channels['out'] = new
+        return
+
+    @property
+    def device(self) -> Tuple[str, str]:
+        """
+        Input and output devices, as soundcard ids. None means the system default.
+
+        May be set with positions on `list_devices`, soundcard ids or parts of the device names.
+        """
+        return self._device['in'], self._device['out']
+
+    @device.setter
+    def device(self, new: Tuple[int or str, int or str]):
+        inDevice, outDevice = new
+        self.inDevice = inDevice
+        self.outDevice = outDevice
+        return
+
+    @property
+    def inDevice(self) -> str:
+        """Input device soundcard id. None means the system default."""
+        return self._device['in']
+
+    @inDevice.setter
+    def inDevice(self, new: int or str):
+        info = _registry.validate('in', new, self.samplerate, self.inChannels)
+        self._device['in'] = None if new is None else info['id']
+        return
+
+    @property
+    def outDevice(self) -> str:
+        """Output device soundcard id. None means the system default."""
+        return self._device['out']
+
+    @outDevice.setter
+    def outDevice(self, new: int or str):
+        info = _registry.validate('out', new, self.samplerate, self.outChannels)
+        self._device['out'] = None if new is None else info['id']
+        return
+
+    def list_devices(self) -> str:
+        """Table of the available devices, numbered as expected by `device`."""
+        return _registry.table()
+
+    def _check(self, samplerate: int = None, inChannels: List[int] = None, outChannels: List[int] = None):
+        """Check new values against what is already known about the selected devices, without probing."""
+        samplerate = self.samplerate if samplerate is None else samplerate
+        for kind, channels in (('in', inChannels or self.inChannels), ('out', outChannels or self.outChannels)):
+            if self._device[kind] is not None:
+                _registry.validate(kind, self._device[kind], samplerate, channels, probe=False)
+        return
+
+    def validate(self):
+        """
+        Check sample rate and channels against the input and output devices.
+
+        Devices never used before are probed once, results are cached by `ossom.devices.registry`.
+
+        Raises
+        ------
+        ValueError
+            If a device does not support the configuration.
+
+        Returns
+        -------
+        None.
+
+        """
+        for kind, channels in (('in', self.inChannels), ('out', self.outChannels)):
+            _registry.validate(kind, self._device[kind], self.samplerate, channels)
+        return
+
+    @staticmethod
+    def profile_path(profile: str = 'default') -> str:
+        """File of a configuration profile, on an `ossom` folder of the user configuration directory."""
+        base = os.environ.get('XDG_CONFIG_HOME') or os.path.join(os.path.expanduser('~'), '.config')
+        return os.path.join(base, 'ossom', 'profiles', f'{profile}.json')
+
+    def save(self, profile: str = 'default') -> str:
+        """
+        Store the current values as a named profile, e.g. the result of `ossom.AutoTuner`.
+
+        Parameters
+        ----------
+        profile : str, optional
+            Profile name. The default is 'default'.
+
+        Returns
+        -------
+        str
+            The profile file.
+
+        """
+        values = dict(samplerate=self.samplerate, blocksize=self.blocksize,
+                      buffersize=self.buffersize, dtype=self.dtype.name,
+                      channels=self.channels, device=self.device)
+        filename = self.profile_path(profile)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        tmp = f'{filename}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as file:
+            json.dump(values, file, indent=1)
+        os.replace(tmp, filename)
+        return filename
+
+    def load(self, profile: str = 'default'):
+        """
+        Set the values stored on a named profile, through the usual checks.
+
+        Parameters
+        ----------
+        profile : str, optional
+            Profile name. The default is 'default'.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the profile was never saved.
+        ValueError
+            If a stored value is not accepted, in which case no value is changed.
+
+        Returns
+        -------
+        None.
+
+        """
+        with open(self.profile_path(profile), 'r') as file:
+            values = json.load(file)
+        # Checked on a detached instance, so a bad profile leaves the current values untouched.
+        staged = object.__new__(Configurations)
+        staged.reset()
+        staged.samplerate = values['samplerate']
+        staged.blocksize = values['blocksize']
+        staged.buffersize = values['buffersize']
+        staged.dtype = values['dtype']
+        staged.inChannels = values['channels']['in']
+        staged.outChannels = values['channels']['out']
+        staged.device = values['device']
+        self.__dict__.update(staged.__dict__)
         return
 
     def reset(self):
@@ -160,7 +307,8 @@ class Configurations:
         self._blocksize: int = _default['blocksize']
         self._buffersize: int = _default['buffersize']
         self._dtype: _np.dtype = _default['dtype']
-        self._channels: List[int] = _default['channels']
+        self._channels: Dict[str, List[int]] = {kind: list(chs) for kind, chs in _default['channels'].items()}
+        self._device: Dict[str, str] = dict(_default['device'])
         return
 
 config = Configurations()
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Audio device registry.
+
+Devices are enumerated through soundcard, and a device is probed, once, the first time a
+sample rate is validated on it, for the sample rates it accepts and the smallest latency
+reported by its streams. Results are kept on a JSON file, keyed by device identity, so later
+runs skip the enumeration and the probing and still fail fast on settings a device does not
+support. The system default device is asked to soundcard on every call, so changing it never
+needs a `refresh`, and using it does not enumerate the other devices.
+
+    >>> print(registry.table())
+    >>> registry.validate('in', 0, samplerate=96000, channels=[0, 1])
+    >>> registry.refresh()  # after plugging or unplugging devices
+
+Created on Mon Oct 19 2026
+"""
+
+import os
+import json
+import time
+import numpy as _np
+import soundcard as _sc
+from typing import List
+
+
+_RATES = (8000, 11025, 16000, 22050, 32000, 44100, 48000, 88200, 96000, 176400, 192000)
+_KINDS = {'in': 'input', 'out': 'output'}
+
+
+def _cachefile() -> str:
+    """Default cache path, on the user cache directory."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'ossom', 'devices.json')
+
+
+def _key(kind: str, id: str, name: str, channels: int) -> str:
+    """Identity of a device, its kind, soundcard id, name and channel count."""
+    return f'{kind}:{id}:{name}:{channels}'
+
+
+def _infokey(info: dict) -> str:
+    return _key(info['kind'], info['id'], info['name'], info['channels'])
+
+
+def _soundcards(kind: str) -> list:
+    if kind == 'in':
+        return _sc.all_microphones(include_loopback=True)
+    return _sc.all_speakers()
+
+
+def _default(kind: str):
+    return _sc.default_microphone() if kind == 'in' else _sc.default_speaker()
+
+
+class DeviceRegistry(object):
+    """Enumerated and probed audio devices, cached on disk."""
+
+    def __init__(self, cachefile: str = None,
+                 samplerates: tuple = _RATES,
+                 blocksize: int = 256) -> None:
+        """
+        Nothing is read nor enumerated until a device is asked for.
+
+        Parameters
+        ----------
+        cachefile : str, optional
+            JSON file with the results. The default is None, which means `devices.json`
+            on an `ossom` folder of the user cache directory.
+        samplerates : tuple, optional
+            Sample rates tried when probing. The default is the usual rates from 8 kHz to 192 kHz.
+        blocksize : int, optional
+            Samples per block of the probing streams. The default is 256.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.cachefile = _cachefile() if cachefile is None else cachefile
+        self.samplerates = tuple(int(fs) for fs in samplerates)
+        self.blocksize = int(blocksize)
+        self._cache = None
+        self._found = {}  # key: soundcard device, of the devices seen by this process
+        return
+
+    def _load(self) -> dict:
+        if self._cache is None:
+            try:
+                with open(self.cachefile, 'r') as file:
+                    self._cache = json.load(file)
+            except (OSError, ValueError):
+                self._cache = {}
+        self._cache.setdefault('devices', {})
+        return self._cache
+
+    def _save(self) -> None:
+        """Write the cache through a temporary file, readers never see it half written."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.cachefile)), exist_ok=True)
+        tmp = f'{self.cachefile}.{os.getpid()}.tmp'
+        with open(tmp, 'w') as file:
+            json.dump(self._cache, file, indent=1)
+        os.replace(tmp, self.cachefile)
+        return
+
+    def _info(self, kind: str, dev, known: dict) -> dict:
+        """Information of a soundcard device, from `known` if it is there."""
+        key = _key(kind, dev.id, dev.name, dev.channels)
+        self._found[key] = dev
+        return known.get(key) or dict(kind=kind, id=dev.id, name=dev.name, channels=int(dev.channels),
+                                      loopback=bool(getattr(dev, 'isloopback', False)),
+                                      samplerates=None, latency=None)
+
+    def _enumerate(self) -> None:
+        """List the soundcard devices, keeping what was already probed about the known ones."""
+        known = self._load()['devices']
+        devices = {}
+        for kind in _KINDS:
+            for dev in _soundcards(kind):
+                info = self._info(kind, dev, known)
+                devices[_infokey(info)] = info
+        self._cache = dict(devices=devices, enumerated=time.time())
+        self._save()
+        return
+
+    def _default(self, kind: str) -> dict or None:
+        """The current system default device, added to the cache if it is not there."""
+        try:
+            dev = _default(kind)
+        except Exception:
+            return None
+        devices = self._load()['devices']
+        info = self._info(kind, dev, devices)
+        if _infokey(info) not in devices:
+            devices[_infokey(info)] = info
+            self._save()
+        return info
+
+    def _probe(self, info: dict) -> dict:
+        """Open short streams on each sample rate and keep the ones that work."""
+        kind = info['kind']
+        dev = self._found.get(_infokey(info))
+        if dev is None:
+            for dev in _soundcards(kind):
+                if _key(kind, dev.id, dev.name, dev.channels) == _infokey(info):
+                    break
+            else:
+                raise ValueError(f"The {_KINDS[kind]} device '{info['name']}' is no longer available, "
+                                 "`refresh` the registry.")
+        channels = list(range(info['channels']))
+        rates, latencies = [], []
+        for fs in self.samplerates:
+            try:
+                if kind == 'in':
+                    with dev.recorder(fs, channels, self.blocksize) as stream:
+                        stream.record(self.blocksize)
+                        latency = getattr(stream, 'latency', None)
+                else:
+                    with dev.player(fs, channels, self.blocksize) as stream:
+                        stream.play(_np.zeros((self.blocksize, len(channels)), dtype='float32'))
+                        latency = getattr(stream, 'latency', None)
+            except Exception:
+                continue
+            rates.append(fs)
+            if latency:
+                latencies.append(float(latency))
+        info['samplerates'] = rates
+        info['latency'] = min(latencies) if latencies else None
+        info['probed'] = time.time()
+        self._save()
+        return info
+
+    def refresh(self, probe: bool = False) -> None:
+        """
+        Enumerate the devices again, e.g. after plugging or unplugging one.
+
+        Parameters
+        ----------
+        probe : bool, optional
+            Probe all devices again too, otherwise only new devices are probed, when
+            first asked for. The default is False.
+
+        Returns
+        -------
+        None.
+
+        """
+        if probe:
+            self._cache = {}
+        self._enumerate()
+        return
+
+    def devices(self, kind: str = None, loopback: bool = False) -> List[dict]:
+        """
+        Known devices, from the cache, in a stable order. Devices are enumerated on the
+        first call if the cache was never filled.
+
+        Parameters
+        ----------
+        kind : str, optional
+            'in' or 'out'. The default is None, which lists both.
+        loopback : bool, optional
+            List loopback inputs too. The default is False.
+
+        Returns
+        -------
+        List[dict]
+            One dictionary per device, with `kind`, `id`, `name`, `channels`, `loopback`,
+            `samplerates` and `latency`, in seconds. The last two are None before probing.
+
+        """
+        if not self._load().get('enumerated'):
+            self._enumerate()
+        devices = self._load()['devices'].values()
+        return [info for info in devices
+                if (kind is None or info['kind'] == kind) and (loopback or not info['loopback'])]
+
+    def find(self, id: int or str = None, kind: str = 'in', loopback: bool = False) -> dict:
+        """
+        Information of one device, enumerating again if it is not on the cache.
+
+        The default device is asked to soundcard on each call, without enumerating.
+
+        Parameters
+        ----------
+        id : int or str, optional
+            Position on `devices(kind, loopback)`, soundcard id or part of the name.
+            The default is None, which means the system default device.
+        kind : str, optional
+            'in' or 'out'. The default is 'in'.
+        loopback : bool, optional
+            Consider loopback inputs. The default is False.
+
+        Raises
+        ------
+        ValueError
+            If no device matches `id`.
+
+        Returns
+        -------
+        dict
+            See `devices`.
+
+        """
+        if kind not in _KINDS:
+            raise ValueError("Device kind must be 'in' or 'out'.")
+        for attempt in range(1 if id is None else 2):
+            if attempt:
+                self._enumerate()
+            info = self._match(id, kind, loopback)
+            if info is not None:
+                return info
+        raise ValueError(f"No {_KINDS[kind]} device matches {id!r}.")
+
+    def _match(self, id: int or str, kind: str, loopback: bool) -> dict or None:
+        if id is None:
+            return self._default(kind)
+        devices = self.devices(kind, loopback)
+        if isinstance(id, (int, _np.integer)):
+            return devices[id] if 0 <= id < len(devices) else None
+        for info in devices:
+            if info['id'] == id:
+                return info
+        for info in devices:
+            if id in info['name']:
+                return info
+        return None
+
+    def validate(self, kind: str = 'in', id: int or str = None,
+                 samplerate: int = None, channels: List[int] = None,
+                 loopback: bool = False, probe: bool = True) -> dict:
+        """
+        Check that a device supports the settings, raising before any stream is opened.
+
+        Only this device is probed, and only if a sample rate is given.
+
+        Parameters
+        ----------
+        kind : str, optional
+            'in' or 'out'. The default is 'in'.
+        id : int or str, optional
+            See `find`. The default is None, the system default device.
+        samplerate : int, optional
+            Sample rate to check. The default is None, no check.
+        channels : List[int], optional
+            Zero indexed device channels to check. The default is None, no check.
+        loopback : bool, optional
+            Consider loopback inputs. The default is False.
+        probe : bool, optional
+            Probe the device if it was never probed, otherwise the sample rate is only
+            checked on probed devices. The default is True.
+
+        Raises
+        ------
+        ValueError
+            If the device is unknown or does not support the settings.
+
+        Returns
+        -------
+        dict
+            Device information, see `devices`.
+
+        """
+        info = self.find(id, kind, loopback)
+        if channels is not None and len(channels) and max(channels) >= info['channels']:
+            raise ValueError(f"Device '{info['name']}' has {info['channels']} {_KINDS[kind]} channels, "
+                             f"channel {max(channels)} was requested. Zero indexed.")
+        if samplerate is not None:
+            if info['samplerates'] is None and probe:
+                self._probe(info)
+            if info['samplerates'] is not None and int(samplerate) not in info['samplerates']:
+                raise ValueError(f"Device '{info['name']}' does not support a sample rate of {samplerate}, "
+                                 f"only {info['samplerates']}.")
+        return info
+
+    def table(self, loopback: bool = False) -> str:
+        """Text table of the known devices, numbered as `find` expects."""
+        lines = []
+        for kind, title in _KINDS.items():
+            lines.append(f'{title.capitalize()} devices:')
+            default = self._default(kind)
+            for idx, info in enumerate(self.devices(kind, loopback)):
+                mark = '*' if default is not None and _infokey(info) == _infokey(default) else ' '
+                rates = '?' if info['samplerates'] is None else \
+                    ', '.join(f'{fs / 1000:g}k' for fs in info['samplerates'])
+                latency = '?' if info['latency'] is None else f"{info['latency'] * 1000:.1f} ms"
+                lines.append(f"{mark}{idx:3d}  {info['name']}  [{info['channels']} ch, {rates}, {latency}]")
+        return '\n'.join(lines)
+
+
+registry = DeviceRegistry()
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Impulse response measurement with exponential sine sweeps.
+
+The sweep is synchronized, so the harmonic distortion products of every order land at
+known times before the linear impulse response and can be cut apart. Deconvolution is a
+single FFT of all recorded channels times an inverse filter that is computed once per
+sweep and FFT size.
+
+    >>> meas = SweepMeasurement(48000, freqMin=20., freqMax=20000., duration=5.)
+    >>> ir = meas.measure(player, recorder)  # Audio with one impulse response per channel
+    >>> linear, second, third = meas.harmonics(3)
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+from functools import lru_cache
+from ossom import Audio, Configurations
+from ossom.utils.generators import Sweep
+
+
+config = Configurations()
+
+
+@lru_cache(maxsize=16)
+def _sweep(samplerate: int, freqMin: float, freqMax: float,
+           duration: float, fade: float) -> np.ndarray:
+    """Unitary amplitude sweep with half Hann fade in and out, read-only."""
+    gen = Sweep(samplerate, 1, 20 * np.log10(np.sqrt(0.5)), duration, freqMin, freqMax, 'exp')
+    sweep = gen.read(gen.nsamples)[:, 0].astype(np.float64)
+    nfade = min(int(fade * samplerate), sweep.shape[0] // 2)
+    if nfade:
+        ramp = 0.5 - 0.5 * np.cos(np.pi * np.arange(nfade) / nfade)
+        sweep[:nfade] *= ramp
+        sweep[-nfade:] *= ramp[::-1]
+    sweep.flags.writeable = False
+    return sweep
+
+
+@lru_cache(maxsize=16)
+def _inverse(samplerate: int, freqMin: float, freqMax: float, duration: float,
+             fade: float, nfft: int, regularization: float) -> np.ndarray:
+    """
+    Regularized inverse of the sweep spectrum, read-only.
+
+    Inside the swept band the regularization is `regularization` times the greatest sweep
+    power, outside it is the greatest sweep power, so out of band noise is not amplified.
+    """
+    spec = np.fft.rfft(_sweep(samplerate, freqMin, freqMax, duration, fade), n=nfft)
+    power = spec.real**2 + spec.imag**2
+    freqs = np.fft.rfftfreq(nfft, 1 / samplerate)
+    eps = np.where((freqs >= freqMin) & (freqs <= freqMax), regularization, 1.) * power.max()
+    inv = np.conj(spec) / (power + eps)
+    inv.flags.writeable = False
+    return inv
+
+
+class SweepMeasurement(object):
+    """Synchronized exponential sweep impulse response measurement."""
+
+    def __init__(self, samplerate: int = None,
+                 freqMin: float = 20.,
+                 freqMax: float = 20000.,
+                 duration: float = 5.,
+                 level: float = -6.,
+                 silence: float = 2.,
+                 fade: float = 0.01,
+                 regularization: float = 1e-6) -> None:
+        """
+        Sweep excitation and its inverse filter.
+
+        The sweep rate is rounded so `freqMin` times the rate is an integer, which keeps the
+        phase of all harmonics synchronized. `duration` is adjusted accordingly.
+
+        Parameters
+        ----------
+        samplerate : int, optional
+            Sample rate. The default is None, which means config.samplerate.
+        freqMin : float, optional
+            Start frequency. The default is 20..
+        freqMax : float, optional
+            End frequency. The default is 20000..
+        duration : float, optional
+            Approximate sweep duration, in seconds. The default is 5..
+        level : float, optional
+            Peak level of the sweep, in dBFS. The default is -6..
+        silence : float, optional
+            Recording time after the sweep, must hold the decay of the system. The default is 2..
+        fade : float, optional
+            Fade in and out duration, in seconds. The default is 0.01.
+        regularization : float, optional
+            Relative regularization of the inverse filter within the swept band. The default is 1e-6.
+
+        Raises
+        ------
+        ValueError
+            If frequencies are not increasing and below Nyquist frequency.
+
+        Returns
+        -------
+        None.
+
+        """
+        samplerate = config.samplerate if samplerate is None else samplerate
+        if not 0 < freqMin < freqMax <= samplerate / 2:
+            raise ValueError("Sweep frequencies must increase from above zero up to Nyquist frequency.")
+        self.samplerate = samplerate
+        self.freqMin = freqMin
+        self.freqMax = freqMax
+        rate = max(round(freqMin * duration / np.log(freqMax / freqMin)), 1) / freqMin
+        self.rate = rate
+        self.duration = rate * np.log(freqMax / freqMin)
+        self.level = level
+        self.silence = silence
+        self.fade = fade
+        self.regularization = regularization
+        self._ir = None
+        return
+
+    @property
+    def sweep(self) -> np.ndarray:
+        """The sweep at `level`, with shape (nsamples,)."""
+        return 10**(self.level / 20) * self._sweep()
+
+    @property
+    def nsamples(self) -> int:
+        """Sweep length, in samples."""
+        return self._sweep().shape[0]
+
+    @property
+    def nrecord(self) -> int:
+        """Samples to record, sweep and silence."""
+        return self.nsamples + int(self.silence * self.samplerate)
+
+    @property
+    def ir(self) -> Audio or None:
+        """The last impulse responses, with harmonics at the end, from `deconvolve` or `measure`."""
+        return self._ir
+
+    def _sweep(self) -> np.ndarray:
+        return _sweep(self.samplerate, self.freqMin, self.freqMax, self.duration, self.fade)
+
+    def nfft(self, nsamples: int) -> int:
+        """FFT size to deconvolve `nsamples` recorded samples, without circular aliasing."""
+        return 1 << int(np.ceil(np.log2(nsamples + self.nsamples)))
+
+    def inverse(self, nfft: int) -> np.ndarray:
+        """Cached inverse filter spectrum for FFT size `nfft`, for a unitary amplitude sweep."""
+        return _inverse(self.samplerate, self.freqMin, self.freqMax, self.duration,
+                        self.fade, int(nfft), self.regularization)
+
+    def excitation(self, nchannels: int = 1, blocksize: int = None) -> Audio:
+        """
+        The sweep followed by `silence`, the same on all channels, to be played.
+
+        Parameters
+        ----------
+        nchannels : int, optional
+            Number of output channels. The default is 1.
+        blocksize : int, optional
+            Audio block size. The default is None, which means config.blocksize.
+
+        Returns
+        -------
+        Audio
+            The excitation. Channels are views of a single column.
+
+        """
+        data = np.zeros(self.nrecord, dtype=config.dtype)
+        data[:self.nsamples] = self.sweep
+        return Audio(np.broadcast_to(data[:, None], (self.nrecord, nchannels)),
+                     self.samplerate, config.blocksize if blocksize is None else blocksize)
+
+    def deconvolve(self, recording) -> Audio:
+        """
+        Impulse responses of all recorded channels at once.
+
+        The linear response starts at the first sample and harmonic distortion products
+        are at the end, see `harmonics`.
+
+        Parameters
+        ----------
+        recording : Audio
+            An `Audio`, `AudioBuffer` or array with the recorded sweep, with shape (nsamples, nchannels).
+
+        Returns
+        -------
+        Audio
+            Impulse responses, with shape (nfft, nchannels).
+
+        """
+        data = recording.data if isinstance(recording, Audio) else np.asarray(recording)
+        if data.ndim < 2:
+            data = data.reshape((-1, 1))
+        nfft = self.nfft(data.shape[0])
+        spec = np.fft.rfft(data, n=nfft, axis=0)
+        spec *= self.inverse(nfft)[:, None] / 10**(self.level / 20)
+        self._ir = Audio(np.fft.irfft(spec, n=nfft, axis=0), self.samplerate)
+        return self._ir
+
+    def measure(self, player, recorder, margin: float = 0.5, timeout: float = 5.) -> Audio:
+        """
+        Play the sweep and record the response, then deconvolve.
+
+        Recording starts before playback, so the impulse responses include the latency
+        of the whole chain, see `ossom.utils.LatencyEstimator` to find it with a loopback channel.
+
+        Parameters
+        ----------
+        player : Player
+            The output, the sweep is played on all of its channels.
+        recorder : Recorder
+            The input, all of its channels are deconvolved.
+        margin : float, optional
+            Extra recording time, in seconds, to hold the latency. The default is 0.5.
+        timeout : float, optional
+            Seconds to wait for the recorder to start and, in addition to the excitation
+            length, for it to finish. The default is 5..
+
+        Raises
+        ------
+        TimeoutError
+            If the recorder does not start or finish in time.
+
+        Returns
+        -------
+        Audio
+            Impulse responses, see `deconvolve`.
+
+        """
+        recorder(self.nrecord / self.samplerate + margin)
+        try:
+            if not recorder.running.wait(timeout):
+                raise TimeoutError("Recorder did not start.")
+            player(self.excitation(player.nchannels), blocking=True)
+            if not recorder.finished.wait(margin + timeout):
+                raise TimeoutError("Recorder did not finish.")
+        finally:
+            recorder.stop()
+        return self.deconvolve(recorder.data[:recorder.widx])
+
+    def delays(self, order: int) -> np.ndarray:
+        """Time advance of harmonics 1 to `order` relative to the linear response, in samples."""
+        return self.rate * np.log(np.arange(1, order + 1)) * self.samplerate
+
+    def harmonics(self, order: int = 5, length: int = None, ir: Audio = None) -> list:
+        """
+        Separate the linear response and the harmonic distortion products.
+
+        Harmonic `k` of a synchronized sweep is advanced by `rate * ln(k)` seconds, so on the
+        circular impulse response it sits that far before the end.
+
+        Parameters
+        ----------
+        order : int, optional
+            Highest harmonic. The default is 5.
+        length : int, optional
+            Samples of each response. The default is None, which is the spacing between the
+            two highest harmonics, so the responses do not overlap.
+        ir : Audio, optional
+            Impulse responses from `deconvolve`. The default is None, which is the last one.
+
+        Returns
+        -------
+        list
+            `order` `Audio` objects, the linear response first, each with shape (length, nchannels).
+            All are views of `ir` except harmonics that wrap around its end.
+
+        """
+        ir = self._ir if ir is None else ir
+        if ir is None:
+            raise ValueError("No impulse response yet, call `deconvolve` or `measure` first.")
+        delays = self.delays(max(order, 2))
+        if length is None:
+            length = int(delays[-1] - delays[-2])
+        # A short lead catches the onset of each response, as the harmonic delays are fractional.
+        lead = min(length // 16, 64)
+        out = []
+        for k, delay in enumerate(delays[:order]):
+            start = (-int(np.round(delay)) - lead) % ir.nsamples if k else 0
+            if start + length <= ir.nsamples:
+                data = ir.data[start:start + length]
+            else:
+                data = np.take(ir.data, np.arange(start, start + length), axis=0, mode='wrap')
+            out.append(Audio(data, self.samplerate))
+        return out
@@ -9,42 +9,276 @@ Created on Sat Jun 27 20:25:33 2020
 
 import numpy as np
 import time
+import sys
+import math
 import multiprocessing as mp
-from ossom import Recorder, Player, Configurations
-from typing import Union
+from ossom import Recorder, Player, Configurations, utils
+from typing import Union, TextIO
 
 
 config = Configurations()
 
 
+class MonitorStats(object):
+    """Loop timing and lag statistics of a `Monitor`."""
+
+    _fields = ('count', 'total', 'last', 'max', 'lastlag', 'maxlag', 'lastjitter', 'maxjitter', 'underruns')
+
+    def __init__(self, samplerate: int = None,
+                 nbins: int = 32, minduration: float = 1e-6) -> None:
+        """
+        Counters and histograms shared between the monitoring process and its parent.
+
+        Everything is stored on `multiprocessing.Array`s, so reading the statistics
+        from the parent process is just a memory access.
+
+        Histograms have logarithmic bins. Bin `k` counts values lower than `edges[k]`
+        and greater or equal to `edges[k-1]`, the last bin also counts any greater value.
+
+            >>> stats = monitor.stats
+            >>> edges, counts = stats.duration_histogram()
+            >>> print(stats)
+
+        Parameters
+        ----------
+        samplerate : int, optional
+            Sample rate used to convert lag from samples to seconds.
+            The default is None, which means config.samplerate.
+        nbins : int, optional
+            Number of histogram bins. The default is 32.
+        minduration : float, optional
+            Upper edge of the first duration bin, in seconds. The default is 1e-6.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.samplerate = config.samplerate if samplerate is None else samplerate
+        self._minduration = minduration
+        self._durations = mp.Array('L', nbins, lock=False)
+        self._lags = mp.Array('L', nbins, lock=False)
+        self._values = mp.Array('d', len(self._fields), lock=False)
+        return
+
+    def __repr__(self):
+        return f"MonitorStats({', '.join(f'{k}={v}' for k, v in self.summary().items())})"
+
+    def __str__(self):
+        return (f"count={self.count}\t" +
+                f"target(mean={1e3*self.mean_duration:.3f}ms, max={1e3*self.max_duration:.3f}ms)\t" +
+                f"lag(last={self.last_lag}, max={self.max_lag}, underruns={self.underruns})\t" +
+                f"jitter(max={1e3*self.max_jitter:.3f}ms)")
+
+    @property
+    def nbins(self) -> int:
+        """Number of histogram bins."""
+        return len(self._durations)
+
+    @property
+    def count(self) -> int:
+        """Amount of `target` calls measured."""
+        return int(self._values[0])
+
+    @property
+    def mean_duration(self) -> float:
+        """Mean time spent on `target`, in seconds."""
+        return self._values[1] / self._values[0] if self._values[0] else 0.
+
+    @property
+    def last_duration(self) -> float:
+        """Time spent on the last `target` call, in seconds."""
+        return self._values[2]
+
+    @property
+    def max_duration(self) -> float:
+        """Longest time spent on a single `target` call, in seconds."""
+        return self._values[3]
+
+    @property
+    def last_lag(self) -> int:
+        """Samples written but not yet read after the last read."""
+        return int(self._values[4])
+
+    @property
+    def max_lag(self) -> int:
+        """Greatest writer to reader lag, in samples."""
+        return int(self._values[5])
+
+    @property
+    def last_jitter(self) -> float:
+        """Delay of the last wake up relative to the scheduled time, in seconds."""
+        return self._values[6]
+
+    @property
+    def max_jitter(self) -> float:
+        """Greatest wake up delay, in seconds."""
+        return self._values[7]
+
+    @property
+    def underruns(self) -> int:
+        """Amount of reads that went past the write index, i.e. read data not yet written."""
+        return int(self._values[8])
+
+    def record(self, duration: float, lag: int, jitter: float = 0.) -> None:
+        """
+        Account for one monitoring iteration.
+
+        Parameters
+        ----------
+        duration : float
+            Time spent on `target`, in seconds.
+        lag : int
+            Samples available to read after the read was made.
+            A negative value counts as an underrun and zero lag.
+        jitter : float, optional
+            Wake up delay relative to the scheduled time. The default is 0..
+
+        Returns
+        -------
+        None.
+
+        """
+        last = self.nbins - 1
+        vals = self._values
+        if lag < 0:
+            vals[8] += 1
+            lag = 0
+        lag = int(lag)
+        self._durations[min(max(math.frexp(duration / self._minduration)[1], 0), last)] += 1
+        self._lags[min(math.frexp(lag)[1], last)] += 1
+        vals[0] += 1
+        vals[1] += duration
+        vals[2] = duration
+        vals[3] = max(vals[3], duration)
+        vals[4] = lag
+        vals[5] = max(vals[5], lag)
+        vals[6] = jitter
+        vals[7] = max(vals[7], jitter)
+        return
+
+    def duration_histogram(self) -> (np.ndarray, np.ndarray):
+        """
+        Histogram of the time spent on `target` calls.
+
+        Returns
+        -------
+        edges : np.ndarray
+            Upper edge of each bin, in seconds.
+        counts : np.ndarray
+            Amount of calls on each bin.
+
+        """
+        edges = self._minduration * 2.**np.arange(self.nbins)
+        return edges, np.array(self._durations[:], dtype=np.uint64)
+
+    def lag_histogram(self) -> (np.ndarray, np.ndarray):
+        """
+        Histogram of the writer to reader lag.
+
+        Returns
+        -------
+        edges : np.ndarray
+            Upper edge of each bin, in samples.
+        counts : np.ndarray
+            Amount of reads on each bin.
+
+        """
+        edges = 2**np.arange(self.nbins, dtype=np.uint64)
+        return edges, np.array(self._lags[:], dtype=np.uint64)
+
+    def summary(self) -> dict:
+        """
+        All scalar statistics as a dictionary.
+
+        Durations and jitter are in seconds and lags in samples. The `latency` entry is
+        the last lag converted to seconds, i.e. how old the data was when read.
+
+        Returns
+        -------
+        dict
+            The statistics.
+
+        """
+        return {'count': self.count,
+                'mean_duration': self.mean_duration,
+                'last_duration': self.last_duration,
+                'max_duration': self.max_duration,
+                'last_lag': self.last_lag,
+                'max_lag': self.max_lag,
+                'latency': self.last_lag / self.samplerate,
+                'last_jitter': self.last_jitter,
+                'max_jitter': self.max_jitter,
+                'underruns': self.underruns}
+
+    def dump(self, file: TextIO = None) -> None:
+        """Write a one line summary to `file`, defaults to `sys.stderr`."""
+        file = sys.stderr if file is None else file
+        file.write(f"{time.monotonic():.6f} : {self}\n")
+        file.flush()
+        return
+
+    def reset(self) -> None:
+        """Set all counters and histograms to zero."""
+        self._durations[:] = [0] * self.nbins
+        self._lags[:] = [0] * self.nbins
+        self._values[:] = [0.] * len(self._fields)
+        return
+
+
 class Monitor(object):
     """Monitor class."""
 
     def __init__(self,
                  target: callable = lambda x: x,
-                 samplerate: int = config.samplerate,
+                 samplerate: int = None,
                  waittime: float = 1.,
-                 args: tuple = (0,)):
+                 args: tuple = (0,),
+                 dumptime: float = None,
+                 dumpfile: TextIO = None,
+                 warmup: bool = True):
         """
         Control a multiprocessing.Process to visualize data from recording or playing.
 
+        Every iteration is timed and accounted on `stats`, a `MonitorStats` object
+        that can be read from any process while the monitor runs.
+
         Parameters
         ----------
         target : callable, optional
             DESCRIPTION. The default is None.
+        samplerate : int, optional
+            Sample rate of the monitored stream. The default is None, which means config.samplerate.
+        waittime : float, optional
+            Seconds between reads. The default is 1..
         args : tuple, optional
             DESCRIPTION. The default is None.
+        dumptime : float, optional
+            If given, write a `stats` summary to `dumpfile` every `dumptime` seconds.
+            The default is None.
+        dumpfile : TextIO, optional
+            Where to dump `stats`. The default is None, which means `sys.stderr`.
+        warmup : bool, optional
+            Compile all numba functions for the stream data type when the monitor is
+            configured, before its process starts, and then only load them from the
+            on-disk cache on the monitoring process. See `ossom.utils.warmup`.
+            The default is True.
 
         Returns
         -------
         None.
 
         """
+        samplerate = config.samplerate if samplerate is None else samplerate
         self.target = target
         self.waitTime = waittime
         self.samplerate = samplerate
         self.readLen = int(np.ceil(waittime * samplerate))
         self.args = args
+        self.dumpTime = dumptime
+        self.dumpFile = dumpfile
+        self.warmup = warmup
+        self.stats = MonitorStats(samplerate)
         return
 
     def __call__(self, strm: Union[Recorder, Player] = None, blocksize: int = None):
@@ -65,7 +299,13 @@ class Monitor(object):
         """
         self.running = strm.running
         self.finished = strm.finished
+        self._streamer = strm
+        # Players advance what they played, recorders and stages what they wrote.
+        self._played = isinstance(strm, Player)
         self._buffer = strm.get_buffer(blocksize=self.readLen)
+        self.stats.reset()
+        if self.warmup:
+            utils.warmup(self._buffer.dtype, self._buffer.nchannels, process=True)
         # assert self.buffer.data is strm.data
         self._process = mp.Process(target=self._loop)
         return
@@ -92,16 +332,27 @@ class Monitor(object):
         None.
 
         """
+        if self.warmup:
+            utils.warmup(self._buffer.dtype, self._buffer.nchannels)
         self.setup()
         self.running.wait()
         time.sleep(0.25)
-        self.nextTime = time.time() + self.waitTime
+        self.nextTime = time.monotonic() + self.waitTime
+        nextDump = self.nextTime + self.dumpTime if self.dumpTime else None
         while self.running.is_set():
-            sleepTime = self.nextTime - time.time()
+            sleepTime = self.nextTime - time.monotonic()
             if sleepTime > 0.:
                 time.sleep(sleepTime)
-            self.target(self._buffer.read_next(self.readLen), *self.args)
-            self.nextTime = time.time() + self.waitTime
+            wakeTime = time.monotonic()
+            data = self._buffer.read_next(self.readLen)
+            lag = (self._streamer.played if self._played else self._streamer.widx) - self._buffer.ridx
+            self.target(data, *self.args)
+            doneTime = time.monotonic()
+            self.stats.record(doneTime - wakeTime, lag, wakeTime - self.nextTime)
+            if nextDump is not None and doneTime >= nextDump:
+                self.stats.dump(self.dumpFile)
+                nextDump = doneTime + self.dumpTime
+            self.nextTime = doneTime + self.waitTime
             if self.finished.is_set():
                 break
         self.tear_down()
@@ -0,0 +1,317 @@
+# -*- coding: utf-8 -*-
+"""
+Chain processing stages on different processes, connected by `AudioBuffer`s.
+
+Each `Stage` reads blocks from one buffer, which can be a `Recorder` or the output of
+another stage, applies its function and writes the result to its own output buffer.
+A `Pipeline` builds the graph from a declarative list of stages, starts them from the
+last to the first, and shutdown propagates downstream through the `running` and
+`finished` events of every buffer.
+
+    >>> rec = Recorder()
+    >>> pipe = Pipeline(rec, [Stage('filter', highpass),
+    ...                       Stage('levels', rms, 'filter', nchannels=2),
+    ...                       Stage('store', saver, 'levels', nchannels=None)])
+    >>> pipe.start()
+    >>> rec(60., blocking=True)
+    >>> pipe.wait()
+    >>> pipe.metrics()
+
+Stage outputs behave like streamers, so a `Monitor` can watch any of them:
+
+    >>> mon(pipe['filter'])
+
+Created on Mon Oct 19 2026
+"""
+
+import time
+import numpy as np
+import threading as td
+import multiprocessing as mp
+from ossom import Audio, AudioBuffer, Configurations
+from typing import List, Dict
+
+
+config = Configurations()
+
+
+class StageBuffer(AudioBuffer):
+    """Output buffer of a `Stage`, with the same events as streamers."""
+
+    def __init__(self, samplerate: int, buffersize: int, nchannels: int,
+                 blocksize: int, dtype: np.dtype = None) -> None:
+        AudioBuffer.__init__(self, None, samplerate, buffersize, nchannels, blocksize, dtype)
+        self.running = mp.Event()
+        self.finished = mp.Event()
+        return
+
+    def get_buffer(self, blocksize: int = None) -> Audio:
+        """`Audio` view of the buffer, for monitors."""
+        return self.get_audio(blocksize)
+
+
+class Stage(object):
+    """One processing step of a `Pipeline`."""
+
+    def __init__(self, name: str, func: callable, input: str = None,
+                 nchannels: int = 0, blocksize: int = None,
+                 process: bool = True) -> None:
+        """
+        Apply `func` to every block read from `input` and write its output to the stage buffer.
+
+        Parameters
+        ----------
+        name : str
+            Stage name, used by other stages as `input`.
+        func : callable
+            Receives a block with shape `(nsamples, nchannels)` and returns an array with
+            `nsamples` rows and the output channels, or None if nothing should be written.
+        input : str, optional
+            Name of the stage to read from. The default is None, which means the pipeline source.
+        nchannels : int, optional
+            Number of output channels. Zero keeps the input number of channels, and None
+            means the stage has no output buffer, e.g. a storage stage. The default is 0.
+        blocksize : int, optional
+            Samples read on each call to `func`. The default is None, which means config.blocksize.
+        process : bool, optional
+            Run on a separate process, or on a thread if False. The default is True.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.name = name
+        self.func = func
+        self.input = input
+        self.nchannels = nchannels
+        self.blocksize = int(config.blocksize if blocksize is None else blocksize)
+        self.process = process
+        self.output = None
+        self._ridx = mp.Value('q', 0)
+        self._maxdepth = mp.Value('q', 0)
+        self._dropped = mp.Value('q', 0)
+        self._ready = mp.Event()
+        self._done = mp.Event()
+        return
+
+    def __repr__(self):
+        return f"Stage(name={self.name}, input={self.input}, nchannels={self.nchannels}, blocksize={self.blocksize})"
+
+    @property
+    def ridx(self) -> int:
+        """Read index on the input buffer."""
+        return self._ridx.value
+
+    @property
+    def maxdepth(self) -> int:
+        """Greatest amount of input samples waiting to be read."""
+        return self._maxdepth.value
+
+    @property
+    def dropped(self) -> int:
+        """Output samples not written because the output buffer was full."""
+        return self._dropped.value
+
+    def setup(self):
+        """Any setup step needed by the stage, runs on its own process. Can be overriden on subclasses."""
+        pass
+
+    def tear_down(self):
+        """Any destroying step needed by the stage, runs on its own process. Can be overriden on subclasses."""
+        pass
+
+    def _bind(self, source: AudioBuffer, output: StageBuffer) -> None:
+        self.source = source
+        self.output = output
+        self._ridx.value = 0
+        self._maxdepth.value = 0
+        self._dropped.value = 0
+        self._ready.clear()
+        self._done.clear()
+        return
+
+    def _loop(self):
+        self.setup()
+        self._ready.set()
+        src, out = self.source, self.output
+        # A source finished before running, e.g. a stopped pipeline, ends the stage too.
+        while not src.running.wait(0.05) and not src.finished.is_set():
+            pass
+        if out is not None:
+            out.widx = 0
+            out.finished.clear()
+            out.running.set()
+        ridx = 0
+        while True:
+            ending = src.finished.is_set()
+            depth = src.widx - ridx
+            if depth > self._maxdepth.value:
+                self._maxdepth.value = depth
+            if depth >= self.blocksize or (ending and depth > 0):
+                nread = min(depth, self.blocksize)
+                res = self.func(src.data[ridx:ridx + nread])
+                ridx += nread
+                self._ridx.value = ridx
+                if res is not None and out is not None:
+                    res = res if res.ndim > 1 else res.reshape((-1, out.nchannels))
+                    left = out.nsamples - out.widx
+                    if res.shape[0] > left:
+                        self._dropped.value += res.shape[0] - left
+                    if left > 0:
+                        out.write_next(res)
+            elif ending:
+                break
+            else:
+                time.sleep(0.25 * self.blocksize / src.samplerate)
+        if out is not None:
+            out.running.clear()
+            out.finished.set()
+        self.tear_down()
+        self._done.set()
+        return
+
+
+class Pipeline(object):
+    """Graph of stages connected by shared memory audio buffers."""
+
+    def __init__(self, source: AudioBuffer, stages: List[Stage],
+                 buffersize: int = None) -> None:
+        """
+        Declare the pipeline fed by `source`.
+
+        Parameters
+        ----------
+        source : AudioBuffer
+            Where the first stages read from, usually a `Recorder`.
+            Must have `running` and `finished` events.
+        stages : List[Stage]
+            The processing stages. Each one reads from the source or from another stage.
+        buffersize : int, optional
+            Samples on each stage output buffer. The default is None, which means `source.nsamples`.
+
+        Raises
+        ------
+        ValueError
+            If stage names are repeated, an input does not exist or the graph has a cycle.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.source = source
+        self._stages = {}
+        for stg in stages:
+            if stg.name in self._stages:
+                raise ValueError(f"Repeated stage name: {stg.name}.")
+            self._stages[stg.name] = stg
+        self._order = self._sort()
+        buffersize = source.nsamples if buffersize is None else int(buffersize)
+        for stg in self._order:
+            src = self._input(stg)
+            nch = src.nchannels if stg.nchannels == 0 else stg.nchannels
+            out = None if nch is None else StageBuffer(src.samplerate, buffersize, nch,
+                                                       stg.blocksize, src.dtype)
+            stg._bind(src, out)
+        self._workers = []
+        return
+
+    def __getitem__(self, name: str) -> StageBuffer:
+        """Output buffer of the stage `name`."""
+        return self._stages[name].output
+
+    @property
+    def stages(self) -> List[Stage]:
+        """Stages sorted so that every stage comes after its input."""
+        return self._order
+
+    def _input(self, stg: Stage) -> AudioBuffer:
+        return self.source if stg.input is None else self._stages[stg.input].output
+
+    def _sort(self) -> List[Stage]:
+        order = []
+        done = set()
+        for stg in self._stages.values():
+            path = []
+            while stg.name not in done:
+                if stg in path:
+                    raise ValueError(f"Pipeline has a cycle on stage: {stg.name}.")
+                path.append(stg)
+                if stg.input is None:
+                    break
+                if stg.input not in self._stages:
+                    raise ValueError(f"Unknown input of stage {stg.name}: {stg.input}.")
+                stg = self._stages[stg.input]
+            for stg in reversed(path):
+                if stg.name not in done:
+                    done.add(stg.name)
+                    order.append(stg)
+        return order
+
+    def start(self, timeout: float = None) -> None:
+        """
+        Start all stages, from the last to the first, and wait until they are ready.
+
+        The source should only be started after this returns.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds to wait for each stage setup. The default is None.
+
+        Raises
+        ------
+        TimeoutError
+            If a stage is not ready within `timeout`.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._workers = []
+        # Left set by an earlier run of the source, it would end the stages right away.
+        self.source.finished.clear()
+        for stg in reversed(self._order):
+            worker = mp.Process(target=stg._loop) if stg.process \
+                else td.Thread(target=stg._loop)
+            worker.start()
+            self._workers.append(worker)
+            if not stg._ready.wait(timeout):
+                raise TimeoutError(f"Stage {stg.name} setup took too long.")
+        return
+
+    def wait(self) -> None:
+        """Block until every stage finished, which happens after the source finishes."""
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        return
+
+    def stop(self) -> None:
+        """Finish the source, which propagates to all stages, and wait for them."""
+        self.source.finished.set()
+        self.wait()
+        return
+
+    def metrics(self) -> Dict[str, dict]:
+        """
+        Queue depth of each edge, i.e. samples written to a stage input but not yet read.
+
+        Returns
+        -------
+        dict
+            For each stage name, a dictionary with `depth`, `maxdepth`, `read`, `written` and
+            `dropped` sample counts. `written` is None for stages without output.
+
+        """
+        metrics = {}
+        for stg in self._order:
+            src = self._input(stg)
+            metrics[stg.name] = {'depth': src.widx - stg.ridx,
+                                 'maxdepth': stg.maxdepth,
+                                 'read': stg.ridx,
+                                 'written': None if stg.output is None else stg.output.widx,
+                                 'dropped': stg.dropped}
+        return metrics
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Shared memory rings of small, fixed shape results, like levels per channel.
+
+A `Monitor` target publishes its results into a `ResultRing` and any other process,
+e.g. a GUI or a network exporter, attaches to it by name and reads the latest value
+or the recent history as numpy views, without copying audio around.
+
+    >>> ring = ResultRing('levels', shape=(2,), dtype='float32', nslots=256)
+    >>> ring.publish(dB(rms(data))[0])
+    >>> # On another process
+    >>> ring = ResultRing('levels')
+    >>> ring.latest()
+
+Created on Mon Oct 19 2026
+"""
+
+import time
+import numpy as np
+from multiprocessing import shared_memory as sm
+from typing import Tuple
+
+
+_HEADER = 9  # int64 fields: count, nslots, ndim, 4 dims, dtype string, write sequence
+_MAXDIM = 4
+
+
+class ResultRing(sm.SharedMemory):
+    """Ring of fixed shape results in shared memory."""
+
+    _owner = False
+
+    def __init__(self, name: str = None,
+                 shape: Tuple[int] = None,
+                 dtype: np.dtype = np.float32,
+                 nslots: int = 1024) -> None:
+        """
+        Result ring with `nslots` entries of `shape` and `dtype`, plus a timestamp for each entry.
+
+        If `name` refers to an existing ring it is attached, and its shape, dtype and
+        number of slots are read from the shared memory header. Otherwise a new ring is
+        created, in which case `shape` is mandatory.
+
+        Every entry is stored twice, so any `history` of up to `nslots` entries is
+        a contiguous view. Only the creator unlinks the shared memory.
+
+        Parameters
+        ----------
+        name : str, optional
+            The SharedMemory name, can be None to automatically generate one.
+        shape : Tuple[int], optional
+            Shape of a single result. Up to four dimensions. The default is None.
+        dtype : np.dtype, optional
+            Result data type. The default is np.float32.
+        nslots : int, optional
+            How many results are kept. The default is 1024.
+
+        Raises
+        ------
+        ValueError
+            If creating a ring without `shape`, or with more than four dimensions.
+
+        Returns
+        -------
+        None.
+
+        """
+        try:
+            sm.SharedMemory.__init__(self, name)
+            self._owner = False
+        except (FileNotFoundError, TypeError, ValueError):
+            if shape is None:
+                raise ValueError("A new ResultRing needs a result shape.")
+            shape = (int(shape),) if np.isscalar(shape) else tuple(int(s) for s in shape)
+            if len(shape) > _MAXDIM:
+                raise ValueError(f"ResultRing results have at most {_MAXDIM} dimensions.")
+            dtype = np.dtype(dtype)
+            sz = _HEADER * 8 + 2 * nslots * (8 + dtype.itemsize * int(np.prod(shape)))
+            sm.SharedMemory.__init__(self, name, create=True, size=sz)
+            self._owner = True
+            header = np.ndarray((_HEADER,), dtype=np.int64, buffer=self.buf)
+            header[:] = 0
+            header[1] = nslots
+            header[2] = len(shape)
+            header[3:3+len(shape)] = shape
+            header[7:8].view('S8')[0] = dtype.str.encode()
+        # Arrays from `frombuffer` hold the memory map, which cannot be closed under them.
+        self._header = np.frombuffer(self.buf, dtype=np.int64, count=_HEADER)
+        nslots = int(self._header[1])
+        shape = tuple(int(s) for s in self._header[3:3+self._header[2]])
+        dtype = np.dtype(self._header[7:8].view('S8')[0].decode())
+        self._times = np.frombuffer(self.buf, dtype=np.float64, count=2 * nslots, offset=_HEADER * 8)
+        self._data = np.frombuffer(self.buf, dtype=dtype, count=2 * nslots * int(np.prod(shape)),
+                                   offset=_HEADER * 8 + 2 * nslots * 8).reshape((2 * nslots, *shape))
+        return
+
+    def __del__(self):
+        """Close SharedMemory and unlink it if this object created it."""
+        try:
+            # Views must be released before the memory map can be closed.
+            del self._header, self._times, self._data
+        except AttributeError:
+            pass
+        try:
+            self.close()
+        except BufferError:
+            # Arrays from `history` are still in use, the map is closed along with them.
+            pass
+        if self._owner:
+            self.unlink()
+        return
+
+    def __len__(self):
+        return min(self.count, self.nslots)
+
+    @property
+    def count(self) -> int:
+        """Total amount of published results."""
+        return int(self._header[0])
+
+    @property
+    def nslots(self) -> int:
+        """Maximum amount of results kept."""
+        return int(self._header[1])
+
+    @property
+    def shape(self) -> Tuple[int]:
+        """Shape of a single result."""
+        return self._data.shape[1:]
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Type of the results."""
+        return self._data.dtype
+
+    def publish(self, value: np.ndarray, timestamp: float = None) -> int:
+        """
+        Append a result to the ring.
+
+        Only one process should publish to a ring.
+
+        Parameters
+        ----------
+        value : np.ndarray
+            The result. Must be broadcastable to `shape`.
+        timestamp : float, optional
+            Time of the result. The default is None, which means `time.monotonic()`.
+
+        Returns
+        -------
+        int
+            The new `count`.
+
+        """
+        count = self.count
+        idx = count % self.nslots
+        self._header[8] += 1
+        self._data[idx] = self._data[idx + self.nslots] = value
+        self._times[idx] = self._times[idx + self.nslots] = \
+            time.monotonic() if timestamp is None else timestamp
+        # Readers only see the new result after its data is in place.
+        self._header[0] = count + 1
+        self._header[8] += 1
+        return count + 1
+
+    def extend(self, values: np.ndarray, timestamps: np.ndarray = None) -> int:
+        """
+        Append many results at once, in order.
+
+        Only the latest `nslots` values are actually written.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Results with shape `(n, *shape)`.
+        timestamps : np.ndarray, optional
+            Time of each result. The default is None, which means `time.monotonic()` for all.
+
+        Returns
+        -------
+        int
+            The new `count`.
+
+        """
+        count = self.count
+        nvals = values.shape[0]
+        times = np.full(nvals, time.monotonic()) if timestamps is None else np.asarray(timestamps)
+        skip = max(nvals - self.nslots, 0)
+        idx = (count + np.arange(skip, nvals)) % self.nslots
+        self._header[8] += 1
+        self._data[idx] = self._data[idx + self.nslots] = values[skip:]
+        self._times[idx] = self._times[idx + self.nslots] = times[skip:]
+        self._header[0] = count + nvals
+        self._header[8] += 1
+        return count + nvals
+
+    def latest(self) -> np.ndarray:
+        """
+        Copy of the most recent result.
+
+        The write sequence is odd while the producer writes, and is checked again after
+        the copy, so a result being overwritten is read again instead of returned torn.
+
+        Raises
+        ------
+        IndexError
+            If nothing was published yet.
+
+        Returns
+        -------
+        np.ndarray
+            The result, with `shape` dimensions.
+
+        """
+        while True:
+            seq = int(self._header[8])
+            if seq % 2:
+                continue
+            count = self.count
+            if not count:
+                raise IndexError("Nothing published on ResultRing.")
+            value = self._data[(count - 1) % self.nslots].copy()
+            if int(self._header[8]) == seq:
+                return value
+
+    def _window(self, n: int) -> slice:
+        count = self.count
+        n = min(len(self) if n is None else int(n), count, self.nslots)
+        stop = (count - 1) % self.nslots + 1
+        if stop < n:
+            stop += self.nslots
+        return slice(stop - n, stop)
+
+    def history(self, n: int = None) -> np.ndarray:
+        """
+        View of the `n` most recent results, oldest first.
+
+        The view is not protected from the producer, results older than `nslots`
+        publications are overwritten in place. Use `latest` for a consistent value.
+
+        Parameters
+        ----------
+        n : int, optional
+            How many results. The default is None, which means all available.
+
+        Returns
+        -------
+        np.ndarray
+            The results, with shape `(n, *shape)`.
+
+        """
+        return self._data[self._window(n)]
+
+    def timestamps(self, n: int = None) -> np.ndarray:
+        """View of the `n` most recent timestamps, aligned with `history(n)`."""
+        return self._times[self._window(n)]
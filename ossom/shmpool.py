@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+"""
+Pool of reusable shared memory segments.
+
+Creating a segment costs `shm_open`, `ftruncate`, `mmap` and a page fault on the first touch
+of every page. The pool creates segments once, touches their pages, and hands them out again
+when `AudioBuffer`s are released, so creating many short lived streams costs about a
+`memset` of the used size.
+
+Segment names carry the creating process id, so segments left behind by processes that died
+without cleaning up are found and unlinked the first time the pool is used.
+
+A segment is handed out as a lease, an array over its memory, and goes back to the pool when
+the lease is garbage collected, that is, once no array or memoryview built on it is left.
+
+Other processes may still map a segment when its lease is collected: processes forked while
+it was leased, e.g. a `Monitor`, and buffers attached to it by name, see `SegmentPool.attach`.
+Each segment starts with a small header, shared by all of them, that marks it as shared and
+counts the attached processes. Shared segments are never handed out again, they are unlinked
+instead, by their creator or, if still attached then, by the last process to detach.
+
+    >>> pool.prefill(480000 * 2 * 4, count=8)  # before a run with many short streams
+    >>> rec = Recorder()  # its buffer comes from the pool
+    >>> del rec  # and goes back to it
+
+Created on Mon Oct 19 2026
+"""
+
+import os
+import mmap
+import weakref
+import itertools
+import contextlib
+import threading as td
+import numpy as np
+from multiprocessing import shared_memory as sm, util as _mputil
+
+try:
+    import fcntl
+except ImportError:  # Windows, where segments live only while they are open anyway.
+    fcntl = None
+
+
+_PREFIX = 'ossom_'
+_SHMDIR = '/dev/shm'
+_HEADER = 64  # bytes before the data of a segment, int64 fields: shared, attached, released
+_SHARED, _ATTACHED, _RELEASED = range(3)
+
+
+def _exists(name: str) -> bool:
+    """False if the segment was unlinked, always True where segments are not listed as files."""
+    return not os.path.isdir(_SHMDIR) or os.path.exists(os.path.join(_SHMDIR, name))
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _pagesize(size: int) -> int:
+    """Segment size for `size` bytes of data, header included, rounded up to whole pages."""
+    return -(-(int(size) + _HEADER) // mmap.PAGESIZE) * mmap.PAGESIZE
+
+
+def _header(seg: sm.SharedMemory) -> np.ndarray:
+    return np.ndarray((3,), dtype=np.int64, buffer=seg.buf)
+
+
+@contextlib.contextmanager
+def _locked(seg: sm.SharedMemory):
+    """Hold a lock on the segment, across processes, where segments are listed as files."""
+    path = os.path.join(_SHMDIR, seg.name.lstrip('/'))
+    try:
+        fd = os.open(path, os.O_RDWR) if fcntl is not None else None
+    except OSError:
+        fd = None
+    try:
+        if fd is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield _header(seg)
+    finally:
+        if fd is not None:
+            os.close(fd)
+
+
+_pools = weakref.WeakSet()
+_names = itertools.count()  # shared by all pools of the process, so their names never clash
+
+
+def _before_fork() -> None:
+    """Children map the leased segments too, so they cannot be handed out again."""
+    for pl in list(_pools):
+        pl._mark_leased()
+    return
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(before=_before_fork)
+
+
+class SegmentPool(object):
+    """Pre-faulted shared memory segments, recycled by size."""
+
+    def __init__(self, maxidle: int = 256 * 2**20) -> None:
+        """
+        Segments are created on demand, or ahead of time with `prefill`.
+
+        Parameters
+        ----------
+        maxidle : int, optional
+            Most bytes kept on idle segments. Beyond it, the oldest idle segments of the
+            size holding the most bytes are unlinked. The default is 256 MiB.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.maxidle = int(maxidle)
+        self._lock = td.Lock()
+        self._reset()
+        _mputil.register_after_fork(self, SegmentPool._reset)
+        _pools.add(self)
+        return
+
+    def _reset(self) -> None:
+        """Start empty, also on forked children, whose segments are unlinked when they exit."""
+        self._lock = td.Lock()
+        self._finalizer = _mputil.Finalize(self, self.clear, exitpriority=0)
+        self._pid = os.getpid()
+        self._segments = {}  # name: SharedMemory, every segment created by this process
+        self._free = {}  # size: [SharedMemory, ...], oldest first
+        self._returned = []  # (pid, SharedMemory) of collected leases, appended by their finalizers
+        self._leases = {}  # name: SharedMemory, segments handed out
+        self._cleaned = False
+        self.created = 0
+        self.reused = 0
+        return
+
+    @property
+    def idle(self) -> int:
+        """Bytes on segments ready to be handed out."""
+        return sum(size * len(segs) for size, segs in self._free.items())
+
+    @property
+    def leased(self) -> int:
+        """Amount of segments handed out and not yet back on the pool."""
+        return len(self._leases)
+
+    @staticmethod
+    def owns(name: str) -> bool:
+        """True if `name` is a segment of a pool, of this or any other process."""
+        return name.lstrip('/').startswith(_PREFIX)
+
+    def cleanup(self) -> int:
+        """
+        Unlink segments of processes that are not running anymore.
+
+        Only POSIX systems keep named segments after their processes die, elsewhere
+        this does nothing.
+
+        Returns
+        -------
+        int
+            Amount of unlinked segments.
+
+        """
+        self._cleaned = True
+        try:
+            names = os.listdir(_SHMDIR)
+        except OSError:
+            return 0
+        count = 0
+        for name in names:
+            if not name.startswith(_PREFIX):
+                continue
+            try:
+                pid = int(name[len(_PREFIX):].split('_')[0])
+            except ValueError:
+                continue
+            if pid != os.getpid() and not _alive(pid):
+                try:
+                    os.unlink(os.path.join(_SHMDIR, name))
+                    count += 1
+                except OSError:
+                    pass
+        return count
+
+    def _prepare(self) -> None:
+        if self._pid != os.getpid():
+            # A forked child, segments of the parent are not ours to hand out.
+            self._reset()
+        if not self._cleaned:
+            self.cleanup()
+        return
+
+    def _new(self, size: int) -> sm.SharedMemory:
+        name = f'{_PREFIX}{self._pid}_{next(_names)}'
+        seg = sm.SharedMemory(name, create=True, size=size)
+        # Touch every page now, instead of on the first write of each stream.
+        pages = np.ndarray((size // mmap.PAGESIZE,), dtype=np.uint8, buffer=seg.buf,
+                           strides=(mmap.PAGESIZE,))
+        pages[:] = 0
+        del pages
+        self._segments[seg.name] = seg
+        self.created += 1
+        return seg
+
+    def _mark_leased(self) -> None:
+        if self._pid != os.getpid():
+            return
+        for seg in list(self._leases.values()):
+            _header(seg)[_SHARED] = 1
+        return
+
+    def _collect(self) -> None:
+        """Recycle the segments of collected leases, or unlink them if shared."""
+        while self._returned:
+            pid, seg = self._returned.pop(0)
+            # Finalizers inherited by forked children report segments of the parent.
+            if pid != self._pid or seg.name not in self._segments:
+                continue
+            del self._leases[seg.name]
+            if _header(seg)[_SHARED]:
+                self._release(seg)
+            else:
+                self._free.setdefault(seg.size, []).append(seg)
+        while self.idle > self.maxidle:
+            size = max(self._free, key=lambda sz: sz * len(self._free[sz]))
+            self._release(self._free[size].pop(0))
+            if not self._free[size]:
+                del self._free[size]
+        return
+
+    def _release(self, seg: sm.SharedMemory, close: bool = True) -> None:
+        """Forget a segment, unlinking it unless attached, then the last to detach unlinks it."""
+        del self._segments[seg.name]
+        with _locked(seg) as header:
+            header[_RELEASED] = 1
+            attached = header[_ATTACHED]
+        if not attached:
+            try:
+                seg.unlink()
+            except FileNotFoundError:
+                pass
+        if close:
+            seg.close()
+        return
+
+    def acquire(self, size: int, zero: bool = True) -> tuple:
+        """
+        A writable lease on `size` bytes of a segment.
+
+        The segment goes back to the pool when the lease is garbage collected. Arrays and
+        memoryviews built on the lease keep it referenced, so it is never handed out while
+        they are in use. Segments leased while the process forks, or attached by name, are
+        never handed out again.
+
+        Parameters
+        ----------
+        size : int
+            Bytes needed.
+        zero : bool, optional
+            Zero the lease, as on a new segment. The default is True.
+
+        Returns
+        -------
+        tuple
+            The segment name and the lease, a `uint8` array.
+
+        """
+        with self._lock:
+            self._prepare()
+            self._collect()
+            free = self._free.get(_pagesize(size))
+            seg = None
+            while free and seg is None:
+                seg = free.pop()
+                if not _exists(seg.name):
+                    # Unlinked by another process, its name could be taken by a new segment.
+                    del self._segments[seg.name]
+                    seg.close()
+                    seg = None
+            if seg is not None:
+                self.reused += 1
+            else:
+                seg = self._new(_pagesize(size))
+                zero = False
+            self._leases[seg.name] = seg
+        lease = np.ndarray((size,), dtype=np.uint8, buffer=seg.buf, offset=_HEADER)
+        if zero:
+            lease[:] = 0
+        finalizer = weakref.finalize(lease, self._returned.append, (self._pid, seg))
+        finalizer.atexit = False
+        return seg.name, lease
+
+    @staticmethod
+    def attach(name: str, size: int) -> tuple:
+        """
+        Map a segment of a pool, of this or any other process, by name.
+
+        The segment is marked as shared, so its pool never hands it out again, and it is
+        not unlinked while attached. Call `detach` when done.
+
+        Parameters
+        ----------
+        name : str
+            Segment name.
+        size : int
+            Bytes needed.
+
+        Raises
+        ------
+        FileNotFoundError
+            If the segment does not exist anymore.
+        ValueError
+            If the segment is smaller than `size`.
+
+        Returns
+        -------
+        tuple
+            The `SharedMemory` and an `uint8` array of `size` bytes over its data.
+
+        """
+        seg = sm.SharedMemory(name)
+        if seg.size < size + _HEADER:
+            seg.close()
+            raise ValueError(f"Segment {name} is smaller than {size} bytes.")
+        with _locked(seg) as header:
+            header[_SHARED] = 1
+            header[_ATTACHED] += 1
+        return seg, np.ndarray((size,), dtype=np.uint8, buffer=seg.buf, offset=_HEADER)
+
+    @staticmethod
+    def detach(seg: sm.SharedMemory) -> None:
+        """Undo `attach`, unlinking the segment if its pool already released it."""
+        with _locked(seg) as header:
+            header[_ATTACHED] -= 1
+            last = header[_ATTACHED] <= 0 and header[_RELEASED]
+        if last:
+            try:
+                seg.unlink()
+            except FileNotFoundError:
+                pass
+        seg.close()
+        return
+
+    def prefill(self, size: int, count: int = 1) -> None:
+        """Create `count` idle segments for buffers of `size` bytes."""
+        with self._lock:
+            self._prepare()
+            for _ in range(count):
+                self._free.setdefault(_pagesize(size), []).insert(0, self._new(_pagesize(size)))
+        return
+
+    def clear(self) -> None:
+        """Release every segment created by this process, also the ones in use, see `_release`."""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            for seg in list(self._segments.values()):
+                # Arrays on leases may still be used, only idle segments are unmapped.
+                self._release(seg, close=seg.name not in self._leases)
+            self._free.clear()
+            self._leases.clear()
+            self._returned.clear()
+        return
+
+
+pool = SegmentPool()
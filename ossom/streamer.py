@@ -13,6 +13,8 @@ import soundcard as _sc
 import multiprocessing as _mp
 import threading as _td
 from ossom import Audio, AudioBuffer, Configurations
+from ossom.devices import registry as _registry
+from ossom.utils.clock import Clock
 from typing import List
 
 
@@ -29,17 +31,19 @@ class _Streamer(AudioBuffer):
                  buffersize: int,
                  dtype: _np.dtype):
         AudioBuffer.__init__(self, None, samplerate, buffersize,
-                             len(channels), blocksize//2, dtype)
+                             len(channels), blocksize, dtype)
         self.running = _mp.Event()
         self.finished = _mp.Event()
+        self.clock = Clock(samplerate)
         return
 
     def get_buffer(self, blocksize: int = None):
-        pass
+        return self.get_audio(blocksize)
 
     def _loop_wrapper(self, blocking: bool):
         self.finished.clear()
         self.reset()
+        self.clock.reset()
         self._thread = _td.Thread(target=self._loop)
         self._thread.start()
         if blocking:
@@ -52,48 +56,70 @@ class Recorder(_Streamer):
     """Recorder class."""
 
     def __init__(self, id: int or str = None,
-                 samplerate: int = config.samplerate,
-                 blocksize: int = config.blocksize,
-                 channels: List[int] = config.channels['in'],
-                 buffersize: int = config.buffersize,
-                 dtype: _np.dtype = config.dtype,
-                 loopback: bool = False):
+                 samplerate: int = None,
+                 blocksize: int = None,
+                 channels: List[int] = None,
+                 buffersize: int = None,
+                 dtype: _np.dtype = None,
+                 loopback: bool = False,
+                 hook: callable = None):
         """
         Record audio from input device directly into shared memory.
 
-
+        The device is checked against `ossom.devices.registry`, so unsupported settings
+        raise `ValueError` here instead of when the recording starts. Settings left as None
+        are taken from `config` when the `Recorder` is created, so they follow `config.load`.
 
         Parameters
         ----------
         id : int or str, optional
-            DESCRIPTION. The default is None.
+            Position on `config.list_devices()`, soundcard id, part of the device name or
+            a soundcard-like device object, e.g. `VirtualDevice`. The default is None,
+            which means `config.inDevice`.
         samplerate : int, optional
-            DESCRIPTION. The default is config.samplerate.
+            DESCRIPTION. The default is None, which means config.samplerate.
         blocksize : int, optional
-            DESCRIPTION. The default is config.blocksize.
+            Device period, samples recorded on each loop iteration. The default is None,
+            which means config.blocksize.
         channels : List[int], optional
-            DESCRIPTION. The default is config.channels.
+            DESCRIPTION. The default is None, which means config.inChannels.
         buffersize : int, optional
-            DESCRIPTION. The default is config.buffersize.
+            DESCRIPTION. The default is None, which means config.buffersize.
         dtype : _np.dtype, optional
-            DESCRIPTION. The default is config.dtype.
+            DESCRIPTION. The default is None, which means config.dtype.
         loopback : bool, optional
             DESCRIPTION. The default is False.
+        hook : callable, optional
+            Called with each recorded block, on the recording loop, right after it is
+            written to the buffer, e.g. a `Trigger`. It must take less than a block period.
+            The default is None.
 
         Returns
         -------
         None.
 
         """
+        id = config.inDevice if id is None else id
+        samplerate = config.samplerate if samplerate is None else samplerate
+        blocksize = config.blocksize if blocksize is None else blocksize
+        channels = config.inChannels if channels is None else channels
+        buffersize = config.buffersize if buffersize is None else buffersize
+        dtype = config.dtype if dtype is None else dtype
+        if not hasattr(id, 'recorder'):
+            info = _registry.validate('in', id, samplerate, channels, loopback)
         _Streamer.__init__(self, samplerate, blocksize, channels, buffersize, dtype)
         self._channels = channels
-        self._mic = _sc.default_microphone() if not id \
-            else _sc.get_microphone(id, include_loopback=loopback)
+        self.hook = hook
+        if hasattr(id, 'recorder'):
+            self._mic = id
+        else:
+            self._mic = _sc.default_microphone() if id is None \
+                else _sc.get_microphone(info['id'], include_loopback=loopback)
         return
 
     def __call__(self, tlen: float = 5., blocking: bool = False):
-        self.frames = int(_np.ceil(tlen * self.samplerate))
-        if self.frames > self.nsamples:
+        self.length = int(_np.ceil(tlen * self.samplerate))
+        if self.length > self.nsamples:
             raise MemoryError("Requested recording time is greater than available space.")
         self._loop_wrapper(blocking)
         return
@@ -106,8 +132,12 @@ class Recorder(_Streamer):
     def _loop(self):
         with self._mic.recorder(self.samplerate, self.channels, self.blocksize) as r:
             self.running.set()
-            while self.widx < self.frames:
-                self.write_next(r.record(self.blocksize//4))
+            while self.widx < self.length:
+                data = r.record(self.blocksize)
+                self.write_next(data)
+                self.clock.anchor(self.widx)
+                if self.hook is not None:
+                    self.hook(data)
                 if self.finished.is_set() or self.is_full:
                     break
             r.flush()
@@ -126,30 +156,42 @@ class Recorder(_Streamer):
         return
 
     def get_record(self, blocksize: int = None):
-        return Audio(self.data[:self.frames].copy(), self.samplerate,
+        return Audio(self.data[:self.length].copy(), self.samplerate,
                      self.blocksize if not blocksize else blocksize)
 
 
 class Player(_Streamer):
     def __init__(self, id: int or str = None,
-                 samplerate: int = config.samplerate,
-                 blocksize: int = config.blocksize,
-                 channels: List[int] = config.channels['out'],
-                 buffersize: int = config.buffersize,
-                 dtype: _np.dtype = config.dtype):
+                 samplerate: int = None,
+                 blocksize: int = None,
+                 channels: List[int] = None,
+                 buffersize: int = None,
+                 dtype: _np.dtype = None):
+        id = config.outDevice if id is None else id
+        samplerate = config.samplerate if samplerate is None else samplerate
+        blocksize = config.blocksize if blocksize is None else blocksize
+        channels = config.outChannels if channels is None else channels
+        buffersize = config.buffersize if buffersize is None else buffersize
+        dtype = config.dtype if dtype is None else dtype
+        if not hasattr(id, 'player'):
+            info = _registry.validate('out', id, samplerate, channels)
         _Streamer.__init__(self, samplerate, blocksize, channels, buffersize, dtype)
         self._channels = channels
-        self._spk = _sc.default_speaker() if not id \
-            else _sc.get_speaker(id)
+        self._played = _mp.Value('q', 0, lock=False)
+        if hasattr(id, 'player'):
+            self._spk = id
+        else:
+            self._spk = _sc.default_speaker() if id is None \
+                else _sc.get_speaker(info['id'])
         return
 
     def __call__(self, audio: Audio, blocking: bool = False):
         if self.nchannels != audio.nchannels:
             raise ValueError("The number of channels is incompatible.")
-        self.frames = audio.nsamples
-        if self.frames > self.nsamples:
+        self.length = audio.nsamples
+        if self.length > self.nsamples:
             raise MemoryError("Requested playback time is greater than available space.")
-        self.data[:self.frames] = audio[:]
+        self.data[:self.length] = audio[:]
         self._loop_wrapper(blocking)
         return
 
@@ -158,11 +200,23 @@ class Player(_Streamer):
         """The device channels to output data to. Zero indexed."""
         return self._channels
 
+    @property
+    def played(self) -> int:
+        """Samples handed to the device so far, shared with other processes, unlike `ridx`."""
+        return self._played.value
+
+    @property
+    def available(self) -> int:
+        """Samples already played, the ones views of the playback buffer read up to."""
+        return self.played
+
     def _loop(self):
         with self._spk.player(self.samplerate, self.channels, self.blocksize) as p:
             self.running.set()
-            while self.ridx < self.frames:
-                p.play(self.read_next(self.blocksize//4))
+            while self.ridx < self.length:
+                p.play(self.read_next(self.blocksize))
+                self._played.value = min(self.ridx, self.length)
+                self.clock.anchor(self._played.value)
                 if self.finished.is_set():
                     break
         self.running.clear()
@@ -177,8 +231,9 @@ class Player(_Streamer):
 
     def reset(self):
         self.ridx = 0
+        self._played.value = 0
         return
 
     def get_playback(self, blocksize: int = None):
-        return Audio(self.data[:self.frames].copy(), self.samplerate,
+        return Audio(self.data[:self.length].copy(), self.samplerate,
                      self.blocksize if not blocksize else blocksize)
@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+"""
+Triggered capture of audio events.
+
+A `Trigger` is fed with blocks of audio, from a `Monitor` or directly from the recording
+path, and keeps a short history of the latest samples. Its detector looks for events
+and, when one is found, the pre-trigger history and the following post-trigger samples
+are handed to a sink as an `Audio` object. Everything else is discarded.
+
+    >>> trg = Trigger(LevelDetector(on=-20., off=-30.), samplerate=48000, nchannels=2,
+    ...               pretime=0.5, posttime=2., sink=EventSaver('impact'))
+    >>> mon = Monitor(trg, waittime=0.125, args=())
+    >>> rec = Recorder(hook=trg)  # or on the recording loop itself, block by block
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import numba as nb
+from ossom import Audio, Configurations
+from ossom.utils.maths import warms_up
+
+
+config = Configurations()
+
+
+@nb.njit(cache=True)
+def _frame_levels(data: np.ndarray, framesize: int, crest: bool) -> np.ndarray:
+    """Greatest level, or crest factor, among channels of each frame, in decibel."""
+    nframes = data.shape[0] // framesize
+    levels = np.full(nframes, -np.inf)
+    for frame in range(nframes):
+        for ch in range(data.shape[1]):
+            acc = 0.
+            peak = 0.
+            for n in range(frame * framesize, (frame + 1) * framesize):
+                val = abs(data[n, ch])
+                acc += val * val
+                peak = max(peak, val)
+            if acc <= 0.:
+                continue
+            if crest:
+                lvl = 20 * np.log10(peak / np.sqrt(acc / framesize))
+            else:
+                lvl = 10 * np.log10(acc / framesize)
+            levels[frame] = max(levels[frame], lvl)
+    return levels
+
+
+@nb.njit(cache=True)
+def _hysteresis(levels: np.ndarray, on: float, off: float, armed: bool):
+    """Frames at or above `on` while armed. Re-arms when levels fall below `off`."""
+    triggers = np.empty(levels.shape[0], dtype=np.int64)
+    count = 0
+    for k in range(levels.shape[0]):
+        if armed:
+            if levels[k] >= on:
+                armed = False
+                triggers[count] = k
+                count += 1
+        elif levels[k] < off:
+            armed = True
+    return triggers[:count], armed
+
+
+@warms_up
+def _warmup_trigger(auddata: np.ndarray) -> None:
+    for crest in (False, True):
+        _hysteresis(_frame_levels(auddata, 8, crest), 0., -6., True)
+    return
+
+
+class LevelDetector(object):
+    """RMS level threshold with hysteresis."""
+
+    _crest = False
+
+    def __init__(self, on: float = -20., off: float = None, framesize: int = 256) -> None:
+        """
+        Detect frames whose level reaches `on` decibels on any channel.
+
+        After a detection, the detector only re-arms once the level goes below `off`.
+        Levels are computed over frames of `framesize` samples, and samples that do
+        not fill a frame are kept for the next call.
+
+        Parameters
+        ----------
+        on : float, optional
+            Trigger level, in decibel. The default is -20..
+        off : float, optional
+            Re-arm level, in decibel. The default is None, which means `on - 6`.
+        framesize : int, optional
+            Samples per analysis frame. The default is 256.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.on = on
+        self.off = on - 6. if off is None else off
+        self.framesize = int(framesize)
+        self.reset()
+        return
+
+    def __call__(self, data: np.ndarray) -> np.ndarray:
+        """
+        Look for triggers on a new block of data.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Block of audio, with shape `(nsamples, nchannels)`.
+
+        Returns
+        -------
+        np.ndarray
+            Offsets of the triggering frames relative to the start of `data`, possibly empty.
+            The first can be negative, down to `-framesize`, if the frame began on the previous block.
+
+        """
+        if self._tail is not None and self._tail.shape[0]:
+            data = np.concatenate((self._tail, data))
+        ntail = 0 if self._tail is None else self._tail.shape[0]
+        levels = _frame_levels(data, self.framesize, self._crest)
+        triggers, self._armed = _hysteresis(levels, self.on, self.off, self._armed)
+        self._tail = data[levels.shape[0] * self.framesize:].copy()
+        return triggers * self.framesize - ntail
+
+    @property
+    def armed(self) -> bool:
+        """True if the detector can trigger."""
+        return self._armed
+
+    def reset(self):
+        """Arm the detector and forget any held samples."""
+        self._armed = True
+        self._tail = None
+        return
+
+
+class CrestDetector(LevelDetector):
+    """Crest factor threshold with hysteresis, sensitive to impulsive events."""
+
+    _crest = True
+
+    def __init__(self, on: float = 12., off: float = None, framesize: int = 256) -> None:
+        """
+        Detect frames whose peak to RMS ratio reaches `on` decibels on any channel.
+
+        See `LevelDetector` for details.
+
+        Parameters
+        ----------
+        on : float, optional
+            Trigger crest factor, in decibel. The default is 12..
+        off : float, optional
+            Re-arm crest factor, in decibel. The default is None, which means `on - 6`.
+        framesize : int, optional
+            Samples per analysis frame. The default is 256.
+
+        Returns
+        -------
+        None.
+
+        """
+        LevelDetector.__init__(self, on, off, framesize)
+        return
+
+
+class EventSaver(object):
+    """Trigger sink that saves each event to a numpy `.npz` file."""
+
+    def __init__(self, prefix: str = 'event') -> None:
+        """
+        Events are saved as `prefix_<index>.npz`, with `data`, `samplerate` and `index` arrays.
+
+        Parameters
+        ----------
+        prefix : str, optional
+            File name prefix, may include a directory. The default is 'event'.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.prefix = prefix
+        return
+
+    def __call__(self, audio: Audio, index: int) -> None:
+        """Save `audio` triggered at sample `index`."""
+        np.savez(f'{self.prefix}_{index}.npz', data=audio.data,
+                 samplerate=audio.samplerate, index=index)
+        return
+
+
+class Trigger(object):
+    """Triggered capture engine."""
+
+    def __init__(self, detector: callable,
+                 samplerate: int = None,
+                 nchannels: int = None,
+                 pretime: float = 1.,
+                 posttime: float = 1.,
+                 sink: callable = None,
+                 dtype: np.dtype = None) -> None:
+        """
+        Keep only `pretime` seconds before and `posttime` seconds after each detected event.
+
+        Instances are callables that receive blocks of audio, so they can be a `Monitor`
+        target or a `Recorder` hook. Triggers that happen while an event is being captured
+        are ignored.
+
+        Parameters
+        ----------
+        detector : callable
+            Receives each block and returns an array of trigger offsets. See `LevelDetector`.
+        samplerate : int, optional
+            Audio sample rate. The default is None, which means config.samplerate.
+        nchannels : int, optional
+            Number of channels. The default is None, which means the amount of config.inChannels.
+        pretime : float, optional
+            Seconds of audio before the trigger. The default is 1..
+        posttime : float, optional
+            Seconds of audio from the trigger on. The default is 1..
+        sink : callable, optional
+            Receives each event as `sink(audio, index)`, where `index` is the trigger sample
+            counted from the first processed sample. The default is None, which appends
+            `(audio, index)` to `events`.
+        dtype : np.dtype, optional
+            Sample data type. The default is None, which means config.dtype.
+
+        Returns
+        -------
+        None.
+
+        """
+        samplerate = config.samplerate if samplerate is None else samplerate
+        nchannels = len(config.inChannels) if nchannels is None else nchannels
+        dtype = config.dtype if dtype is None else dtype
+        self.detector = detector
+        self.samplerate = int(samplerate)
+        self.nchannels = nchannels
+        self.dtype = np.dtype(dtype)
+        self.npre = int(np.ceil(pretime * samplerate))
+        self.npost = int(np.ceil(posttime * samplerate))
+        self.events = []
+        self.sink = self._keep if sink is None else sink
+        # Longer than npre to cover triggers on frames that started on the previous block.
+        self._history = np.zeros((self.npre + getattr(detector, 'framesize', 0), nchannels),
+                                 dtype=self.dtype)
+        self.reset()
+        return
+
+    def __call__(self, data: np.ndarray) -> None:
+        """Alias for `process`."""
+        return self.process(data)
+
+    @property
+    def capturing(self) -> bool:
+        """True while post-trigger samples are being collected."""
+        return self._event is not None
+
+    @property
+    def count(self) -> int:
+        """Amount of samples processed."""
+        return self._count
+
+    def reset(self) -> None:
+        """Drop history and any event being captured."""
+        self._history[:] = 0
+        self._hpos = 0
+        self._count = 0
+        self._event = None
+        self._efill = 0
+        self._eidx = 0
+        return
+
+    def process(self, data: np.ndarray) -> None:
+        """
+        Run the detector on a block and capture events.
+
+        Parameters
+        ----------
+        data : np.ndarray
+            Block of audio, with shape `(nsamples, nchannels)`.
+
+        Returns
+        -------
+        None.
+
+        """
+        offsets = self.detector(data)
+        pos = -self._history.shape[0]
+        if self._event is not None:
+            pos = self._capture(data)
+        for offset in offsets:
+            if self._event is None and offset >= pos:
+                pos = self._begin(data, int(offset))
+        self._push(data)
+        self._count += data.shape[0]
+        return
+
+    def _keep(self, audio: Audio, index: int) -> None:
+        self.events.append((audio, index))
+        return
+
+    def _last(self, n: int) -> np.ndarray:
+        """Ordered copy of the `n` latest history samples."""
+        hsz = self._history.shape[0]
+        idx = (self._hpos - n + np.arange(n)) % hsz
+        return self._history[idx]
+
+    def _push(self, data: np.ndarray) -> None:
+        hsz = self._history.shape[0]
+        if not hsz:
+            return
+        if data.shape[0] >= hsz:
+            self._history[:] = data[-hsz:]
+            self._hpos = 0
+            return
+        first = min(hsz - self._hpos, data.shape[0])
+        self._history[self._hpos:self._hpos + first] = data[:first]
+        self._history[:data.shape[0] - first] = data[first:]
+        self._hpos = (self._hpos + data.shape[0]) % hsz
+        return
+
+    def _begin(self, data: np.ndarray, offset: int) -> int:
+        self._event = np.empty((self.npre + self.npost, self.nchannels), dtype=self.dtype)
+        self._eidx = self._count + offset
+        back = max(-offset, 0)
+        fromhist = max(self.npre - max(offset, 0), 0)
+        pre = self._last(fromhist + back)
+        ndata = self.npre - fromhist
+        self._event[:fromhist] = pre[:fromhist]
+        self._event[fromhist:self.npre] = data[offset - ndata:offset] if ndata else data[:0]
+        self._efill = self.npre
+        if back:
+            self._capture(pre[fromhist:])
+        if self._event is None:
+            return offset + back
+        return max(offset, 0) + self._capture(data[max(offset, 0):])
+
+    def _capture(self, data: np.ndarray) -> int:
+        nsamp = min(data.shape[0], self._event.shape[0] - self._efill)
+        self._event[self._efill:self._efill + nsamp] = data[:nsamp]
+        self._efill += nsamp
+        if self._efill == self._event.shape[0]:
+            self.sink(Audio(self._event, self.samplerate), self._eidx)
+            self._event = None
+        return nsamp
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Automatic choice of block and buffer sizes.
+
+The streaming loop of a `Recorder` or a `Player` runs at decreasing block sizes while
+background processes keep the CPUs busy. Every block is timed through the streamer clock,
+so loop jitter and xruns, blocks that arrive later than the device can buffer, are measured
+on the actual loop. The smallest clean block size is kept and can be stored as a
+configuration profile.
+
+    >>> tuner = AutoTuner('in', load=0.7)
+    >>> best = tuner.run()
+    >>> tuner.save('lab')  # later, config.load('lab')
+    >>> rec = Recorder()  # streams created after `load` use the stored block and buffer sizes
+
+`VirtualDevice` stands in for an audio device, so the loop can also be tuned on machines
+without one, or without disturbing it.
+
+Created on Mon Oct 19 2026
+"""
+
+import time
+import numpy as np
+import multiprocessing as mp
+from typing import List
+from ossom import Audio, Configurations, Recorder, Player
+from ossom.utils.clock import Clock
+
+
+config = Configurations()
+
+
+class _VirtualStream(object):
+    """Stream paced by the monotonic clock, like a device with `buffered` seconds of buffer."""
+
+    def __init__(self, samplerate: int, channels: List[int], buffered: float) -> None:
+        self.samplerate = samplerate
+        self.nchannels = len(channels)
+        self.buffered = buffered
+        return
+
+    def __enter__(self):
+        self._next = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        return
+
+    @property
+    def latency(self) -> float:
+        return self.buffered
+
+    def _wait(self, nsamples: int) -> None:
+        self._next += nsamples / self.samplerate
+        delay = self._next - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        elif -delay > self.buffered:
+            # The device buffer ran over and the stream restarts.
+            self._next = time.perf_counter()
+        return
+
+    def record(self, nsamples: int) -> np.ndarray:
+        self._wait(nsamples)
+        return np.zeros((nsamples, self.nchannels), dtype=np.float32)
+
+    def play(self, data: np.ndarray) -> None:
+        self._wait(data.shape[0])
+        return
+
+    def flush(self) -> np.ndarray:
+        return np.zeros((0, self.nchannels), dtype=np.float32)
+
+
+class VirtualDevice(object):
+    """Stand-in for a soundcard microphone or speaker, accepted by `Recorder` and `Player`."""
+
+    def __init__(self, name: str = 'virtual', channels: int = 2, periods: int = 2) -> None:
+        """
+        Blocks are delivered, or consumed, at the sample rate of the stream.
+
+        Parameters
+        ----------
+        name : str, optional
+            Device name. The default is 'virtual'.
+        channels : int, optional
+            Number of channels. The default is 2.
+        periods : int, optional
+            Device buffer, in blocks. The default is 2.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.name = name
+        self.id = name
+        self.channels = channels
+        self.periods = periods
+        return
+
+    def _stream(self, samplerate: int, channels: List[int], blocksize: int) -> _VirtualStream:
+        return _VirtualStream(samplerate, channels if channels is not None else range(self.channels),
+                              self.periods * (blocksize or 1024) / samplerate)
+
+    recorder = _stream
+    player = _stream
+
+
+def _load(duty: float, period: float, stop: mp.Event) -> None:
+    """Keep a CPU busy `duty` of every `period` seconds."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        while time.perf_counter() - start < duty * period:
+            pass
+        time.sleep((1 - duty) * period)
+    return
+
+
+class AutoTuner(object):
+    """Lowest latency block size that streams without xruns under load."""
+
+    def __init__(self, kind: str = 'in',
+                 id: int or str = None,
+                 samplerate: int = None,
+                 channels: List[int] = None,
+                 load: float = 0.5,
+                 workers: int = None,
+                 duration: float = 2.,
+                 blocksizes: tuple = (4096, 2048, 1024, 512, 256, 128, 64, 32),
+                 periods: int = 2,
+                 buffertime: float = 5.,
+                 dtype: np.dtype = None) -> None:
+        """
+        Measurements happen on `run`, or `measure` for a single block size.
+
+        Parameters
+        ----------
+        kind : str, optional
+            'in' tunes a `Recorder`, 'out' a `Player`. The default is 'in'.
+        id : int or str, optional
+            Device, as accepted by `Recorder` and `Player`, e.g. a `VirtualDevice`.
+            The default is None, the configured device.
+        samplerate : int, optional
+            Sample rate. The default is None, which means config.samplerate.
+        channels : List[int], optional
+            Device channels. The default is None, the configured channels.
+        load : float, optional
+            Fraction of time each load process keeps its CPU busy, from 0 to 1. The default is 0.5.
+        workers : int, optional
+            Load processes. The default is None, one per CPU.
+        duration : float, optional
+            Seconds streamed on each block size. The default is 2..
+        blocksizes : tuple, optional
+            Block sizes tried, largest first. The default is powers of two from 4096 to 32.
+        periods : int, optional
+            Blocks a loop may fall behind before it is counted as an xrun. The default is 2.
+        buffertime : float, optional
+            Seconds of buffer on the stored configuration, rounded up to whole blocks. The default is 5..
+        dtype : np.dtype, optional
+            Sample data type. The default is None, which means config.dtype.
+
+        Returns
+        -------
+        None.
+
+        """
+        if kind not in ('in', 'out'):
+            raise ValueError("Tuner kind must be 'in' or 'out'.")
+        self.kind = kind
+        self.id = id
+        self.samplerate = int(config.samplerate if samplerate is None else samplerate)
+        self.channels = list(channels) if channels is not None else \
+            list(config.inChannels if kind == 'in' else config.outChannels)
+        self.load = float(np.clip(load, 0., 1.))
+        self.workers = mp.cpu_count() if workers is None else int(workers)
+        self.duration = duration
+        self.blocksizes = sorted((int(bs) for bs in blocksizes), reverse=True)
+        self.periods = periods
+        self.buffertime = buffertime
+        self.dtype = np.dtype(config.dtype if dtype is None else dtype)
+        self.results = []
+        return
+
+    def _stream(self, blocksize: int, nsamples: int):
+        if self.kind == 'in':
+            return Recorder(self.id, self.samplerate, blocksize, self.channels, nsamples, self.dtype)
+        return Player(self.id, self.samplerate, blocksize, self.channels, nsamples, self.dtype)
+
+    def _start_load(self) -> tuple:
+        stop = mp.Event()
+        procs = [mp.Process(target=_load, args=(self.load, 0.01, stop), daemon=True)
+                 for _ in range(self.workers if self.load > 0. else 0)]
+        for proc in procs:
+            proc.start()
+        return stop, procs
+
+    @staticmethod
+    def _stop_load(stop: mp.Event, procs: list) -> None:
+        stop.set()
+        for proc in procs:
+            proc.join()
+        return
+
+    def measure(self, blocksize: int) -> dict:
+        """
+        Stream `duration` seconds at `blocksize` under load and time every block.
+
+        Parameters
+        ----------
+        blocksize : int
+            Samples per block.
+
+        Returns
+        -------
+        dict
+            `blocksize`, its `latency` in seconds, `xruns`, the standard deviation and
+            greatest absolute `jitter` and `maxjitter` of block intervals, and `maxlate`,
+            the most a block fell behind, all in seconds, and whether it is `clean`.
+
+        """
+        nblocks = int(np.ceil(self.duration * self.samplerate / blocksize))
+        nsamples = nblocks * blocksize
+        # One block to spare, so rounding on the recording length never overflows.
+        stream = self._stream(blocksize, nsamples + blocksize)
+        stream.clock = Clock(self.samplerate, nblocks + 2)
+        stop, procs = self._start_load()
+        try:
+            if self.kind == 'in':
+                stream(nsamples / self.samplerate, blocking=True)
+            else:
+                stream(Audio(np.zeros((nsamples, len(self.channels)), dtype=self.dtype),
+                             self.samplerate, blocksize), blocking=True)
+        finally:
+            self._stop_load(stop, procs)
+        anchors = stream.clock.anchors()
+        del stream
+        result = self._evaluate(blocksize, anchors)
+        self.results.append(result)
+        return result
+
+    def _evaluate(self, blocksize: int, anchors: np.ndarray) -> dict:
+        """Jitter and xruns from the (sample, monotonic_ns) anchors of each block."""
+        period = blocksize / self.samplerate
+        times = (anchors[:, 1] - anchors[0, 1]) * 1e-9
+        # How late each block is against the nominal rate, measured from the earliest block.
+        late = times - (anchors[:, 0] - anchors[0, 0]) / self.samplerate
+        xruns, base, maxlate = 0, 0., 0.
+        for value in late:
+            base = min(base, value)
+            maxlate = max(maxlate, value - base)
+            if value - base > self.periods * period:
+                # The device would have restarted, lateness counts from here again.
+                xruns += 1
+                base = value
+        deviation = np.diff(times) - np.diff(anchors[:, 0]) / self.samplerate
+        return dict(blocksize=blocksize, latency=period, xruns=xruns,
+                    jitter=float(deviation.std()) if deviation.size else 0.,
+                    maxjitter=float(np.abs(deviation).max()) if deviation.size else 0.,
+                    maxlate=float(maxlate), clean=xruns == 0)
+
+    def run(self, exhaustive: bool = False) -> dict or None:
+        """
+        Measure the block sizes, largest first, and keep the smallest clean one.
+
+        Parameters
+        ----------
+        exhaustive : bool, optional
+            Measure every block size, otherwise stop on the first one with xruns.
+            The default is False.
+
+        Returns
+        -------
+        dict or None
+            The chosen result, see `measure`, or None if no block size was clean.
+
+        """
+        self.results = []
+        for blocksize in self.blocksizes:
+            if not self.measure(blocksize)['clean'] and not exhaustive:
+                break
+        return self.best
+
+    @property
+    def best(self) -> dict or None:
+        """Smallest clean block size measured, larger ones are only chosen if all smaller ones fail."""
+        clean = [res for res in self.results if res['clean']]
+        return min(clean, key=lambda res: res['blocksize']) if clean else None
+
+    def apply(self) -> None:
+        """Set `config` sample rate, block size and a buffer of `buffertime` whole blocks."""
+        best = self.best
+        if best is None:
+            raise ValueError("No clean block size was found, try less load or larger blocks.")
+        blocksize = best['blocksize']
+        config.samplerate = self.samplerate
+        config.blocksize = blocksize
+        config.buffersize = int(np.ceil(self.buffertime * self.samplerate / blocksize)) * blocksize
+        return
+
+    def save(self, profile: str = 'default') -> str:
+        """Apply the best settings and store them with `Configurations.save`."""
+        self.apply()
+        return config.save(profile)
@@ -8,9 +8,16 @@ Created on Tue May  5 00:31:42 2020
 """
 
 from .colore import ColorStr, colorir, pinta_texto, pinta_fundo
-from .freq import freq_to_band, fractional_octave_frequencies, normalize_frequencies, freqs_to_center_and_edges
-from .maths import max_abs, rms, dB
-from .logger import Logger, Now
+from .meter import TerminalMeter
+from .freq import freq_to_band, fractional_octave_frequencies, normalize_frequencies, freqs_to_center_and_edges, band_table, BandTable
+from .maths import max_abs, rms, mean, mean_square, crest_factor, dB, MeanSquare, Leq, PeakHold, MinMax, warmup
+from .clock import Clock
+from .logger import Logger, Now, MetricsLog, load_metrics, log_segments, read_log
+from .filters import OctaveFilterBank, butter_bandpass_sos
+from .spectral import FFTBandEstimator, STFT, TransferFunction
+from .levelmeter import SoundLevelMeter, weighting_sos
+from .latency import LatencyEstimator
+from .generators import SignalGenerator, WhiteNoise, PinkNoise, Sine, Sweep, Multitone
 
 __all__ = [
     # colore
@@ -19,17 +26,61 @@ __all__ = [
     'pinta_texto',
     'pinta_fundo',
 
+    # meter
+    'TerminalMeter',
+
     # freq
     'freq_to_band',
     'fractional_octave_frequencies',
     'freqs_to_center_and_edges',
     'normalize_frequencies',
+    'band_table',
+    'BandTable',
 
     # maths
     'max_abs',
     'rms',
+    'mean',
+    'mean_square',
+    'crest_factor',
     'dB',
+    'MeanSquare',
+    'Leq',
+    'PeakHold',
+    'MinMax',
+    'warmup',
+
+    # filters
+    'OctaveFilterBank',
+    'butter_bandpass_sos',
+
+    # spectral
+    'FFTBandEstimator',
+    'STFT',
+    'TransferFunction',
+
+    # levelmeter
+    'SoundLevelMeter',
+    'weighting_sos',
+
+    # latency
+    'LatencyEstimator',
+
+    # generators
+    'SignalGenerator',
+    'WhiteNoise',
+    'PinkNoise',
+    'Sine',
+    'Sweep',
+    'Multitone',
+
+    # clock
+    'Clock',
 
     # logger
     'Logger',
-    'Now']
+    'Now',
+    'MetricsLog',
+    'load_metrics',
+    'log_segments',
+    'read_log']
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Mapping between audio sample positions and wall clock time.
+
+Streaming loops record anchors, the amount of samples written or played together with the
+monotonic and wall clock times, on a small ring in shared memory. Conversions fit a line
+through the recent anchors, so the actual sample rate of the device, and its drift, are
+taken into account, and work on whole arrays of samples or times at once.
+
+    >>> rec = Recorder(); rec(10.)
+    >>> ...
+    >>> rec.clock.wall(event_offsets)  # nanoseconds since epoch of each sample
+    >>> rec.clock.format(rec.clock.wall(rec.widx))
+    '2026-10-19 15:20:31.482913'
+
+Created on Mon Oct 19 2026
+"""
+
+import time
+import numpy as np
+import multiprocessing as mp
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def _second(sec: int) -> str:
+    """Formatted local time of a whole second, computed once per second."""
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(sec))
+
+
+class Clock(object):
+    """Shared ring of sample and time anchors."""
+
+    def __init__(self, samplerate: int, nanchors: int = 64) -> None:
+        """
+        Anchors are kept on shared memory, so a `Clock` created before starting processes
+        is written by one process, e.g. the recording loop, and read by others.
+
+        Parameters
+        ----------
+        samplerate : int
+            Nominal sample rate, used until there are two anchors.
+        nanchors : int, optional
+            Anchors kept and used on conversions. The default is 64.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.samplerate = samplerate
+        self._nanchors = int(nanchors)
+        self._shared = mp.Array('q', 3 * self._nanchors, lock=False)
+        self._count = mp.Value('q', 0, lock=False)
+        self._view()
+        return
+
+    def _view(self) -> None:
+        """Array over the shared ring, built once instead of on every `anchor`."""
+        self._anchors = np.frombuffer(self._shared, dtype=np.int64).reshape((self._nanchors, 3))
+        return
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state['_anchors']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._view()
+        return
+
+    @property
+    def count(self) -> int:
+        """Amount of anchors recorded since `reset`."""
+        return self._count.value
+
+    def reset(self) -> None:
+        """Forget all anchors, e.g. when a new recording starts at sample zero."""
+        self._count.value = 0
+        return
+
+    def anchor(self, sample: int, monotonic_ns: int = None, wall_ns: int = None) -> None:
+        """
+        Record that `sample` happened now, or at the given times. Only one process should write.
+
+        Parameters
+        ----------
+        sample : int
+            Sample position, e.g. `widx` right after writing a block.
+        monotonic_ns : int, optional
+            `time.monotonic_ns()` of the sample. The default is None, which means now.
+        wall_ns : int, optional
+            `time.time_ns()` of the sample. The default is None, which means now.
+
+        Returns
+        -------
+        None.
+
+        """
+        count = self._count.value
+        row = self._anchors[count % self._nanchors]
+        row[0] = sample
+        row[1] = time.monotonic_ns() if monotonic_ns is None else monotonic_ns
+        row[2] = time.time_ns() if wall_ns is None else wall_ns
+        # The anchor is complete before readers can see it.
+        self._count.value = count + 1
+        return
+
+    def anchors(self) -> np.ndarray:
+        """
+        Copy of the recent anchors, oldest first.
+
+        The slot that would be written next is left out, so a concurrent `anchor` never
+        shows up half written.
+
+        Returns
+        -------
+        np.ndarray
+            Rows of `(sample, monotonic_ns, wall_ns)`, with shape (nanchors, 3).
+
+        """
+        count = self._count.value
+        navail = min(count, self._nanchors - 1)
+        idx = np.arange(count - navail, count) % self._nanchors
+        return self._anchors[idx].copy()
+
+    def _fit(self, column: int) -> tuple:
+        """Reference sample, its fitted time and the nanoseconds per sample, over the recent anchors."""
+        anchors = self.anchors()
+        if not anchors.shape[0]:
+            raise ValueError("The clock has no anchors yet.")
+        last = anchors[-1]
+        # Relative to the latest anchor, so float64 keeps nanosecond precision.
+        samples = (anchors[:, 0] - last[0]).astype(np.float64)
+        times = (anchors[:, column] - last[column]).astype(np.float64)
+        if anchors.shape[0] < 2 or not np.any(samples - samples.mean()):
+            return last[0], last[column], 1e9 / self.samplerate
+        # Least squares line, which averages out the jitter of each anchor.
+        smean, tmean = samples.mean(), times.mean()
+        rate = np.dot(samples - smean, times - tmean) / np.dot(samples - smean, samples - smean)
+        return last[0], last[column] + tmean - smean * rate, rate
+
+    def _to_time(self, samples: np.ndarray, column: int) -> np.ndarray:
+        sample0, time0, rate = self._fit(column)
+        return time0 + np.round((np.asarray(samples) - sample0) * rate).astype(np.int64)
+
+    def _to_sample(self, times: np.ndarray, column: int) -> np.ndarray:
+        sample0, time0, rate = self._fit(column)
+        return sample0 + (np.asarray(times) - time0) / rate
+
+    def wall(self, samples: np.ndarray) -> np.ndarray:
+        """Wall clock time of `samples`, in nanoseconds since epoch."""
+        return self._to_time(samples, 2)
+
+    def monotonic(self, samples: np.ndarray) -> np.ndarray:
+        """Monotonic time of `samples`, in nanoseconds, comparable to `time.monotonic_ns()`."""
+        return self._to_time(samples, 1)
+
+    def sample_at_wall(self, wall_ns: np.ndarray) -> np.ndarray:
+        """Fractional sample position at wall clock times, in nanoseconds since epoch."""
+        return self._to_sample(wall_ns, 2)
+
+    def sample_at_monotonic(self, monotonic_ns: np.ndarray) -> np.ndarray:
+        """Fractional sample position at monotonic times, in nanoseconds."""
+        return self._to_sample(monotonic_ns, 1)
+
+    def samplerate_estimate(self) -> float:
+        """Actual sample rate, measured from the recent anchors on the monotonic clock."""
+        return 1e9 / self._fit(1)[2]
+
+    @staticmethod
+    def format(wall_ns: np.ndarray, decimals: int = 6) -> str or list:
+        """
+        Local time strings of wall clock times, with `decimals` digits of the second.
+
+        The date and time of each whole second are formatted once and cached.
+
+        Parameters
+        ----------
+        wall_ns : np.ndarray
+            Nanoseconds since epoch, a number or an array.
+        decimals : int, optional
+            Digits after the seconds, up to 9. The default is 6.
+
+        Returns
+        -------
+        str or list
+            One string, or a list of strings for arrays.
+
+        """
+        arr = np.asarray(wall_ns, dtype=np.int64)
+        secs, nanos = np.divmod(arr.ravel(), 1_000_000_000)
+        fracs = nanos // 10**(9 - decimals)
+        texts = [f"{_second(int(sec))}.{int(frac):0{decimals}d}" if decimals else _second(int(sec))
+                 for sec, frac in zip(secs, fracs)]
+        return texts[0] if arr.ndim == 0 else texts
@@ -153,12 +153,18 @@ class ColorStr(object):
         return self.bgrclr
 
 
+# Escape sequences are built once, "clear" colors need no sequence at all.
+_CODES = {(which, color): "" if color == "clear" else f'\x1b[{_LINEOBJ[which]}{_COLORS[color]}m'
+          for which in ("font", "background") for color in _COLORS}
+_CLEAR = '\x1b[0m'
+
+
 def _color_code(which: str, color: str) -> str:
-    return f'\x1b[{_LINEOBJ[which]}{_COLORS[color]}m'
+    return _CODES[(which, color)]
 
 
 def _color_clear() -> str:
-    return _color_code("clear", "clear")
+    return _CLEAR
 
 
 def _pintor(text: str, which: str, color: str) -> str or Error:
@@ -213,12 +219,10 @@ def colorir(texto: str, fntclr: str = None, bgrclr: str = None) -> str:
         texto (str): Colored font and background.
 
     """
-    if fntclr is None:
-        fntclr = "clear"
-    elif bgrclr is None:
-        bgrclr = "clear"
-    texto = pinta_texto(texto, fntclr)
-    texto = pinta_fundo(texto, bgrclr)
-    return texto
+    try:
+        codes = _CODES[("font", fntclr or "clear")] + _CODES[("background", bgrclr or "clear")]
+    except KeyError:
+        raise ColorNameError
+    return f'{codes}{texto}{_CLEAR}' if codes else texto
 
 
@@ -6,11 +6,12 @@ Provides frequency and fractional octave frequency bands functionalities.
 """
 
 import numpy as np
+from functools import lru_cache
 from typing import Tuple
 
 # Cálculo de bandas de oitava a partir de 1 kHz utilizando base 10 ou 2
 __nominal_frequencies = np.array([
-    0.1, 0.125, 0.16, 0.2, 0.25, 0.315, 0.4, 0.5, 0.6, 3., 0.8,
+    0.1, 0.125, 0.16, 0.2, 0.25, 0.315, 0.4, 0.5, 0.63, 0.8,
     1., 1.25, 1.6, 2., 2.5, 3.15, 4., 5., 6.3, 8., 10., 12.5, 16.,
     20., 25., 31.5, 40., 50., 63., 80., 100., 125., 160., 200., 250.,
     315., 400., 500., 630., 800., 1000., 1250., 1600., 2000., 2500.,
@@ -18,14 +19,22 @@ __nominal_frequencies = np.array([
 ])
 
 
-def freq_to_band(freq: float, nthOct: int, ref: float, base: int) -> int:
+def _factor(base: int) -> float:
+    if base == 10:
+        return 3 / 10
+    elif base == 2:
+        return 1
+    raise ValueError(f"Unknown base value: {base}.")
+
+
+def freq_to_band(freq: float or np.ndarray, nthOct: int, ref: float, base: int) -> int or np.ndarray:
     """
     Band number from frequency value.
 
     Parameters
     ----------
-    freq : float
-        The frequency value.
+    freq : float or np.ndarray
+        The frequency value, or an array of them.
     nthOct : int
         How many bands per octave.
     ref : float
@@ -40,19 +49,13 @@ def freq_to_band(freq: float, nthOct: int, ref: float, base: int) -> int:
 
     Returns
     -------
-    int
-        The band number from center.
+    int or np.ndarray
+        The band number from center, with the same shape as `freq`.
 
     """
-    if base == 10:
-        log = np.log10
-        factor = 3 / 10
-    elif base == 2:
-        log = np.log2
-        factor = 1
-    else:
-        raise ValueError(f"freq_to_band: unknown base value: {base}.")
-    return int(np.round(log(freq / ref) * (nthOct / factor)))
+    log = np.log10 if base == 10 else np.log2
+    band = np.round(log(np.asarray(freq) / ref) * (nthOct / _factor(base))).astype(int)
+    return int(band) if band.ndim == 0 else band
 
 
 def fractional_octave_frequencies(nthOct: int = 3,
@@ -62,6 +65,9 @@ def fractional_octave_frequencies(nthOct: int = 3,
     """
     Lower, center and upper frequency values of all bands within range.
 
+    Octave and one-third octave bands have their centers rounded to the nominal
+    frequencies. Finer resolutions use the exact midband frequencies.
+
     Parameters
     ----------
     nthOct : int, optional
@@ -80,24 +86,17 @@ def fractional_octave_frequencies(nthOct: int = 3,
         Array with shape (N, 3).
 
     """
-    if base == 10:
-        factor = 3 / 10
-    elif base == 2:
-        factor = 1
-    minFreq, maxFreq = freqRange
-    minBand = freq_to_band(minFreq, nthOct, refFreq, base)
-    maxBand = freq_to_band(maxFreq, nthOct, refFreq, base)
+    factor = _factor(base)
+    minBand, maxBand = freq_to_band(np.asarray(freqRange[:2]), nthOct, refFreq, base)
     bands = np.arange(minBand, maxBand + 1)
-    freqs = np.zeros((len(bands), 3))
-    nthOct = 1 / nthOct
-    for k, band in enumerate(bands):
-        dummy = refFreq * base ** (band * nthOct * factor)
-        dummy = np.sqrt((__nominal_frequencies - dummy) ** 2)
-        center = __nominal_frequencies[np.argmin(dummy)]
-        lower = center / base ** (nthOct * factor / 2)
-        upper = center * base ** (nthOct * factor / 2)
-        freqs[k, :] = [lower, center, upper]
-    return freqs
+    center = refFreq * float(base) ** (bands * factor / nthOct)
+    if nthOct in (1, 3):
+        nearest = np.argmin(np.abs(np.log(__nominal_frequencies[None, :] / center[:, None])), axis=1)
+        nominal = __nominal_frequencies[nearest]
+        close = np.abs(nominal / center - 1) < 0.05
+        center[close] = nominal[close]
+    halfband = float(base) ** (factor / nthOct / 2)
+    return np.stack((center / halfband, center, center * halfband), axis=1)
 
 
 def normalize_frequencies(freqs: np.ndarray,
@@ -145,3 +144,100 @@ def freqs_to_center_and_edges(freqs: np.ndarray) -> Tuple[np.ndarray]:
     center = freqs[:, 1].T
     edges = np.array([freqs[:, 0], freqs[:, 2]]).T
     return center, edges
+
+
+class BandTable(object):
+    """Fractional octave bands and everything derived from them, for one sample rate."""
+
+    def __init__(self, nthOct: int, freqRange: Tuple[float],
+                 refFreq: float, base: int, samplerate: int) -> None:
+        """
+        Use `band_table` to get cached instances instead of creating new ones.
+
+        All arrays are read-only, as they are shared by every user of the cache.
+
+        Parameters
+        ----------
+        nthOct : int
+            bands of octave/nthOct.
+        freqRange : Tuple[float]
+            frequency range.
+        refFreq : float
+            Center frequency of center band.
+        base : int
+            Either 10 or 2.
+        samplerate : int
+            Sample rate used to normalize frequencies.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.samplerate = samplerate
+        self.freqs = fractional_octave_frequencies(nthOct, freqRange, refFreq, base)
+        self.center, self.edges = freqs_to_center_and_edges(self.freqs)
+        self.normalized = normalize_frequencies(self.edges, samplerate)
+        self.valid = self.normalized[:, 1] < 1.
+        for arr in (self.freqs, self.center, self.edges, self.normalized, self.valid):
+            arr.flags.writeable = False
+        self._sos = {}
+        return
+
+    @property
+    def nbands(self) -> int:
+        """Number of bands."""
+        return self.freqs.shape[0]
+
+    def sos(self, order: int = 3) -> np.ndarray:
+        """
+        Butterworth second-order sections of the bands below Nyquist, computed once per `order`.
+
+        See `ossom.utils.filters.butter_bandpass_sos`.
+        """
+        if order not in self._sos:
+            from .filters import butter_bandpass_sos
+            sos = butter_bandpass_sos(self.normalized[self.valid], order)
+            sos.flags.writeable = False
+            self._sos[order] = sos
+        return self._sos[order]
+
+
+@lru_cache(maxsize=64)
+def _band_table(nthOct: int, freqRange: Tuple[float], refFreq: float,
+                base: int, samplerate: int) -> BandTable:
+    return BandTable(nthOct, freqRange, refFreq, base, samplerate)
+
+
+def band_table(nthOct: int = 3,
+               freqRange: Tuple[float] = (20., 20000.),
+               refFreq: float = 1000.,
+               base: int = 10,
+               samplerate: int = 44100) -> BandTable:
+    """
+    Memoized band table, shared by every caller with the same parameters.
+
+        >>> band_table(3, (20., 20000.), samplerate=48000) is band_table(3, [20, 20000], samplerate=48000)
+        True
+
+    Parameters
+    ----------
+    nthOct : int, optional
+        bands of octave/nthOct. The default is 3.
+    freqRange : Tuple[float], optional
+        frequency range. The default is (20., 20000.).
+    refFreq : float, optional
+        Center frequency of center band. The default is 1000..
+    base : int, optional
+        Either 10 or 2. The default is 10.
+    samplerate : int, optional
+        Sample rate used to normalize frequencies. The default is 44100.
+
+    Returns
+    -------
+    BandTable
+        Bands, edges, normalized edges and filter coefficients.
+
+    """
+    return _band_table(int(nthOct), tuple(float(f) for f in freqRange),
+                       float(refFreq), int(base), int(samplerate))
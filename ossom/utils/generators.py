@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""
+Block streaming test signal generators.
+
+Signals are generated in fixed size chunks, so memory use does not depend on the signal
+length, and read in blocks of any size. Random signals seed one generator per channel and
+per chunk, so the same `seed` always gives the same samples, whatever the read block size,
+and channels are generated in parallel threads.
+
+Levels are RMS values in decibel relative to full scale, so no normalization pass is needed.
+
+    >>> gen = PinkNoise(48000, nchannels=2, level=-20., seed=42)
+    >>> block = gen.read(1024)
+    >>> gen.reset()
+    >>> player(gen.write(player, 48000 * 60))  # one minute straight into the Player buffer
+
+Created on Mon Oct 19 2026
+"""
+
+import os
+import abc
+import numpy as np
+import numba as nb
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from .maths import warms_up
+
+
+_pool = None
+
+
+def _executor() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+    return _pool
+
+
+class SignalGenerator(abc.ABC):
+    """Base block generator, subclasses implement `_chunk`."""
+
+    def __init__(self, samplerate: int = 48000,
+                 nchannels: int = 1,
+                 level: float = -15.,
+                 nsamples: int = None,
+                 seed: int = None,
+                 chunksize: int = 65536,
+                 dtype: np.dtype = np.float32) -> None:
+        """
+        Generate `nsamples` samples, or endlessly, in chunks of `chunksize`.
+
+        Parameters
+        ----------
+        samplerate : int, optional
+            Sample rate. The default is 48000.
+        nchannels : int, optional
+            Number of channels. The default is 1.
+        level : float, optional
+            RMS level in dBFS. The default is -15., which keeps the peaks of noise
+            signals, about four times their RMS value, under full scale.
+        nsamples : int, optional
+            Total length, None means endless. The default is None.
+        seed : int, optional
+            Random seed. The default is None, which draws one from the OS.
+        chunksize : int, optional
+            Samples generated at once. The default is 65536.
+        dtype : np.dtype, optional
+            Sample data type. The default is np.float32.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.samplerate = samplerate
+        self.nchannels = nchannels
+        self.level = level
+        self.nsamples = nsamples
+        self.seed = np.random.SeedSequence().entropy if seed is None else seed
+        self.chunksize = int(chunksize)
+        self.dtype = np.dtype(dtype)
+        self._chunkdata = np.zeros((self.chunksize, nchannels), dtype=self.dtype)
+        self.reset()
+        return
+
+    def __iter__(self):
+        """Iterate method."""
+        return self
+
+    def __next__(self) -> np.ndarray:
+        """Read the next chunk."""
+        if self.left == 0:
+            raise StopIteration
+        return self.read(self.chunksize)
+
+    @property
+    def amplitude(self) -> float:
+        """RMS value from `level`."""
+        return 10**(self.level / 20)
+
+    @property
+    def position(self) -> int:
+        """Samples already read."""
+        return self._pos
+
+    @property
+    def left(self) -> int or None:
+        """Samples left to read, None if endless."""
+        return None if self.nsamples is None else self.nsamples - self._pos
+
+    def reset(self) -> None:
+        """Restart the signal from its first sample."""
+        self._pos = 0
+        self._chunkidx = -1
+        return
+
+    def _rngs(self, chunk: int) -> List[np.random.Generator]:
+        """One random generator per channel for `chunk`."""
+        return [np.random.default_rng([self.seed, ch, chunk]) for ch in range(self.nchannels)]
+
+    @abc.abstractmethod
+    def _chunk(self, chunk: int, out: np.ndarray) -> None:
+        """Write chunk number `chunk` to `out`, with shape (chunksize, nchannels)."""
+
+    def read(self, nsamples: int, out: np.ndarray = None) -> np.ndarray:
+        """
+        Read the next `nsamples` samples, or less at the end of the signal.
+
+        Parameters
+        ----------
+        nsamples : int
+            Amount of samples.
+        out : np.ndarray, optional
+            Array with at least `nsamples` rows and `nchannels` columns. The default is None.
+
+        Returns
+        -------
+        np.ndarray
+            The samples, with shape (nsamples, nchannels). A view of `out` if given.
+
+        """
+        if self.left is not None:
+            nsamples = min(nsamples, self.left)
+        if out is None:
+            out = np.empty((nsamples, self.nchannels), dtype=self.dtype)
+        done = 0
+        while done < nsamples:
+            chunk, offset = divmod(self._pos, self.chunksize)
+            if chunk != self._chunkidx:
+                self._chunk(chunk, self._chunkdata)
+                self._chunkidx = chunk
+            count = min(nsamples - done, self.chunksize - offset)
+            out[done:done + count] = self._chunkdata[offset:offset + count]
+            done += count
+            self._pos += count
+        return out[:nsamples]
+
+    def write(self, buffer, nsamples: int = None, start: int = None):
+        """
+        Write samples straight into the data of an `AudioBuffer`, e.g. a `Player`.
+
+        Only the samples are written, the buffer `widx` is left alone, as it tells what a
+        recording or a stream wrote, not what was prepared to be played.
+
+        Parameters
+        ----------
+        buffer : ossom.AudioBuffer
+            The destination.
+        nsamples : int, optional
+            Amount of samples. The default is None, which fills the buffer, or ends the signal.
+        start : int, optional
+            First buffer sample to write. The default is None, which is `position`, so
+            consecutive writes continue each other on the buffer.
+
+        Returns
+        -------
+        ossom.Audio
+            View of the written region, which a `Player` can be called with.
+
+        """
+        from ossom.audio import Audio
+        start = self.position if start is None else start
+        space = max(buffer.nsamples - start, 0)
+        nsamples = space if nsamples is None else min(nsamples, space)
+        data = self.read(nsamples, buffer.data[start:start + nsamples])
+        return Audio(buffer.data[start:start + data.shape[0]], buffer.samplerate)
+
+
+class WhiteNoise(SignalGenerator):
+    """Gaussian white noise, independent on each channel."""
+
+    def _chunk(self, chunk: int, out: np.ndarray) -> None:
+        amp = self.amplitude
+
+        def channel(args):
+            ch, rng = args
+            out[:, ch] = rng.standard_normal(self.chunksize, dtype=np.float64) * amp
+        list(_executor().map(channel, enumerate(self._rngs(chunk))))
+        return
+
+
+# Paul Kellet's refined pink noise filter: six one-pole sections, a delayed and a direct term.
+_PINK_POLES = np.array([0.99886, 0.99332, 0.96900, 0.86650, 0.55000, -0.7616])
+_PINK_GAINS = np.array([0.0555179, 0.0750759, 0.1538520, 0.3104856, 0.5329522, -0.0168980])
+_PINK_DIRECT, _PINK_DELAYED = 0.5362, 0.115926
+
+
+def _pink_rms() -> float:
+    """RMS of the pink filter output for unitary white noise, from its impulse response."""
+    resp = (_PINK_GAINS[:, None] * _PINK_POLES[:, None]**np.arange(2**15)).sum(axis=0)
+    resp[0] += _PINK_DIRECT
+    resp[1] += _PINK_DELAYED
+    return np.sqrt(np.sum(resp**2))
+
+
+_PINK_NORM = 1 / _pink_rms()
+
+
+@nb.njit(parallel=True, cache=True)
+def _pink_filter(white: np.ndarray, state: np.ndarray, out: np.ndarray) -> None:
+    """Filter each column of `white`, `state` has shape (7, nchannels)."""
+    for ch in nb.prange(white.shape[1]):
+        st = state[:, ch]
+        for n in range(white.shape[0]):
+            val = white[n, ch]
+            acc = _PINK_DIRECT * val + st[6]
+            for k in range(6):
+                st[k] = _PINK_POLES[k] * st[k] + _PINK_GAINS[k] * val
+                acc += st[k]
+            st[6] = _PINK_DELAYED * val
+            out[n, ch] = acc
+    return
+
+
+@warms_up
+def _warmup_generators(auddata: np.ndarray) -> None:
+    PinkNoise(nchannels=auddata.shape[1], chunksize=auddata.shape[0], dtype=auddata.dtype).read(1)
+    return
+
+
+class PinkNoise(WhiteNoise):
+    """Pink noise, -3 dB per octave, independent on each channel."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        """Same parameters as `SignalGenerator`. Chunks must be generated in order."""
+        WhiteNoise.__init__(self, *args, **kwargs)
+        self._white = np.zeros((self.chunksize, self.nchannels))
+        return
+
+    def reset(self) -> None:
+        """Restart the signal from its first sample."""
+        SignalGenerator.reset(self)
+        self._state = np.zeros((7, self.nchannels))
+        self._next = 0
+        return
+
+    def _chunk(self, chunk: int, out: np.ndarray) -> None:
+        while self._next <= chunk:
+            WhiteNoise._chunk(self, self._next, self._white)
+            _pink_filter(self._white, self._state, out)
+            self._next += 1
+        out *= _PINK_NORM
+        return
+
+
+class Sine(SignalGenerator):
+    """Pure tone, the same on all channels."""
+
+    def __init__(self, samplerate: int = 48000, nchannels: int = 1, level: float = -15.,
+                 nsamples: int = None, freq: float = 1000., phase: float = 0., **kwargs) -> None:
+        """
+        Sine wave of `freq` hertz, with RMS `level`. See `SignalGenerator` for other parameters.
+
+        Parameters
+        ----------
+        freq : float, optional
+            Frequency. The default is 1000..
+        phase : float, optional
+            Initial phase, in radians. The default is 0..
+
+        Returns
+        -------
+        None.
+
+        """
+        self.freq = freq
+        self.phase = phase
+        SignalGenerator.__init__(self, samplerate, nchannels, level, nsamples, **kwargs)
+        return
+
+    def _chunk(self, chunk: int, out: np.ndarray) -> None:
+        cycles = np.fmod((chunk * self.chunksize + np.arange(self.chunksize)) * (self.freq / self.samplerate), 1.)
+        out[:] = (np.sqrt(2) * self.amplitude * np.sin(2 * np.pi * cycles + self.phase))[:, None]
+        return
+
+
+class Multitone(SignalGenerator):
+    """Sum of equal amplitude tones with Schroeder phases, for a low crest factor."""
+
+    def __init__(self, samplerate: int = 48000, nchannels: int = 1, level: float = -15.,
+                 nsamples: int = None, freqs: np.ndarray = (125., 250., 500., 1000., 2000., 4000.),
+                 **kwargs) -> None:
+        """
+        Tones at `freqs` hertz summing to RMS `level`. See `SignalGenerator` for other parameters.
+
+        Parameters
+        ----------
+        freqs : np.ndarray, optional
+            Tone frequencies. The default is octave centers from 125 Hz to 4 kHz.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.freqs = np.asarray(freqs, dtype=np.float64)
+        ntones = self.freqs.shape[0]
+        self.phases = -np.pi * np.arange(ntones) * (np.arange(ntones) - 1) / ntones
+        SignalGenerator.__init__(self, samplerate, nchannels, level, nsamples, **kwargs)
+        return
+
+    def _chunk(self, chunk: int, out: np.ndarray) -> None:
+        idx = chunk * self.chunksize + np.arange(self.chunksize)
+        amp = np.sqrt(2 / self.freqs.shape[0]) * self.amplitude
+        acc = np.zeros(self.chunksize)
+        for freq, phase in zip(self.freqs, self.phases):
+            acc += np.sin(2 * np.pi * np.fmod(idx * (freq / self.samplerate), 1.) + phase)
+        out[:] = (amp * acc)[:, None]
+        return
+
+
+class Sweep(SignalGenerator):
+    """Exponential or linear sine sweep, the same on all channels."""
+
+    def __init__(self, samplerate: int = 48000, nchannels: int = 1, level: float = -15.,
+                 duration: float = 5., freqMin: float = 20., freqMax: float = 20000.,
+                 method: str = 'exp', **kwargs) -> None:
+        """
+        Sweep from `freqMin` to `freqMax` in `duration` seconds. See `SignalGenerator` for other parameters.
+
+        Parameters
+        ----------
+        duration : float, optional
+            Sweep duration, sets `nsamples`. The default is 5..
+        freqMin : float, optional
+            Start frequency. The default is 20..
+        freqMax : float, optional
+            End frequency. The default is 20000..
+        method : str, optional
+            Either 'exp' or 'linear'. The default is 'exp'.
+
+        Returns
+        -------
+        None.
+
+        """
+        if method not in ('exp', 'linear'):
+            raise ValueError(f"Unknown sweep method: {method}.")
+        self.duration = duration
+        self.freqMin = freqMin
+        self.freqMax = freqMax
+        self.method = method
+        SignalGenerator.__init__(self, samplerate, nchannels, level,
+                                 int(round(duration * samplerate)), **kwargs)
+        return
+
+    def phase(self, time: np.ndarray) -> np.ndarray:
+        """Instantaneous phase, in radians, at `time` seconds."""
+        if self.method == 'exp':
+            rate = self.duration / np.log(self.freqMax / self.freqMin)
+            return 2 * np.pi * self.freqMin * rate * np.expm1(time / rate)
+        return 2 * np.pi * (self.freqMin * time
+                            + (self.freqMax - self.freqMin) * time**2 / (2 * self.duration))
+
+    def _chunk(self, chunk: int, out: np.ndarray) -> None:
+        time = (chunk * self.chunksize + np.arange(self.chunksize)) / self.samplerate
+        out[:] = (np.sqrt(2) * self.amplitude * np.sin(self.phase(time)))[:, None]
+        return
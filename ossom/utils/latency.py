@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""
+Latency between played and recorded audio, from FFT cross-correlation.
+
+The reference is split in blocks whose spectra are computed once, and each block of the
+recording is correlated on the frequency domain as it becomes available, so memory does
+not grow with the measurement length. The peak lag is refined to a fraction of a sample.
+
+    >>> est = LatencyEstimator(noise, maxlag=4800)
+    >>> player(noise); recorder(); ...
+    >>> lags = est.estimate(recorder.get_audio())
+    >>> aligned = est.align(recorder.get_audio())  # view starting at the first played sample
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+
+
+_FINE = 16  # Steps per sample of the band limited correlation around the peak.
+
+
+def _parabolic(left: np.ndarray, center: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Offset of the vertex of the parabola through three equally spaced points."""
+    den = left - 2 * center + right
+    with np.errstate(divide='ignore', invalid='ignore'):
+        delta = np.where(den != 0., 0.5 * (left - right) / den, 0.)
+    return np.clip(delta, -0.5, 0.5)
+
+
+def _interpolate(cross: np.ndarray, nfft: int, lags: np.ndarray) -> np.ndarray:
+    """
+    Band limited correlation at fractional `lags`, from the one-sided cross spectrum.
+
+    `cross` has shape (nbins, nchannels) and `lags` has shape (nlags, nchannels).
+    """
+    weights = np.full(cross.shape[0], 2.)
+    weights[0] = 1.
+    if not nfft % 2:
+        weights[-1] = 1.
+    cross = weights[:, None] * cross / nfft
+    phase = 2j * np.pi * np.arange(cross.shape[0])[:, None] / nfft
+    out = np.empty(lags.shape)
+    for row in range(lags.shape[0]):
+        out[row] = np.sum((cross * np.exp(phase * lags[row][None, :])).real, axis=0)
+    return out
+
+
+class LatencyEstimator(object):
+    """Blockwise FFT cross-correlation between a reference and its recording."""
+
+    def __init__(self, reference: np.ndarray,
+                 maxlag: int,
+                 blocksize: int = None) -> None:
+        """
+        Precompute the reference spectra for lags from 0 to `maxlag` samples.
+
+        The same estimator can be reused for many measurements with the same reference,
+        calling `reset` in between.
+
+        Parameters
+        ----------
+        reference : np.ndarray
+            The played signal, an array or an `Audio`, with one channel, or as many as the recordings.
+        maxlag : int
+            Largest lag searched, in samples.
+        blocksize : int, optional
+            Reference samples per block. The default is None, which makes the FFT size the
+            smallest power of two not below twice `maxlag`.
+
+        Raises
+        ------
+        ValueError
+            If `maxlag` or `blocksize` are not positive.
+
+        Returns
+        -------
+        None.
+
+        """
+        reference = np.asarray(getattr(reference, 'data', reference), dtype=np.float64)
+        if reference.ndim < 2:
+            reference = reference.reshape((-1, 1))
+        self.maxlag = int(maxlag)
+        if blocksize is None:
+            self.nfft = 1 << int(np.ceil(np.log2(max(2 * self.maxlag, 2))))
+            self.blocksize = self.nfft - self.maxlag
+        else:
+            self.blocksize = int(blocksize)
+            self.nfft = 1 << int(np.ceil(np.log2(self.blocksize + self.maxlag)))
+        if self.maxlag < 1 or self.blocksize < 1:
+            raise ValueError("Maximum lag and block size must be positive.")
+        self.nsamples = reference.shape[0]
+        self.nblocks = -(-self.nsamples // self.blocksize)
+        padded = np.zeros((self.nblocks * self.blocksize, reference.shape[1]))
+        padded[:self.nsamples] = reference
+        blocks = padded.reshape((self.nblocks, self.blocksize, -1))
+        self._refspec = np.conj(np.fft.rfft(blocks, n=self.nfft, axis=1))
+        self._refenergy = np.cumsum(np.sum(blocks**2, axis=1), axis=0)
+        self.reset()
+        return
+
+    def reset(self) -> None:
+        """Forget the recording, to start a new measurement."""
+        self._cross = 0.
+        self._recenergy = 0.
+        self._done = 0
+        self._lags = None
+        self._score = None
+        return
+
+    @property
+    def done(self) -> int:
+        """Reference blocks already correlated."""
+        return self._done
+
+    @property
+    def complete(self) -> bool:
+        """True if the whole reference was correlated."""
+        return self._done == self.nblocks
+
+    @property
+    def lags(self) -> np.ndarray or None:
+        """Lag of each channel, in samples, from the last `estimate`."""
+        return self._lags
+
+    @property
+    def score(self) -> np.ndarray or None:
+        """Normalized correlation at the fractional lag of each channel, from the last `estimate`."""
+        return self._score
+
+    def update(self, recording, finish: bool = False) -> int:
+        """
+        Correlate all reference blocks whose recording segments are available.
+
+        Segments are used up to the `available` samples of the recording, the ones written
+        so far on an `AudioBuffer` or on a `get_audio` view of one, which makes this safe to
+        call while recording. Its `ridx` is not changed.
+
+        Parameters
+        ----------
+        recording : ossom.Audio
+            An `Audio` or `AudioBuffer` starting at the same time the reference was played.
+        finish : bool, optional
+            If True, also correlate blocks with incomplete segments, zero padded. The default is False.
+
+        Returns
+        -------
+        int
+            Amount of blocks correlated by this call.
+
+        """
+        from ossom.audio import Audio
+        if not isinstance(recording, Audio):
+            recording = Audio(np.asarray(recording), 1)
+        available = recording.available
+        segment = self.blocksize + self.maxlag
+        if finish:
+            last = self.nblocks
+        else:
+            last = min(max((available - segment) // self.blocksize + 1, 0), self.nblocks)
+        if last <= self._done:
+            return 0
+        count = last - self._done
+        start = self._done * self.blocksize
+        stop = min(start + (count - 1) * self.blocksize + segment, available)
+        # Only the incomplete segments at the end need padding, and a copy.
+        frms = recording.frames(segment, self.blocksize, start, stop, pad=finish)[:count]
+        if frms.shape[0] < count:
+            full = np.zeros((count, segment, recording.nchannels))
+            full[:frms.shape[0]] = frms
+            frms = full
+        spec = np.fft.rfft(frms, n=self.nfft, axis=1)
+        spec *= self._refspec[self._done:last]
+        self._cross = self._cross + np.sum(spec, axis=0)
+        heads = frms[:, :self.blocksize].astype(np.float64)
+        self._recenergy = self._recenergy + np.sum(heads**2, axis=(0, 1))
+        self._done = last
+        return count
+
+    def correlation(self) -> np.ndarray:
+        """
+        Cross-correlation of the blocks correlated so far.
+
+        Returns
+        -------
+        np.ndarray
+            Correlation for lags 0 to `maxlag`, with shape (maxlag + 1, nchannels).
+
+        """
+        if not self._done:
+            raise ValueError("No reference block was correlated yet.")
+        return np.fft.irfft(self._cross, n=self.nfft, axis=0)[:self.maxlag + 1]
+
+    def estimate(self, recording=None) -> np.ndarray:
+        """
+        Lag of the recording relative to the reference, for each channel.
+
+        The peak of the absolute correlation, so inverted polarity recordings are found as
+        well, is refined within one sample by evaluating the band limited correlation on
+        a finer grid and fitting a parabola to its maximum.
+
+        Parameters
+        ----------
+        recording : ossom.Audio, optional
+            If given, all blocks left are correlated first, see `update` with `finish`.
+            The default is None, which uses only the blocks already correlated.
+
+        Returns
+        -------
+        np.ndarray
+            Fractional lags, in samples, with shape (nchannels,).
+
+        """
+        if recording is not None:
+            self.update(recording, finish=True)
+        corr = np.abs(self.correlation())
+        peak = np.argmax(corr, axis=0)
+        chans = np.arange(corr.shape[1])
+        # Search the band limited correlation on a finer grid, then fit a parabola.
+        offsets = np.arange(-_FINE, _FINE + 1) / _FINE
+        fine = np.abs(_interpolate(self._cross, self.nfft, peak[None, :] + offsets[:, None]))
+        best = np.clip(np.argmax(fine, axis=0), 1, 2 * _FINE - 1)
+        delta = _parabolic(fine[best - 1, chans], fine[best, chans], fine[best + 1, chans])
+        self._lags = np.clip(peak + offsets[best] + delta / _FINE, 0., self.maxlag)
+        # Height of the parabola vertex, the correlation at the fractional lag.
+        top = fine[best, chans] - 0.25 * (fine[best - 1, chans] - fine[best + 1, chans]) * delta
+        refenergy = self._refenergy[self._done - 1]
+        self._score = top / np.sqrt(np.maximum(refenergy * self._recenergy, 1e-30))
+        return self._lags
+
+    def align(self, recording, lag: float = None):
+        """
+        View of the recording starting at `lag`, with no copy.
+
+        Parameters
+        ----------
+        recording : ossom.Audio
+            An `Audio` or `AudioBuffer`.
+        lag : float, optional
+            Lag in samples, rounded to the nearest integer. The default is None, which uses
+            the lag of the channel with the highest `score` on the last `estimate`.
+
+        Returns
+        -------
+        ossom.Audio
+            Audio whose data is a view of the recording data.
+
+        """
+        from ossom.audio import Audio
+        if lag is None:
+            if self._lags is None:
+                self.estimate(recording)
+            lag = self._lags[np.argmax(self._score)]
+        return Audio(recording.data[int(round(lag)):], recording.samplerate, recording.blocksize)
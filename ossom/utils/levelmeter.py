@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Sound level meter with frequency and time weightings.
+
+Frequency weighting (A, C or Z) and exponential time weighting (Fast, Slow or Impulse)
+run sample by sample on a compiled kernel, for all channels at once, keeping state between
+blocks. Levels are written every `decimation` samples.
+
+    >>> slm = SoundLevelMeter(48000, nchannels=16, frequency='A', time='fast')
+    >>> for block in audio:
+    ...     traces = slm.process(block)  # (ntraces, 16) LAF levels
+    >>> slm.leq  # LAeq since start
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import numba as nb
+from .maths import warms_up, dB
+
+
+# IEC 61672-1 pole frequencies, in hertz.
+_F1, _F2, _F3, _F4 = 20.598997, 107.65265, 737.86223, 12194.217
+
+# Time constants, in seconds, as (rise, decay).
+_TIMES = {'fast': (0.125, 0.125),
+          'slow': (1., 1.),
+          'impulse': (0.035, 1.5)}
+
+
+def _sos_response(sos: np.ndarray, freqs: np.ndarray, samplerate: int) -> np.ndarray:
+    """Complex frequency response of second-order sections."""
+    zm1 = np.exp(-2j * np.pi * np.asarray(freqs) / samplerate)[:, None]
+    return np.prod((sos[:, 0] + sos[:, 1] * zm1 + sos[:, 2] * zm1**2)
+                   / (sos[:, 3] + sos[:, 4] * zm1 + sos[:, 5] * zm1**2), axis=1)
+
+
+def _analog_response(poles: tuple, nzeros: int, freqs: np.ndarray) -> np.ndarray:
+    """Magnitude of the analog weighting, with `nzeros` zeros at the origin, up to a constant."""
+    freqs = np.asarray(freqs)
+    return np.abs(freqs**nzeros / np.prod([1 + 1j * freqs / fp for fp in poles], axis=0))
+
+
+def weighting_sos(frequency: str = 'A', samplerate: int = 48000) -> np.ndarray:
+    """
+    Second-order sections of a frequency weighting filter.
+
+    Low frequency IEC 61672-1 poles and the zeros at the origin are mapped with the bilinear transform.
+    The double pole at 12194 Hz is mapped with the matched z-transform, together with
+    one real zero placed to best fit the analog response up to 0.45 `samplerate`,
+    which avoids the bilinear frequency warping close to Nyquist. Gain is 0 dB at 1 kHz.
+
+    Parameters
+    ----------
+    frequency : str, optional
+        Either 'A', 'C' or 'Z'. The default is 'A'.
+    samplerate : int, optional
+        Sample rate. The default is 48000.
+
+    Raises
+    ------
+    ValueError
+        If the weighting is unknown.
+
+    Returns
+    -------
+    sos : np.ndarray
+        Coefficients `[b0, b1, b2, a0, a1, a2]` with shape (nsections, 6).
+
+    """
+    frequency = frequency.upper()
+    if frequency == 'Z':
+        return np.array([[1., 0., 0., 1., 0., 0.]])
+    elif frequency == 'C':
+        lowpoles = [(_F1, _F1)]
+    elif frequency == 'A':
+        lowpoles = [(_F1, _F1), (_F2, _F3)]
+    else:
+        raise ValueError(f"Unknown frequency weighting: {frequency}.")
+    fs2 = 2. * samplerate
+    sos = np.zeros((len(lowpoles) + 1, 6))
+    for k, poles in enumerate(lowpoles):
+        pa, pb = [(fs2 - 2 * np.pi * f) / (fs2 + 2 * np.pi * f) for f in poles]
+        sos[k] = [1., -2., 1., 1., -(pa + pb), pa * pb]
+    pole = np.exp(-2 * np.pi * _F4 / samplerate)
+    sos[-1, 3:] = [1., -2 * pole, pole**2]
+    # Fit the zero of the high frequency section to the analog response.
+    grid = np.geomspace(1000., 0.45 * samplerate, 128)
+    analog = sum(lowpoles, ()) + (_F4, _F4)
+    target = 20 * np.log10(_analog_response(analog, 2 * len(lowpoles), np.r_[1000., grid]))
+    target = target[1:] - target[0]
+    best = np.inf
+    for zero in np.linspace(-1., 0., 201):
+        sos[-1, :3] = [1., -zero, 0.]
+        resp = 20 * np.log10(np.abs(_sos_response(sos, np.r_[1000., grid], samplerate)))
+        err = np.max(np.abs(resp[1:] - resp[0] - target))
+        if err < best:
+            best, bestzero = err, zero
+    sos[-1, :3] = [1., -bestzero, 0.]
+    gain = np.abs(_sos_response(sos, [1000.], samplerate))[0]
+    sos[:, :3] *= gain**(-1 / sos.shape[0])
+    return sos
+
+
+@nb.njit(parallel=True, cache=True)
+def _slm(auddata: np.ndarray, sos: np.ndarray, state: np.ndarray,
+         rise: float, decay: float, energy: np.ndarray, total: np.ndarray,
+         decimation: int, phase: int, out: np.ndarray) -> None:
+    """
+    Weight, square and integrate all channels, writing energy every `decimation` samples.
+
+    `phase` is how many samples passed since the last output. `state` has shape
+    (nsections, nchannels, 2), and `energy` and `total` hold the time weighted and the
+    accumulated squared values of each channel.
+    """
+    nsamples, nchannels = auddata.shape
+    nsections = sos.shape[0]
+    for ch in nb.prange(nchannels):
+        zi = state[:, ch]
+        ener = energy[ch]
+        acc = 0.
+        row = 0
+        for n in range(nsamples):
+            val = float(auddata[n, ch])
+            for sec in range(nsections):
+                res = sos[sec, 0] * val + zi[sec, 0]
+                zi[sec, 0] = sos[sec, 1] * val - sos[sec, 4] * res + zi[sec, 1]
+                zi[sec, 1] = sos[sec, 2] * val - sos[sec, 5] * res
+                val = res
+            val *= val
+            acc += val
+            ener += (rise if val > ener else decay) * (val - ener)
+            if (phase + n + 1) % decimation == 0:
+                out[row, ch] = ener
+                row += 1
+        energy[ch] = ener
+        total[ch] += acc
+    return
+
+
+@warms_up
+def _warmup_levelmeter(auddata: np.ndarray) -> None:
+    SoundLevelMeter(48000, auddata.shape[1], decimation=8).process(auddata)
+    return
+
+
+class SoundLevelMeter(object):
+    """Frequency and time weighted sound level meter for many channels."""
+
+    def __init__(self, samplerate: int = 48000,
+                 nchannels: int = 1,
+                 frequency: str = 'A',
+                 time: str = 'fast',
+                 decimation: int = None,
+                 ref: float = 1.0) -> None:
+        """
+        Continuous level meter, state is kept between calls to `process`.
+
+        Parameters
+        ----------
+        samplerate : int, optional
+            Audio sample rate. The default is 48000.
+        nchannels : int, optional
+            Number of channels. The default is 1.
+        frequency : str, optional
+            Frequency weighting, either 'A', 'C' or 'Z'. The default is 'A'.
+        time : str, optional
+            Time weighting, either 'fast', 'slow' or 'impulse'. The default is 'fast'.
+        decimation : int, optional
+            Samples between output levels. The default is None, which means 1/8 second.
+        ref : float, optional
+            The decibel reference, e.g. the value of 20 µPa after calibration. The default is 1.0.
+
+        Raises
+        ------
+        ValueError
+            If the frequency or time weighting is unknown.
+
+        Returns
+        -------
+        None.
+
+        """
+        if time.lower() not in _TIMES:
+            raise ValueError(f"Unknown time weighting: {time}.")
+        self.samplerate = samplerate
+        self.nchannels = nchannels
+        self.frequency = frequency.upper()
+        self.time = time.lower()
+        self.decimation = int(samplerate // 8 if decimation is None else decimation)
+        self.ref = ref
+        self._sos = weighting_sos(self.frequency, samplerate)
+        rise, decay = _TIMES[self.time]
+        self._rise = 1 - np.exp(-1 / (rise * samplerate))
+        self._decay = 1 - np.exp(-1 / (decay * samplerate))
+        self._state = np.zeros((self._sos.shape[0], nchannels, 2))
+        self._energy = np.zeros(nchannels)
+        self._total = np.zeros(nchannels)
+        self._out = np.zeros((0, nchannels))
+        self.reset()
+        return
+
+    @property
+    def count(self) -> int:
+        """Amount of samples processed."""
+        return self._count
+
+    @property
+    def level(self) -> np.ndarray:
+        """Current time weighted level per channel, in decibel, with shape (1, nchannels)."""
+        return dB(self._energy.reshape((1, -1)), True, self.ref**2)
+
+    @property
+    def leq(self) -> np.ndarray:
+        """Frequency weighted equivalent level since start or `reset`, with shape (1, nchannels)."""
+        return dB((self._total / max(self._count, 1)).reshape((1, -1)), True, self.ref**2)
+
+    def ntraces(self, nsamples: int) -> int:
+        """Amount of levels the next `process` call with `nsamples` will output."""
+        return (self._count % self.decimation + nsamples) // self.decimation
+
+    def reset(self) -> None:
+        """Zero filter states, time integration and totals."""
+        self._state[:] = 0.
+        self._energy[:] = 0.
+        self._total[:] = 0.
+        self._count = 0
+        return
+
+    def process(self, auddata: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Run the meter over a block and return the levels output during it.
+
+        Parameters
+        ----------
+        auddata : np.ndarray
+            Audio data with shape (nsamples, nchannels).
+        out : np.ndarray, optional
+            Array with at least `ntraces(nsamples)` rows and `nchannels` columns to write
+            the levels to. The default is None, which uses an internal buffer that is
+            overwritten by the next call.
+
+        Returns
+        -------
+        np.ndarray
+            View of `out` with the new levels, in decibel, with shape (ntraces, nchannels).
+
+        """
+        ntraces = self.ntraces(auddata.shape[0])
+        if out is None:
+            if self._out.shape[0] < ntraces:
+                self._out = np.zeros((ntraces, self.nchannels))
+            out = self._out
+        _slm(auddata, self._sos, self._state, self._rise, self._decay,
+             self._energy, self._total, self.decimation, self._count % self.decimation, out)
+        self._count += auddata.shape[0]
+        levels = out[:ntraces]
+        np.maximum(levels, 1e-30, out=levels)
+        np.log10(levels, out=levels)
+        levels *= 10
+        levels -= 20 * np.log10(self.ref)
+        return levels
@@ -5,15 +5,34 @@ This module provide two classes: `Now` and `Logger`.
 The first is just a wrap around time.localtime() with human readable interface of the exact time instant the object is created.
 The latter is a simple file logger that uses `Now` instances to record information.
 
+An asynchronous `Logger` only queues a timestamp and the message on `log`, and a background
+thread formats and writes queued messages in batches, so disk stalls and string formatting
+stay out of real-time loops.
+
+Long running loggers can rotate to a new segment file after a size or a duration. Closed
+segments are compressed on a background thread and listed, with their time ranges, on an
+index file, so `read_log` opens only the segments of the period asked for.
+
+Numeric results, like levels per channel, are better kept on a `MetricsLog`, a binary file
+with a fixed channels by metrics schema, written in blocks of columns: the timestamps, then
+each metric for all channels. `load_metrics` maps them back to numpy arrays without parsing,
+and reading one metric only touches the pages of that metric.
+
 Created on Sat Jun  6 00:39:46 2020
 
 @author: joaovitor
 """
 
-# import json
+import os
+import json
+import gzip
 import time
+import queue
+import shutil
+import threading as td
 import random as rd
-from typing import TextIO
+import numpy as np
+from typing import TextIO, Tuple
 
 
 class Now(object):
@@ -85,16 +104,63 @@ class Now(object):
         return self._GMT
 
 
+class _LogQueue(object):
+    """Bounded single producer, single consumer ring of log entries."""
+
+    def __init__(self, size: int) -> None:
+        self._slots = [None] * size
+        self._head = 0  # Only moved by the consumer.
+        self._tail = 0  # Only moved by the producer.
+        return
+
+    def __len__(self):
+        return self._tail - self._head
+
+    def put(self, entry: tuple) -> bool:
+        """Queue `entry`, unless the ring is full."""
+        if self._tail - self._head >= len(self._slots):
+            return False
+        self._slots[self._tail % len(self._slots)] = entry
+        # The entry is in place before the consumer can see it.
+        self._tail += 1
+        return True
+
+    def get_all(self) -> list:
+        """Take all queued entries, oldest first."""
+        tail = self._tail
+        size = len(self._slots)
+        entries = [self._slots[idx % size] for idx in range(self._head, tail)]
+        for idx in range(self._head, tail):
+            self._slots[idx % size] = None
+        self._head = tail
+        return entries
+
+
 class Logger(object):
     """Simple logger."""
 
     _randlogs = ['Albatroz', 'Jaguatirica', 'Jibóia', 'Arara', 'Mico', 'Boitatá', 'Boto Cor-de-Rosa']
 
     def __init__(self, name: str = 'common', ext: str = 'log',
-                 title: str = 'title', logend: str = 'end.') -> None:
+                 title: str = 'title', logend: str = 'end.',
+                 asynchronous: bool = False, queuesize: int = 4096,
+                 flushtime: float = 0.25, maxbytes: int = None,
+                 maxtime: float = None, compress: bool = True) -> None:
         """
         File based logger.
 
+        If `asynchronous`, `log` only queues the message with a monotonic timestamp, and a
+        writer thread, started by `fopen` on the process that logs, formats and writes all
+        queued messages every `flushtime` seconds. When the queue is full messages are
+        dropped and counted on `dropped`, instead of blocking the caller.
+
+        If `maxbytes` or `maxtime` are given, the log is written to numbered segments,
+        `name.000001.ext` and so on, and a new one is started when the current segment
+        reaches either limit. Each `fopen` also starts a new segment. Segments are listed
+        on `name.ext.index`, see `log_segments`, and gzip compressed when closed. Segments
+        left open or uncompressed by a process that died are closed and compressed on `fopen`,
+        the ones of live processes are left to them.
+
         Parameters
         ----------
         name : str, optional
@@ -106,12 +172,36 @@ class Logger(object):
         logend : str, optional
             A tag that represents the end of a logging session.
             The default is 'end.'.
+        asynchronous : bool, optional
+            Write from a background thread. The default is False.
+        queuesize : int, optional
+            Most messages waiting to be written, if asynchronous. The default is 4096.
+        flushtime : float, optional
+            Seconds between writes, if asynchronous. The default is 0.25.
+        maxbytes : int, optional
+            Most bytes of a segment, once encoded. A new segment is started before a line
+            that would go over it, so only a single longer line makes a bigger segment.
+            The default is None.
+        maxtime : float, optional
+            Seconds of a segment before rotating. The default is None.
+        compress : bool, optional
+            Compress closed segments, if rotating. The default is True.
 
         Returns
         -------
         None
 
         """
+        self._asynchronous = asynchronous
+        self._queuesize = int(queuesize)
+        self._flushtime = flushtime
+        self._queue = None
+        self._dropped = 0
+        self._maxbytes = maxbytes
+        self._maxtime = maxtime
+        self._compress = compress
+        self._compressor = None
+        self._started = False
         self._name = name
         self._ext = ext
         self._title = title
@@ -164,14 +254,195 @@ class Logger(object):
         """File pointer."""
         return self._file
 
+    @property
+    def asynchronous(self) -> bool:
+        """True if messages are written by a background thread."""
+        return self._asynchronous
+
+    @property
+    def rotating(self) -> bool:
+        """True if the log is written to segments."""
+        return self._maxbytes is not None or self._maxtime is not None
+
+    @property
+    def filename(self) -> str:
+        """Name of the file being written."""
+        return self._filename
+
+    @property
+    def dropped(self) -> int:
+        """Messages dropped because the queue was full."""
+        return self._dropped
+
     def fopen(self):
-        """Open the log file, enabling `read` and `write`."""
-        self._file = open(f'{self.name}.{self.ext}', mode='a+')
+        """Open the log file, or a new segment if rotating, enabling `read` and `write`."""
+        if self.rotating:
+            self._recover_segments()
+            self._open_segment()
+        else:
+            self._filename = f'{self.name}.{self.ext}'
+            self._file = open(self._filename, mode='a+')
+        if self.asynchronous:
+            self._queue = _LogQueue(self._queuesize)
+            self._wakeup = td.Event()
+            self._flushes = queue.SimpleQueue()
+            self._stopping = False
+            self._writer = td.Thread(target=self._write_loop, daemon=True)
+            self._writer.start()
+        return
+
+    def _write(self, text: str) -> int:
+        """Write `text` as is, queued behind pending messages if asynchronous."""
+        if self._queue is None:
+            return self._emit(text)
+        return self._put((None, text))
+
+    def _emit(self, text: str) -> int:
+        """Write to the file, from the thread that owns it, and rotate if due, also within `text`."""
+        if not self.rotating:
+            self.file.write(text)
+            return len(text.encode(self.file.encoding))
+        nbytes = 0
+        # Line by line, so an asynchronous batch is split at `maxbytes` like single messages.
+        for line in text.splitlines(keepends=True):
+            size = len(line.encode(self.file.encoding))
+            if self._maxbytes is not None and self._segbytes and self._segbytes + size > self._maxbytes:
+                self._rotate()
+            self.file.write(line)
+            self._segbytes += size
+            nbytes += size
+        if self._maxtime is not None and time.time() - self._segstart >= self._maxtime:
+            self._rotate()
+        return nbytes
+
+    def _rotate(self):
+        self._close_segment()
+        self._open_segment()
+        if self._started:
+            self.file.write(self.header)
+            self._segbytes += len(self.header.encode(self.file.encoding))
+        return
+
+    def _open_segment(self):
+        index = _read_index(self.name, self.ext)
+        seq = max([entry['seq'] for entry in index], default=0) + 1
+        self._filename = f'{self.name}.{seq:06d}.{self.ext}'
+        self._file = open(self._filename, mode='a+')
+        self._segstart = time.time()
+        self._segbytes = 0
+        self._segseq = seq
+        _append_index(self.name, self.ext, {'seq': seq, 'file': self._filename,
+                                            'start': self._segstart, 'end': None, 'pid': os.getpid()})
+        return
+
+    def _recover_segments(self):
+        """Close and compress segments left open or uncompressed on the index by processes that died."""
+        for entry in _read_index(self.name, self.ext):
+            filename = entry['file']
+            # Segments of live processes, this one included, are still written or compressed by them.
+            if filename is None or _running(entry.get('pid')):
+                continue
+            plain = filename[:-3] if filename.endswith('.gz') else filename
+            if not os.path.exists(plain):
+                continue
+            if entry['end'] is None:
+                if not os.path.getsize(plain):
+                    os.remove(plain)
+                    _append_index(self.name, self.ext, {'seq': entry['seq'], 'file': None, 'start': entry['start'],
+                                                        'end': entry['start'], 'pid': os.getpid()})
+                    continue
+                filename = plain + '.gz' if self._compress else plain
+            elif filename == plain:
+                continue
+            # Claimed by this process, so others leave it alone.
+            _append_index(self.name, self.ext, {'seq': entry['seq'], 'file': filename, 'start': entry['start'],
+                                                'end': entry['end'] or os.path.getmtime(plain), 'pid': os.getpid()})
+            if filename != plain:
+                self._compress_segment(plain)
+        return
+
+    def _close_segment(self):
+        self.file.close()
+        del self._file
+        if not self._segbytes:
+            os.remove(self._filename)
+            _append_index(self.name, self.ext, {'seq': self._segseq, 'file': None, 'start': self._segstart,
+                                                'end': self._segstart, 'pid': os.getpid()})
+            return
+        filename = self._filename + '.gz' if self._compress else self._filename
+        _append_index(self.name, self.ext, {'seq': self._segseq, 'file': filename, 'start': self._segstart,
+                                            'end': time.time(), 'pid': os.getpid()})
+        if self._compress:
+            self._compress_segment(self._filename)
+        return
+
+    def _compress_segment(self, filename: str):
+        if self._compressor is None:
+            self._pending = queue.Queue()
+            self._compressor = td.Thread(target=_compress_loop, args=(self._pending,), daemon=True)
+            self._compressor.start()
+        self._pending.put(filename)
+        return
+
+    def _put(self, entry: tuple) -> int:
+        if self._queue.put(entry):
+            return 1
+        self._dropped += 1
+        return 0
+
+    def _format(self, entries: list) -> str:
+        """Turn queued entries into text, with wall clock times."""
+        offset = time.time() - time.monotonic()
+        lines = []
+        last, stamp = None, None
+        for ts, msg in entries:
+            if ts is None:
+                lines.append(msg)
+                continue
+            sec = int(ts + offset)
+            if sec != last:
+                last, stamp = sec, time.strftime('%H-%M-%S', time.localtime(sec))
+            lines.append(f"{stamp} : {msg}\n")
+        return ''.join(lines)
+
+    def _write_loop(self):
+        """Writer thread, the only consumer of the queue, writes all queued messages at once."""
+        while not self._stopping:
+            self._wakeup.wait(self._flushtime)
+            self._wakeup.clear()
+            self._drain()
+        self._drain()
+        return
+
+    def _drain(self):
+        """Write all queued messages and flush the file, waking the `flush` calls waiting on it."""
+        waiting = []
+        while not self._flushes.empty():
+            waiting.append(self._flushes.get())
+        if len(self._queue):
+            self._emit(self._format(self._queue.get_all()))
+        self.file.flush()
+        for done in waiting:
+            done.set()
+        return
+
+    def flush(self):
+        """Write all queued messages and flush the file, through the writer thread if asynchronous."""
+        if self._queue is None:
+            self.file.flush()
+            return
+        done = td.Event()
+        self._flushes.put(done)
+        self._wakeup.set()
+        while not done.wait(self._flushtime):
+            if not self._writer.is_alive():
+                break
         return
 
     def start_log(self):
-        """Write header to log file."""
-        self.file.write(self.header)
+        """Write header to log file, and to each new segment if rotating."""
+        self._started = True
+        self._write(self.header)
         return
 
     def log(self, message: str = None) -> int:
@@ -182,32 +453,56 @@ class Logger(object):
         ----------
         message : str, optional
             The content of the logging. If no input is given, randomizes an item from `LogFile._randlog`.
-            The default is None.
+            If asynchronous, any object can be given and it is only turned into text by
+            the writer thread, so it must not be changed afterwards. The default is None.
 
         Returns
         -------
         b : int
-            The amount of bytes written to log file.
+            The amount of bytes written to log file. If asynchronous, 1 if the message
+            was queued or 0 if it was dropped.
 
         """
-        time = Now().time
         msg = message if not message is None \
             else Logger._randlogs[rd.randint(0, len(Logger._randlogs)-1)]
-        return self.file.write(f"{time} : {msg}\n")
+        if self._queue is not None:
+            return self._put((time.monotonic(), msg))
+        return self._emit(f"{Now().time} : {msg}\n")
 
     def end_log(self):
         """Write the end of logging tag."""
-        self.file.write(self.logend)
+        self._started = False
+        self._write(self.logend)
         return
 
     def fclose(self):
-        """Close the log file."""
-        self.file.close()
-        del self._file
+        """Close the log file, after writing all queued messages if asynchronous."""
+        if self._queue is not None:
+            self._stopping = True
+            self._wakeup.set()
+            self._writer.join()
+            self._queue = None
+        if self.rotating:
+            self._close_segment()
+            if self._compressor is not None:
+                self._pending.join()
+        else:
+            self.file.close()
+            del self._file
         return
 
-    def print_log(self):
-        """Print the log file content. File must be opened."""
+    def print_log(self, start: float = None, stop: float = None):
+        """
+        Print the log file content.
+
+        If rotating, only segments overlapping `start` to `stop`, in seconds since epoch,
+        are read, see `read_log`. Otherwise the whole file is printed.
+        """
+        if self.rotating:
+            if hasattr(self, '_file'):
+                self.flush()
+            print(read_log(self.name, self.ext, start, stop))
+            return
         try:
             self.file.seek(0)
             print(self.file.read())
@@ -219,6 +514,391 @@ class Logger(object):
         return
 
 
+def _running(pid: int) -> bool:
+    """True if a process with `pid` exists, False also for None."""
+    if pid is None:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _index_name(name: str, ext: str) -> str:
+    return f'{name}.{ext}.index'
+
+
+def _read_index(name: str, ext: str) -> list:
+    """All index entries, the latest entry of each segment wins."""
+    entries = {}
+    try:
+        with open(_index_name(name, ext)) as file:
+            for line in file:
+                if line.strip():
+                    entry = json.loads(line)
+                    entries[entry['seq']] = entry
+    except FileNotFoundError:
+        pass
+    return [entries[seq] for seq in sorted(entries)]
+
+
+def _append_index(name: str, ext: str, entry: dict) -> None:
+    with open(_index_name(name, ext), 'a') as file:
+        file.write(json.dumps(entry) + '\n')
+    return
+
+
+def _compress_loop(pending: queue.Queue) -> None:
+    """Gzip closed segments, the original is removed only after the compressed file is complete."""
+    while True:
+        filename = pending.get()
+        try:
+            # A temporary file per process, in case two of them recover the same segment.
+            tmpname = f'{filename}.{os.getpid()}.gz.tmp'
+            with open(filename, 'rb') as src, gzip.open(tmpname, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.replace(tmpname, filename + '.gz')
+            os.remove(filename)
+        except OSError:
+            pass
+        finally:
+            pending.task_done()
+
+
+def log_segments(name: str = 'common', ext: str = 'log',
+                 start: float = None, stop: float = None) -> list:
+    """
+    Segments of a rotating log that overlap a time range.
+
+    Parameters
+    ----------
+    name : str, optional
+        Log name, as given to `Logger`. The default is 'common'.
+    ext : str, optional
+        File extension. The default is 'log'.
+    start : float, optional
+        Range start, in seconds since epoch. The default is None, from the first segment.
+    stop : float, optional
+        Range end, in seconds since epoch. The default is None, up to the last segment.
+
+    Returns
+    -------
+    list
+        Dictionaries with the segment `seq`, `file`, `start` and `end` time, oldest first.
+        `end` is None while the segment is open.
+
+    """
+    now = time.time()
+    return [entry for entry in _read_index(name, ext) if entry['file'] is not None
+            and (start is None or (entry['end'] or now) >= start)
+            and (stop is None or entry['start'] <= stop)]
+
+
+def read_log(name: str = 'common', ext: str = 'log',
+             start: float = None, stop: float = None) -> str:
+    """
+    Text of the segments of a rotating log that overlap a time range, see `log_segments`.
+
+    Compressed segments are decompressed, and segments still being compressed are read
+    from the original file.
+    """
+    texts = []
+    for entry in log_segments(name, ext, start, stop):
+        filename = entry['file']
+        plain = filename[:-3] if filename.endswith('.gz') else filename
+        try:
+            with open(plain) as file:
+                texts.append(file.read())
+        except FileNotFoundError:
+            if filename != plain and os.path.exists(filename):
+                with gzip.open(filename, 'rt') as file:
+                    texts.append(file.read())
+    return ''.join(texts)
+
+
+_MAGIC = b'OSSOMLOG'
+_HEADERSIZE = 512  # bytes, magic followed by the JSON schema padded with spaces
+
+
+def _blocksize(nrows: int, schema: dict) -> int:
+    """
+    Bytes of a block of `nrows` rows.
+
+    A block is its int64 row count, the float64 timestamps, then one (nrows, nchannels)
+    column per metric, padded to 8 bytes so every block starts aligned.
+    """
+    values = len(schema['metrics']) * nrows * schema['nchannels'] * np.dtype(schema['dtype']).itemsize
+    return 8 + 8 * nrows + -(-values // 8) * 8
+
+
+def _scan_blocks(file, schema: dict) -> Tuple[list, int]:
+    """Offset and row count of each complete block, and the end of the last one."""
+    size = file.seek(0, 2)
+    blocks, offset = [], _HEADERSIZE
+    while offset + 8 <= size:
+        file.seek(offset)
+        nrows = int(np.frombuffer(file.read(8), dtype=np.int64)[0])
+        if nrows <= 0 or offset + _blocksize(nrows, schema) > size:
+            break
+        blocks.append((offset, nrows))
+        offset += _blocksize(nrows, schema)
+    return blocks, offset
+
+
+def _read_schema(filename: str) -> dict:
+    with open(filename, 'rb') as file:
+        header = file.read(_HEADERSIZE)
+    if len(header) < _HEADERSIZE or not header.startswith(_MAGIC):
+        raise ValueError(f"{filename} is not a metrics log.")
+    return json.loads(header[len(_MAGIC):].decode())
+
+
+class MetricsLog(object):
+    """Binary log of fixed schema numeric results, stored by columns."""
+
+    def __init__(self, name: str = 'metrics', ext: str = 'mlog',
+                 nchannels: int = 1,
+                 metrics: Tuple[str] = ('rms',),
+                 dtype: np.dtype = np.float32,
+                 chunksize: int = 256) -> None:
+        """
+        Append rows of `metrics` by `nchannels` values, each with a timestamp.
+
+        Rows are copied to in memory columns and written as one block of columns once every
+        `chunksize` rows, or on `flush`. An existing file is appended to if its schema is the same.
+
+            >>> mlog = MetricsLog('levels', nchannels=2, metrics=('rms', 'peak'))
+            >>> mlog.append(np.vstack((rms(data), max_abs(data))))
+            >>> mlog.close()
+            >>> times, values, metrics = load_metrics('levels.mlog')  # values[:, 0] is rms
+
+        Parameters
+        ----------
+        name : str, optional
+            File name. The default is 'metrics'.
+        ext : str, optional
+            File extension. The default is 'mlog'.
+        nchannels : int, optional
+            Number of channels. The default is 1.
+        metrics : Tuple[str], optional
+            Names of the metrics. The default is ('rms',).
+        dtype : np.dtype, optional
+            Type of the values. The default is np.float32.
+        chunksize : int, optional
+            Rows written at once, as one block. The default is 256.
+
+        Raises
+        ------
+        ValueError
+            If the file exists with another schema.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._name = name
+        self._ext = ext
+        self._schema = {'version': 2, 'nchannels': int(nchannels),
+                        'metrics': list(metrics), 'dtype': np.dtype(dtype).str}
+        self._times = np.zeros(int(chunksize), dtype=np.float64)
+        self._values = np.zeros((len(metrics), int(chunksize), nchannels), dtype=dtype)
+        self._rows = 0
+        self.fopen()
+        return
+
+    def __del__(self):
+        """Write pending rows and close the file on del statement."""
+        try:
+            self.close()
+        except AttributeError:
+            pass
+        return
+
+    @property
+    def filename(self) -> str:
+        """Log file name with extension."""
+        return f'{self._name}.{self._ext}'
+
+    @property
+    def metrics(self) -> Tuple[str]:
+        """Names of the metrics."""
+        return tuple(self._schema['metrics'])
+
+    @property
+    def nchannels(self) -> int:
+        """Number of channels."""
+        return self._schema['nchannels']
+
+    @property
+    def pending(self) -> int:
+        """Rows not yet written to the file."""
+        return self._rows
+
+    def fopen(self):
+        """Open the file for appending, writing the schema header on a new file."""
+        try:
+            schema = _read_schema(self.filename)
+        except FileNotFoundError:
+            schema = None
+        if schema is None:
+            header = json.dumps(self._schema).encode()
+            if len(_MAGIC) + len(header) > _HEADERSIZE:
+                raise ValueError("Too many metrics for the log header.")
+            with open(self.filename, 'wb') as file:
+                file.write(_MAGIC + header.ljust(_HEADERSIZE - len(_MAGIC)))
+        elif schema != self._schema:
+            raise ValueError(f"{self.filename} has another schema: {schema}.")
+        self._file = open(self.filename, 'ab')
+        # Drop a partial block left by an interrupted write.
+        with open(self.filename, 'rb') as file:
+            _, end = _scan_blocks(file, self._schema)
+        if self._file.tell() > end:
+            self._file.truncate(end)
+            self._file.seek(0, 2)
+        return
+
+    def append(self, values: np.ndarray, timestamp: float = None) -> None:
+        """
+        Add one row.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Values broadcastable to (nmetrics, nchannels), e.g. stacked results with shape (1, nchannels).
+        timestamp : float, optional
+            Seconds since epoch. The default is None, which means `time.time()`.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._times[self._rows] = time.time() if timestamp is None else timestamp
+        self._values[:, self._rows] = values
+        self._rows += 1
+        if self._rows == self._times.shape[0]:
+            self.flush()
+        return
+
+    def extend(self, values: np.ndarray, timestamps: np.ndarray) -> None:
+        """
+        Add many rows at once, written straight to the file as one block after pending rows.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Values with shape (nrows, nmetrics, nchannels).
+        timestamps : np.ndarray
+            Seconds since epoch of each row.
+
+        Returns
+        -------
+        None.
+
+        """
+        nrows = len(timestamps)
+        columns = np.empty((len(self.metrics), nrows, self.nchannels), dtype=self._values.dtype)
+        columns[:] = np.broadcast_to(values, (nrows, len(self.metrics), self.nchannels)).transpose(1, 0, 2)
+        self.flush()
+        self._write_block(np.asarray(timestamps, dtype=np.float64), columns)
+        self._file.flush()
+        return
+
+    def _write_block(self, times: np.ndarray, columns: np.ndarray) -> None:
+        """Write `times` and the (nmetrics, nrows, nchannels) `columns`, see `_blocksize`."""
+        if not times.shape[0]:
+            return
+        data = np.ascontiguousarray(columns).tobytes()
+        self._file.write(np.int64(times.shape[0]).tobytes())
+        self._file.write(np.ascontiguousarray(times).tobytes())
+        self._file.write(data + bytes(-len(data) % 8))
+        return
+
+    def flush(self):
+        """Write pending rows to the file, as one block."""
+        if self._rows:
+            self._write_block(self._times[:self._rows], self._values[:, :self._rows])
+            self._rows = 0
+        self._file.flush()
+        return
+
+    def close(self):
+        """Write pending rows and close the file."""
+        self.flush()
+        self._file.close()
+        del self._file
+        return
+
+
+def load_metrics(filename: str, mmap: bool = True,
+                 metrics: Tuple[str] = None) -> Tuple[np.ndarray, np.ndarray, Tuple[str]]:
+    """
+    Read a `MetricsLog` file.
+
+    Parameters
+    ----------
+    filename : str
+        The file name, with extension.
+    mmap : bool, optional
+        If True, arrays come from a memory map of the file, only the pages actually used
+        are read from disk, and a file of a single block is returned as read-only views.
+        The default is True.
+    metrics : Tuple[str], optional
+        Names of the metrics to read, the columns of the others are not read.
+        The default is None, all of them.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a metrics log of a known version, or has no metric of a given name.
+
+    Returns
+    -------
+    times : np.ndarray
+        Timestamp of each row, in seconds since epoch, with shape (nrows,).
+    values : np.ndarray
+        Values with shape (nrows, nmetrics, nchannels). Each metric is contiguous in memory.
+    metrics : Tuple[str]
+        Names of the metrics, in order.
+
+    """
+    schema = _read_schema(filename)
+    if schema.get('version') != 2:
+        raise ValueError(f"{filename} has an unknown metrics log version: {schema.get('version')}.")
+    names = tuple(schema['metrics'])
+    select = list(range(len(names))) if metrics is None else [names.index(name) for name in metrics]
+    nchannels, dtype = schema['nchannels'], np.dtype(schema['dtype'])
+    with open(filename, 'rb') as file:
+        blocks, end = _scan_blocks(file, schema)
+        data = np.memmap(file, dtype=np.uint8, mode='r', shape=(end,)) if mmap and blocks else None
+
+        def column(offset: int, dt: np.dtype, count: int) -> np.ndarray:
+            if data is not None:
+                return data[offset:offset + count * dt.itemsize].view(dt)
+            file.seek(offset)
+            return np.fromfile(file, dtype=dt, count=count)
+
+        times, values = [], []
+        for offset, nrows in blocks:
+            times.append(column(offset + 8, np.dtype(np.float64), nrows))
+            base, size = offset + 8 + 8 * nrows, nrows * nchannels
+            if data is not None and select == list(range(len(names))):
+                values.append(column(base, dtype, len(names) * size).reshape(len(names), nrows, nchannels))
+                continue
+            values.append(np.stack([column(base + k * size * dtype.itemsize, dtype, size).reshape(nrows, nchannels)
+                                    for k in select]))
+    if len(blocks) == 1:
+        times, values = times[0], values[0]
+    else:
+        times = np.concatenate(times) if blocks else np.zeros(0)
+        values = np.concatenate(values, axis=1) if blocks else np.zeros((len(select), 0, nchannels), dtype=dtype)
+    return times, values.transpose(1, 0, 2), tuple(names[k] for k in select)
+
+
 def _random_log(logger, timeout):
     init = time.time()
     while (init + timeout) > time.time():
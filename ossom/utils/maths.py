@@ -7,8 +7,79 @@ Created on Tue May  5 00:34:36 2020
 @author: João Vitor Gutkoski Paes
 """
 
+import time
+import multiprocessing as mp
 import numpy as np
 import numba as nb
+from numba.extending import overload
+from typing import Sequence, Union
+
+
+_warmups = []
+_warmed = set()
+
+
+def warms_up(func: callable) -> callable:
+    """
+    Register `func` to be run by `warmup`. Used as a decorator.
+
+    `func` receives a small block of audio data and should call every compiled
+    function its module uses in the real-time path.
+    """
+    _warmups.append(func)
+    return func
+
+
+def warmup(dtype: Union[np.dtype, Sequence[np.dtype]] = (np.float32, np.float64),
+           nchannels: int = 2, blocksize: int = 64, process: bool = False) -> float:
+    """
+    Compile, or load from the on-disk cache, every registered numba function.
+
+    Each registered function is run on a C-contiguous block and on a strided view of
+    one, for every `dtype`, so slicing channels or switching between the supported
+    data types does not compile again on the real-time path. Combinations already
+    warmed up on this process are skipped.
+
+    All kernels are decorated with `cache=True`, so only the very first run on a machine
+    compiles, which may take several seconds, and later processes just load the machine
+    code. With `process`, the work is done on a short-lived child process that only fills
+    the on-disk cache, so a cold compile can be paid before a stream starts without
+    starting numba's threading layer on the caller, which is then forked, e.g. by `Monitor`.
+
+    Parameters
+    ----------
+    dtype : np.dtype or sequence of np.dtype, optional
+        Audio data types the kernels will receive. The default is (np.float32, np.float64).
+    nchannels : int, optional
+        Number of channels. The default is 2.
+    blocksize : int, optional
+        Samples of the dummy block. The default is 64.
+    process : bool, optional
+        Compile on a child process and wait for it. The default is False.
+
+    Returns
+    -------
+    float
+        Seconds spent.
+
+    """
+    start = time.monotonic()
+    dtypes = [np.dtype(dt) for dt in (dtype if isinstance(dtype, (tuple, list)) else (dtype,))]
+    if process:
+        proc = mp.Process(target=warmup, args=(dtypes, nchannels, blocksize))
+        proc.start()
+        proc.join()
+        return time.monotonic() - start
+    for dt in dtypes:
+        if (dt, nchannels) in _warmed:
+            continue
+        block = np.zeros((blocksize, nchannels), dtype=dt)
+        strided = np.zeros((blocksize, 2 * nchannels), dtype=dt)[:, ::2]
+        for func in _warmups:
+            func(block)
+            func(strided)
+        _warmed.add((dt, nchannels))
+    return time.monotonic() - start
 
 
 @nb.njit(parallel=True)
@@ -16,6 +87,10 @@ def apply_channelwise(auddata: np.ndarray, func: callable) -> np.ndarray:
     """
     Apply func on each column of an audio data array.
 
+    Each call site with a new `func` compiles again and the result is cast to the
+    input dtype. Prefer the reductions below (`max_abs`, `rms`, `mean`, `mean_square`,
+    `crest_factor`), which share one precompiled parallel engine and accept `out`.
+
     Parameters
     ----------
     auddata : np.ndarray
@@ -36,17 +111,89 @@ def apply_channelwise(auddata: np.ndarray, func: callable) -> np.ndarray:
 
 
 
-@nb.njit
-def max_abs(auddata: np.ndarray) -> np.ndarray:
+_MAXABS, _MEANSQ, _RMS, _MEAN, _CREST = range(5)
+_CHUNK = 1024
+
+
+@nb.njit(parallel=True, cache=True)
+def _reduce(auddata: np.ndarray, kind: int, out: np.ndarray) -> np.ndarray:
     """
-    Maximum of the absolute values of the input array, for each channel (column).
+    Channelwise reduction engine.
 
-    See `apply_channelwise` for more info
+    Data is split in chunks of `_CHUNK` samples, and every (chunk, channel) pair is a task
+    spread over all cores, so even a monitor block of a few thousand samples runs in
+    parallel. Tasks of the same chunk are neighbours, so cores read nearby rows, and the
+    partial results are combined per channel at the end.
+    All accumulation is made in double precision.
+    """
+    nsamples, nchannels = auddata.shape
+    nchunks = max((nsamples + _CHUNK - 1) // _CHUNK, 1)
+    needsq = kind == _MEANSQ or kind == _RMS or kind == _CREST
+    needmax = kind == _MAXABS or kind == _CREST
+    acc = np.zeros((nchunks, nchannels))
+    peak = np.zeros((nchunks, nchannels))
+    for task in nb.prange(nchunks * nchannels):
+        chunk = task // nchannels
+        ch = task % nchannels
+        total = 0.
+        top = 0.
+        for n in range(chunk * _CHUNK, min((chunk + 1) * _CHUNK, nsamples)):
+            value = auddata[n, ch]
+            if needmax:
+                top = max(top, abs(value))
+            if needsq:
+                total += value * value
+            elif not needmax:
+                total += value
+        acc[chunk, ch] = total
+        peak[chunk, ch] = top
+    for ch in nb.prange(nchannels):
+        total = 0.
+        top = 0.
+        for chunk in range(nchunks):
+            total += acc[chunk, ch]
+            top = max(top, peak[chunk, ch])
+        total /= max(nsamples, 1)
+        if kind == _MAXABS:
+            out[0, ch] = top
+        elif kind == _RMS:
+            out[0, ch] = total**0.5
+        elif kind == _CREST:
+            out[0, ch] = top / total**0.5 if total > 0 else 0.
+        else:
+            out[0, ch] = total
+    return out
+
+
+def _out(auddata: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Result array of a reduction, `out` or a new float64 one."""
+    return np.empty((1, auddata.shape[1])) if out is None else out
+
+
+@overload(_out)
+def _out_impl(auddata, out=None):
+    # One implementation per `out` type, as branches of a single function must return the same type.
+    if out is None or isinstance(out, (nb.types.NoneType, nb.types.Omitted)):
+        def new(auddata, out=None):
+            return np.empty((1, auddata.shape[1]))
+        return new
+
+    def given(auddata, out=None):
+        return out
+    return given
+
+
+@nb.njit(cache=True)
+def max_abs(auddata: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Maximum of the absolute values of the input array, for each channel (column).
 
     Parameters
     ----------
     auddata : np.ndarray
         Input array of audio data.
+    out : np.ndarray, optional
+        Array with shape (1, nchannels) to hold the result. The default is None.
 
     Returns
     -------
@@ -54,21 +201,20 @@ def max_abs(auddata: np.ndarray) -> np.ndarray:
         Columnwise `max` of `abs` of `arr`.
 
     """
-    ma = apply_channelwise(auddata, lambda arr: np.max(np.abs(arr)))
-    return ma
+    return _reduce(auddata, _MAXABS, _out(auddata, out))
 
 
-@nb.njit
-def rms(auddata: np.ndarray) -> np.ndarray:
+@nb.njit(cache=True)
+def rms(auddata: np.ndarray, out: np.ndarray = None) -> np.ndarray:
     """
     Root of the mean of the squared values of input array, for each channel.
 
-    See `apply_channelwise` for more info.
-
     Parameters
     ----------
     auddata : np.ndarray
         Input array of audio data.
+    out : np.ndarray, optional
+        Array with shape (1, nchannels) to hold the result. The default is None.
 
     Returns
     -------
@@ -76,16 +222,78 @@ def rms(auddata: np.ndarray) -> np.ndarray:
         Columnwise `sqrt` of `mean` of `arr**2`.
 
     """
-    rms = apply_channelwise(auddata, lambda arr: np.mean(arr**2)**0.5)
-    return rms
+    return _reduce(auddata, _RMS, _out(auddata, out))
+
+
+@nb.njit(cache=True)
+def mean_square(auddata: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Mean of the squared values of input array, for each channel.
 
+    Parameters
+    ----------
+    auddata : np.ndarray
+        Input array of audio data.
+    out : np.ndarray, optional
+        Array with shape (1, nchannels) to hold the result. The default is None.
 
-@nb.njit
+    Returns
+    -------
+    np.ndarray
+        Columnwise `mean` of `arr**2`.
+
+    """
+    return _reduce(auddata, _MEANSQ, _out(auddata, out))
+
+
+@nb.njit(cache=True)
+def mean(auddata: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Mean value of input array, for each channel.
+
+    Parameters
+    ----------
+    auddata : np.ndarray
+        Input array of audio data.
+    out : np.ndarray, optional
+        Array with shape (1, nchannels) to hold the result. The default is None.
+
+    Returns
+    -------
+    np.ndarray
+        Columnwise `mean` of `arr`.
+
+    """
+    return _reduce(auddata, _MEAN, _out(auddata, out))
+
+
+@nb.njit(cache=True)
+def crest_factor(auddata: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """
+    Ratio between peak and RMS values of input array, for each channel.
+
+    Parameters
+    ----------
+    auddata : np.ndarray
+        Input array of audio data.
+    out : np.ndarray, optional
+        Array with shape (1, nchannels) to hold the result. The default is None.
+
+    Returns
+    -------
+    np.ndarray
+        Columnwise `max_abs / rms`. Zero for silent channels.
+
+    """
+    return _reduce(auddata, _CREST, _out(auddata, out))
+
+
+@nb.njit(cache=True)
 def dB(auddata: np.ndarray, power: bool = False, ref: float = 1.0) -> np.ndarray:
     """
     Decibel level of input array, for each channel.
 
-    See `apply_channelwise` and `rms` for more info.
+    See `rms` for more info.
 
     Parameters
     ----------
@@ -105,11 +313,13 @@ def dB(auddata: np.ndarray, power: bool = False, ref: float = 1.0) -> np.ndarray
     return (10 if power else 20) * np.log10(auddata / ref)
 
 
-@nb.njit
+@nb.njit(cache=True)
 def noise(level: float, samplerate: int, tlen: float, nchannels: int) -> np.ndarray:
     """
     Generate random noise for audio data.
 
+    The whole signal is held in memory, see `ossom.utils.generators` for block streaming generators.
+
     Parameters
     ----------
     level : float
@@ -133,3 +343,228 @@ def noise(level: float, samplerate: int, tlen: float, nchannels: int) -> np.ndar
     noise[:, ] /= max_abs(noise)
     return level*noise    # TODO: DEVELOP FOR DECIBEL GAIN LEVEL.
 
+
+@nb.njit(cache=True)
+def _sumsq_update(auddata: np.ndarray, acc: np.ndarray) -> None:
+    for ch in range(auddata.shape[1]):
+        s = 0.
+        for n in range(auddata.shape[0]):
+            s += auddata[n, ch] * auddata[n, ch]
+        acc[ch] += s
+
+
+@nb.njit(cache=True)
+def _minmax_update(auddata: np.ndarray, mn: np.ndarray, mx: np.ndarray) -> None:
+    for ch in range(auddata.shape[1]):
+        for n in range(auddata.shape[0]):
+            if auddata[n, ch] < mn[ch]:
+                mn[ch] = auddata[n, ch]
+            if auddata[n, ch] > mx[ch]:
+                mx[ch] = auddata[n, ch]
+
+
+@nb.njit(cache=True)
+def _peak_update(auddata: np.ndarray, peak: np.ndarray, hold: np.ndarray,
+                 holdsamples: int, decay: float) -> None:
+    for ch in range(auddata.shape[1]):
+        for n in range(auddata.shape[0]):
+            val = abs(auddata[n, ch])
+            if val >= peak[ch]:
+                peak[ch] = val
+                hold[ch] = holdsamples
+            elif hold[ch] > 0:
+                hold[ch] -= 1
+            else:
+                peak[ch] = max(peak[ch] * decay, val)
+
+
+class MeanSquare(object):
+    """Running mean square of all samples seen, for each channel."""
+
+    def __init__(self, nchannels: int) -> None:
+        """
+        Streaming meter, each `update` costs only the new block, whatever the averaging time.
+
+            >>> meter = MeanSquare(2)
+            >>> for block in audio:
+            ...     meter.update(block)
+            >>> meter.rms
+
+        Parameters
+        ----------
+        nchannels : int
+            Total number of channels.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._acc = np.zeros(nchannels, dtype=np.float64)
+        self._count = 0
+        return
+
+    @property
+    def count(self) -> int:
+        """Amount of samples seen."""
+        return self._count
+
+    @property
+    def value(self) -> np.ndarray:
+        """Mean square per channel, with shape (1, nchannels)."""
+        return (self._acc / max(self._count, 1)).reshape((1, -1))
+
+    @property
+    def rms(self) -> np.ndarray:
+        """Running RMS per channel, with shape (1, nchannels)."""
+        return self.value**0.5
+
+    def update(self, auddata: np.ndarray) -> np.ndarray:
+        """Account for a new block of audio data and return `value`."""
+        _sumsq_update(auddata, self._acc)
+        self._count += auddata.shape[0]
+        return self.value
+
+    def reset(self) -> None:
+        """Forget all seen data."""
+        self._acc[:] = 0.
+        self._count = 0
+        return
+
+
+class Leq(MeanSquare):
+    """Equivalent continuous level, for each channel."""
+
+    def __init__(self, nchannels: int, ref: float = 1.0) -> None:
+        """
+        Energy average level since creation or last `reset`.
+
+        Parameters
+        ----------
+        nchannels : int
+            Total number of channels.
+        ref : float, optional
+            The decibel reference. The default is 1.0.
+
+        Returns
+        -------
+        None.
+
+        """
+        MeanSquare.__init__(self, nchannels)
+        self.ref = ref
+        return
+
+    @property
+    def level(self) -> np.ndarray:
+        """Equivalent level per channel in decibel, with shape (1, nchannels)."""
+        return dB(self.value, True, self.ref**2)
+
+    def update(self, auddata: np.ndarray) -> np.ndarray:
+        """Account for a new block of audio data and return `level`."""
+        MeanSquare.update(self, auddata)
+        return self.level
+
+
+class PeakHold(object):
+    """Absolute peak with hold time and decay, for each channel."""
+
+    def __init__(self, nchannels: int, samplerate: int,
+                 holdtime: float = 1., decay: float = 20.) -> None:
+        """
+        Peak meter, a new peak is held for `holdtime` seconds and then decays.
+
+        Parameters
+        ----------
+        nchannels : int
+            Total number of channels.
+        samplerate : int
+            Sample rate.
+        holdtime : float, optional
+            Seconds a peak is held. The default is 1..
+        decay : float, optional
+            Decay rate after hold, in decibel per second. Zero holds forever. The default is 20..
+
+        Returns
+        -------
+        None.
+
+        """
+        self._holdsamples = int(holdtime * samplerate)
+        self._decay = 10**(-decay / 20 / samplerate) if decay else 1.
+        self._peak = np.zeros(nchannels, dtype=np.float64)
+        self._hold = np.zeros(nchannels, dtype=np.int64)
+        return
+
+    @property
+    def value(self) -> np.ndarray:
+        """Held peak per channel, with shape (1, nchannels)."""
+        return self._peak.reshape((1, -1))
+
+    def update(self, auddata: np.ndarray) -> np.ndarray:
+        """Account for a new block of audio data and return `value`."""
+        _peak_update(auddata, self._peak, self._hold, self._holdsamples, self._decay)
+        return self.value
+
+    def reset(self) -> None:
+        """Drop held peaks."""
+        self._peak[:] = 0.
+        self._hold[:] = 0
+        return
+
+
+class MinMax(object):
+    """Running minimum and maximum sample values, for each channel."""
+
+    def __init__(self, nchannels: int) -> None:
+        """
+        Extreme values of all samples seen since creation or last `reset`.
+
+        Parameters
+        ----------
+        nchannels : int
+            Total number of channels.
+
+        Returns
+        -------
+        None.
+
+        """
+        self._min = np.full(nchannels, np.inf)
+        self._max = np.full(nchannels, -np.inf)
+        return
+
+    @property
+    def min(self) -> np.ndarray:
+        """Minimum per channel, with shape (1, nchannels)."""
+        return self._min.reshape((1, -1))
+
+    @property
+    def max(self) -> np.ndarray:
+        """Maximum per channel, with shape (1, nchannels)."""
+        return self._max.reshape((1, -1))
+
+    def update(self, auddata: np.ndarray) -> np.ndarray:
+        """Account for a new block of audio data and return `min` and `max` stacked, with shape (2, nchannels)."""
+        _minmax_update(auddata, self._min, self._max)
+        return np.vstack((self._min, self._max))
+
+    def reset(self) -> None:
+        """Forget all seen data."""
+        self._min[:] = np.inf
+        self._max[:] = -np.inf
+        return
+
+
+@warms_up
+def _warmup_maths(auddata: np.ndarray) -> None:
+    out = np.empty((1, auddata.shape[1]))
+    for func in (max_abs, rms, mean, mean_square, crest_factor):
+        func(auddata)
+        func(auddata, out)
+    dB(out + 1.)
+    dB(out + 1., True, 1.)
+    for meter in (MeanSquare, Leq, MinMax):
+        meter(auddata.shape[1]).update(auddata)
+    PeakHold(auddata.shape[1], 48000).update(auddata)
+    return
@@ -0,0 +1,223 @@
+# -*- coding: utf-8 -*-
+"""
+Live level meters on the terminal.
+
+Each channel is a row with a bar, a peak hold marker, the level value and a clip indicator.
+Escape sequences are built once, only the cells that changed since the last frame are
+redrawn, frames are limited to a maximum rate and each one is a single write, so a meter
+over SSH costs little CPU and bandwidth.
+
+    >>> meter = TerminalMeter(nchannels=8, floor=-60.)
+    >>> mon = Monitor(lambda data: meter.update(dB(rms(data)), dB(max_abs(data))), waittime=0.05)
+
+Created on Mon Oct 19 2026
+"""
+
+import os
+import sys
+import time
+import numpy as np
+from typing import List, TextIO
+from .colore import _color_code, _color_clear
+
+
+_BAR = '█'
+_EMPTY = '·'
+_HOLD = '|'
+
+
+class TerminalMeter(object):
+    """Multichannel bar meters with peak hold and clip indicators."""
+
+    def __init__(self, nchannels: int = 1,
+                 floor: float = -60.,
+                 ceil: float = 0.,
+                 width: int = 50,
+                 fps: float = 20.,
+                 holdtime: float = 1.5,
+                 clip: float = -0.1,
+                 zones: tuple = (-20., -6.),
+                 labels: List[str] = None,
+                 stream: TextIO = sys.stdout) -> None:
+        """
+        Meter rows are drawn below the cursor on the first frame.
+
+        Parameters
+        ----------
+        nchannels : int, optional
+            Number of channels, one row each. The default is 1.
+        floor : float, optional
+            Level of an empty bar, in decibel. The default is -60..
+        ceil : float, optional
+            Level of a full bar, in decibel. The default is 0..
+        width : int, optional
+            Bar cells. The default is 50.
+        fps : float, optional
+            Most frames per second, updates in between are only stored. The default is 20..
+        holdtime : float, optional
+            Seconds the peak marker and the clip indicator are held. The default is 1.5.
+        clip : float, optional
+            Peak level that lights the clip indicator. The default is -0.1.
+        zones : tuple, optional
+            Levels where the bar turns from green to yellow and from yellow to red. The default is (-20., -6.).
+        labels : List[str], optional
+            Row labels. The default is None, which numbers the channels.
+        stream : TextIO, optional
+            Where frames are written. The default is sys.stdout.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.nchannels = nchannels
+        self.floor = floor
+        self.ceil = ceil
+        self.width = int(width)
+        self.interval = 1 / fps
+        self.holdtime = holdtime
+        self.clip = clip
+        self._stream = stream
+        labels = [f'ch{ch + 1:02d}' for ch in range(nchannels)] if labels is None else list(labels)
+        size = max(len(label) for label in labels)
+        self._labels = [label.ljust(size) for label in labels]
+        self._barcol = size + 3  # One based column of the first bar cell.
+        self._textcol = self._barcol + self.width + 2
+        # Cell colors, and the cells where the color changes.
+        limits = self._cell(np.asarray(zones, dtype=np.float64))
+        zone = np.searchsorted(limits, np.arange(self.width), side='right')
+        colors = [_color_code('font', color) for color in ('green', 'yellow', 'red')]
+        self._oncode = [colors[z] for z in zone]
+        self._offcode = _color_code('font', 'white')
+        self._holdcode = _color_code('font', 'cyan')
+        self._clipon = f"{_color_code('background', 'red')}{_color_code('font', 'white')}CLIP{_color_clear()}"
+        self._clipoff = '    '
+        self._clear = _color_clear()
+        self._levels = np.full(nchannels, -np.inf)
+        self._peaks = np.full(nchannels, -np.inf)
+        self._hold = np.full(nchannels, -np.inf)
+        self._holdtime = np.zeros(nchannels)
+        self._cliptime = np.full(nchannels, -np.inf)
+        self._drawn = None
+        self._last = -np.inf
+        self.frames = 0
+        self.bytes = 0
+        return
+
+    def _cell(self, levels: np.ndarray) -> np.ndarray:
+        """Amount of lit cells for `levels`."""
+        frac = (levels - self.floor) / (self.ceil - self.floor)
+        return np.clip(np.nan_to_num(frac * self.width, nan=0., neginf=0.), 0, self.width).astype(np.int64)
+
+    def _span(self, cells: np.ndarray, first: int) -> str:
+        """Text of cell states, starting at cell `first`, changing color only where needed."""
+        parts, code = [], None
+        for offset, state in enumerate(cells):
+            if state == 1:
+                new, char = self._oncode[first + offset], _BAR
+            elif state == 2:
+                new, char = self._holdcode, _HOLD
+            else:
+                new, char = self._offcode, _EMPTY
+            if new is not code:
+                code = new
+                parts.append(code)
+            parts.append(char)
+        return ''.join(parts)
+
+    def update(self, levels: np.ndarray, peaks: np.ndarray = None, force: bool = False) -> bool:
+        """
+        Store new levels and draw a frame if enough time passed since the last one.
+
+        Peak hold and clip indicators follow `peaks` on every update, also the ones
+        that are not drawn, so short peaks are never missed.
+
+        Parameters
+        ----------
+        levels : np.ndarray
+            Level of each channel, in decibel, with shape (nchannels,) or (1, nchannels).
+        peaks : np.ndarray, optional
+            Peak level of each channel, in decibel. The default is None, which means `levels`.
+        force : bool, optional
+            Draw regardless of the frame rate. The default is False.
+
+        Returns
+        -------
+        bool
+            True if a frame was drawn.
+
+        """
+        now = time.monotonic()
+        self._levels[:] = np.ravel(levels)
+        peaks = self._levels if peaks is None else np.ravel(peaks)
+        self._peaks[:] = peaks
+        rise = (peaks >= self._hold) | (now - self._holdtime > self.holdtime)
+        self._hold[rise] = peaks[rise]
+        self._holdtime[rise] = now
+        self._cliptime[peaks >= self.clip] = now
+        if not force and now - self._last < self.interval:
+            return False
+        self._last = now
+        self.draw(now)
+        return True
+
+    def draw(self, now: float = None) -> None:
+        """Write a frame with the cells that changed since the last one."""
+        now = time.monotonic() if now is None else now
+        bars = self._cell(self._levels)
+        holds = np.minimum(self._cell(self._hold), self.width - 1)
+        # Cell states: 0 is off, 1 is lit and 2 is the peak hold marker, above the bar.
+        cells = (np.arange(self.width)[None, :] < bars[:, None]).astype(np.int8)
+        above = holds >= bars
+        cells[np.nonzero(above)[0], holds[above]] = 2
+        texts = np.round(np.nan_to_num(self._levels, neginf=-999.), 1)
+        clips = now - self._cliptime <= self.holdtime
+        out = []
+        if self._drawn is None:
+            # First frame, full rows, the cursor stays on the line below them.
+            out.append('\x1b[?25l')
+            for ch in range(self.nchannels):
+                out.append(f'{self._labels[ch]} [{self._span(np.zeros(self.width), 0)}{self._clear}]\n')
+            self._drawn = (np.zeros_like(cells), np.full(self.nchannels, np.nan),
+                           np.zeros(self.nchannels, dtype=bool))
+        oldcells, oldtexts, oldclips = self._drawn
+        changed = cells != oldcells
+        for ch in range(self.nchannels):
+            row = []
+            if changed[ch].any():
+                first = int(np.argmax(changed[ch]))
+                last = self.width - int(np.argmax(changed[ch, ::-1]))
+                row.append(f'\x1b[{self._barcol + first}G{self._span(cells[ch, first:last], first)}')
+            if texts[ch] != oldtexts[ch] or clips[ch] != oldclips[ch]:
+                level = f'{texts[ch]:6.1f} dB' if texts[ch] > -999. else '  -inf dB'
+                row.append(f'\x1b[{self._textcol}G{self._clear}{level} {self._clipon if clips[ch] else self._clipoff}')
+            if row:
+                up = self.nchannels - ch
+                out.append(f'\x1b[{up}A{"".join(row)}{self._clear}\x1b[{up}B')
+        self._drawn = (cells, texts, clips)
+        if out:
+            out.append('\r')
+            self._write(''.join(out))
+        return
+
+    def _write(self, frame: str) -> None:
+        """Write a frame with as few system calls as possible, usually one."""
+        data = frame.encode()
+        try:
+            fileno = self._stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            self._stream.write(frame)
+            self._stream.flush()
+        else:
+            self._stream.flush()
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fileno, view):]
+        self.frames += 1
+        self.bytes += len(data)
+        return
+
+    def close(self) -> None:
+        """Show the cursor again, rows stay on screen."""
+        self._write(f'{self._clear}\x1b[?25h')
+        return
@@ -0,0 +1,537 @@
+# -*- coding: utf-8 -*-
+"""
+Spectral analysis of streaming audio.
+
+`FFTBandEstimator` computes fractional octave band powers from one FFT per block and a
+sparse bin to band weighting, which is much cheaper than filter banks for fine resolution
+analysis, e.g. 1/12 or 1/24 octave bands.
+
+    >>> est = FFTBandEstimator(24, samplerate=48000, blocksize=16384)
+    >>> levels = dB(est.powers(block), True)
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import numba as nb
+from typing import Tuple
+from .freq import band_table
+from .maths import warms_up
+
+
+def _window(name: str, size: int) -> np.ndarray:
+    """Periodic window for spectral analysis."""
+    if name in ('hann', 'hanning'):
+        return 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(size) / size)
+    elif name in ('rect', 'boxcar', None):
+        return np.ones(size)
+    raise ValueError(f"Unknown window: {name}.")
+
+
+@nb.njit(cache=True)
+def _band_sum(spec: np.ndarray, starts: np.ndarray, indptr: np.ndarray,
+              weights: np.ndarray, out: np.ndarray) -> None:
+    """Sparse product of band weights by the power spectrum, each band is a run of bins."""
+    for band in range(starts.shape[0]):
+        for ch in range(spec.shape[1]):
+            acc = 0.
+            for k in range(indptr[band], indptr[band + 1]):
+                acc += weights[k] * spec[starts[band] + k - indptr[band], ch]
+            out[band, ch] = acc
+    return
+
+
+@warms_up
+def _warmup_spectral(auddata: np.ndarray) -> None:
+    FFTBandEstimator(1, (500., 2000.), samplerate=48000, blocksize=auddata.shape[0]).powers(auddata)
+    return
+
+
+class FFTBandEstimator(object):
+    """Fractional octave band powers from FFT."""
+
+    def __init__(self, nthOct: int = 3,
+                 freqRange: Tuple[float] = (20., 20000.),
+                 refFreq: float = 1000.,
+                 base: int = 10,
+                 samplerate: int = 48000,
+                 blocksize: int = 8192,
+                 window: str = 'hann') -> None:
+        """
+        Precompute the bin to band weights for `blocksize` and `samplerate`.
+
+        Each FFT bin spans half a bin spacing to each side of its frequency, and its weight
+        on a band is the fraction of that span inside the band edges. Weights also hold the
+        one-sided spectrum and window power normalization, so band powers are mean squares
+        whose sum over all bins equals the windowed signal mean square.
+
+        Bands narrower than one bin are poorly estimated, increase `blocksize` for low frequencies.
+
+        Parameters
+        ----------
+        nthOct : int, optional
+            bands of octave/nthOct. The default is 3.
+        freqRange : Tuple[float], optional
+            frequency range. The default is (20., 20000.).
+        refFreq : float, optional
+            Center frequency of center band. The default is 1000..
+        base : int, optional
+            Either 10 or 2. The default is 10.
+        samplerate : int, optional
+            Audio sample rate. The default is 48000.
+        blocksize : int, optional
+            FFT size. The default is 8192.
+        window : str, optional
+            Either 'hann' or 'rect'. The default is 'hann'.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.samplerate = samplerate
+        self.blocksize = int(blocksize)
+        self._window = _window(window, self.blocksize)[:, None]
+        freqs = band_table(nthOct, freqRange, refFreq, base, samplerate).freqs
+        self._freqs = freqs[freqs[:, 0] < samplerate / 2]
+        nbins = self.blocksize // 2 + 1
+        df = samplerate / self.blocksize
+        scale = np.full(nbins, 2.)
+        scale[0] = 1.
+        if not self.blocksize % 2:
+            scale[-1] = 1.
+        scale /= self.blocksize * np.sum(self._window**2)
+        lo = (np.arange(nbins) - 0.5) * df
+        hi = lo + df
+        starts, indptr, weights = [], [0], []
+        for lower, _, upper in self._freqs:
+            first = max(int(np.floor(lower / df + 0.5)), 0)
+            last = min(int(np.floor(upper / df + 0.5)), nbins - 1)
+            overlap = np.clip(np.minimum(hi[first:last+1], upper)
+                              - np.maximum(lo[first:last+1], lower), 0., None) / df
+            starts.append(first)
+            weights.append(overlap * scale[first:last+1])
+            indptr.append(indptr[-1] + overlap.shape[0])
+        self._starts = np.array(starts, dtype=np.int64)
+        self._indptr = np.array(indptr, dtype=np.int64)
+        self._weights = np.concatenate(weights) if weights else np.zeros(0)
+        return
+
+    @property
+    def freqs(self) -> np.ndarray:
+        """Lower, center and upper frequencies of the bands, with shape (nbands, 3)."""
+        return self._freqs
+
+    @property
+    def center(self) -> np.ndarray:
+        """Center frequencies of the bands."""
+        return self._freqs[:, 1]
+
+    @property
+    def nbands(self) -> int:
+        """Number of bands."""
+        return self._freqs.shape[0]
+
+    @property
+    def nbins(self) -> int:
+        """Number of FFT bins."""
+        return self.blocksize // 2 + 1
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Dense bin to band weighting, with shape (nbands, nbins). Only for inspection."""
+        mtx = np.zeros((self.nbands, self.nbins))
+        for band in range(self.nbands):
+            first, last = self._indptr[band], self._indptr[band + 1]
+            mtx[band, self._starts[band]:self._starts[band] + last - first] = self._weights[first:last]
+        return mtx
+
+    def spectrum(self, auddata: np.ndarray) -> np.ndarray:
+        """
+        Power spectrum of one block, not normalized.
+
+        Blocks shorter than `blocksize` are zero padded.
+
+        Parameters
+        ----------
+        auddata : np.ndarray
+            Audio data with shape (nsamples, nchannels), `nsamples <= blocksize`.
+
+        Returns
+        -------
+        np.ndarray
+            Squared magnitude of each bin, with shape (nbins, nchannels).
+
+        """
+        nsamples = auddata.shape[0]
+        spec = np.fft.rfft(auddata * self._window[:nsamples], n=self.blocksize, axis=0)
+        return spec.real**2 + spec.imag**2
+
+    def powers(self, auddata: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+        """
+        Mean square of each band, for all channels.
+
+        Longer data is split into consecutive blocks whose powers are averaged,
+        the last one zero padded if incomplete.
+
+        Parameters
+        ----------
+        auddata : np.ndarray
+            Audio data with shape (nsamples, nchannels).
+        out : np.ndarray, optional
+            Array with shape (nbands, nchannels) to hold the result. The default is None.
+
+        Returns
+        -------
+        np.ndarray
+            Band powers, with shape (nbands, nchannels).
+
+        """
+        if out is None:
+            out = np.empty((self.nbands, auddata.shape[1]))
+        nblocks = max(-(-auddata.shape[0] // self.blocksize), 1)
+        spec = self.spectrum(auddata[:self.blocksize])
+        for block in range(1, nblocks):
+            spec += self.spectrum(auddata[block*self.blocksize:(block+1)*self.blocksize])
+        if nblocks > 1:
+            spec /= nblocks
+        _band_sum(spec, self._starts, self._indptr, self._weights, out)
+        return out
+
+
+class STFT(object):
+    """Streaming short-time Fourier transform."""
+
+    def __init__(self, samplerate: int = 48000,
+                 nchannels: int = 1,
+                 blocksize: int = 2048,
+                 hop: int = None,
+                 window: str = 'hann',
+                 scale: str = 'magnitude',
+                 nslots: int = 256,
+                 name: str = None) -> None:
+        """
+        Spectra of overlapping frames of all channels, written to a ring of frames.
+
+        The window and its normalization are computed once, and frames are windowed into
+        a buffer that is reused between calls. New spectra are appended to `ring`, a
+        `ResultRing` that other processes can attach to by `name`, e.g. a live spectrogram.
+
+            >>> stft = STFT(48000, nchannels=8, blocksize=4096, hop=1024, scale='dB')
+            >>> view = recorder.get_buffer()
+            >>> stft.update(view)  # all frames written since the last call on `view`
+            >>> stft.ring.history(100)  # (100, nbins, nchannels) spectrogram
+
+        Parameters
+        ----------
+        samplerate : int, optional
+            Audio sample rate. The default is 48000.
+        nchannels : int, optional
+            Number of channels. The default is 1.
+        blocksize : int, optional
+            FFT and frame size. The default is 2048.
+        hop : int, optional
+            Samples between consecutive frames. The default is None, which means `blocksize // 4`.
+        window : str, optional
+            Either 'hann' or 'rect'. The default is 'hann'.
+        scale : str, optional
+            Either 'magnitude', normalized so a sine of amplitude 1 peaks at 1, 'power' or 'dB'.
+            The default is 'magnitude'.
+        nslots : int, optional
+            Frames kept on the ring. The default is 256.
+        name : str, optional
+            SharedMemory name of the ring. The default is None.
+
+        Returns
+        -------
+        None.
+
+        """
+        from ossom.results import ResultRing
+        if scale not in ('magnitude', 'power', 'dB'):
+            raise ValueError(f"Unknown scale: {scale}.")
+        self.samplerate = samplerate
+        self.nchannels = nchannels
+        self.blocksize = int(blocksize)
+        self.hop = self.blocksize // 4 if hop is None else int(hop)
+        self.scale = scale
+        win = _window(window, self.blocksize)
+        self._window = (win * 2 / np.sum(win))[None, :, None]
+        self._work = np.zeros((0, self.blocksize, nchannels))
+        self._mag = np.zeros((0, self.nbins, nchannels))
+        self._carry = np.zeros((0, nchannels))
+        self.ring = ResultRing(name, shape=(self.nbins, nchannels), dtype=np.float32, nslots=nslots)
+        return
+
+    @property
+    def nbins(self) -> int:
+        """Number of frequency bins."""
+        return self.blocksize // 2 + 1
+
+    @property
+    def freqs(self) -> np.ndarray:
+        """Frequency of each bin."""
+        return np.fft.rfftfreq(self.blocksize, 1 / self.samplerate)
+
+    def frames(self, frms: np.ndarray) -> np.ndarray:
+        """
+        Transform a batch of frames and append them to the ring.
+
+        Parameters
+        ----------
+        frms : np.ndarray
+            Frames with shape (nframes, blocksize, nchannels), see `ossom.Audio.frames`.
+
+        Returns
+        -------
+        np.ndarray
+            View of the new spectra, with shape (nframes, nbins, nchannels).
+            Overwritten by the next call.
+
+        """
+        nframes = frms.shape[0]
+        if self._work.shape[0] < nframes:
+            self._work = np.zeros((nframes, self.blocksize, self.nchannels))
+            self._mag = np.zeros((nframes, self.nbins, self.nchannels))
+        work, mag = self._work[:nframes], self._mag[:nframes]
+        np.multiply(frms, self._window, out=work)
+        spec = np.fft.rfft(work, axis=1)
+        if self.scale == 'magnitude':
+            np.abs(spec, out=mag)
+        else:
+            np.multiply(spec.real, spec.real, out=mag)
+            mag += spec.imag * spec.imag
+            if self.scale == 'dB':
+                np.maximum(mag, 1e-30, out=mag)
+                np.log10(mag, out=mag)
+                mag *= 10
+        if nframes:
+            self.ring.extend(mag)
+        return mag
+
+    def update(self, audio) -> np.ndarray:
+        """
+        Transform all complete frames available on `audio` from its read index on.
+
+        Parameters
+        ----------
+        audio : ossom.Audio
+            An `Audio` or `AudioBuffer`, read with `read_frames`, without copies. Views of
+            streamers, from `get_buffer`, are read up to the samples written so far, and the
+            same view must be passed on each call, as it keeps the read index.
+
+        Returns
+        -------
+        np.ndarray
+            View of the new spectra, see `frames`.
+
+        """
+        return self.frames(audio.read_frames(self.blocksize, self.hop))
+
+    def __call__(self, auddata: np.ndarray) -> np.ndarray:
+        """
+        Transform a block of a continuous stream, e.g. as a `Monitor` target.
+
+        Samples of incomplete frames are kept for the next call.
+
+        Parameters
+        ----------
+        auddata : np.ndarray
+            Audio data with shape (nsamples, nchannels).
+
+        Returns
+        -------
+        np.ndarray
+            View of the new spectra, see `frames`.
+
+        """
+        from ossom.audio import Audio
+        if self._carry.shape[0]:
+            auddata = np.concatenate((self._carry, auddata))
+        audio = Audio(auddata, self.samplerate)
+        mag = self.update(audio)
+        self._carry = auddata[audio.ridx:].copy()
+        return mag
+
+
+class TransferFunction(object):
+    """Streaming H1, H2 and coherence estimation by Welch averaging."""
+
+    def __init__(self, samplerate: int = 48000,
+                 nchannels: int = 1,
+                 blocksize: int = 8192,
+                 hop: int = None,
+                 window: str = 'hann',
+                 delay: int = 0,
+                 batch: int = 64) -> None:
+        """
+        Accumulate auto and cross spectra between a reference and all recorded channels.
+
+        Frames are taken at the same positions on the reference and, `delay` samples later,
+        on the recording, as they become available. Memory does not grow with the amount of
+        averaged frames and estimates can be read at any moment.
+
+            >>> tf = TransferFunction(48000, nchannels=4, blocksize=8192, delay=latency)
+            >>> while recorder.running.is_set():
+            ...     tf.update(player, recorder)
+            ...     print(tf.count, tf.coherence.mean(axis=0))
+            >>> h1 = tf.h1
+
+        Parameters
+        ----------
+        samplerate : int, optional
+            Audio sample rate. The default is 48000.
+        nchannels : int, optional
+            Number of recorded channels. The default is 1.
+        blocksize : int, optional
+            FFT and frame size. The default is 8192.
+        hop : int, optional
+            Samples between consecutive frames. The default is None, which means `blocksize // 2`.
+        window : str, optional
+            Either 'hann' or 'rect'. The default is 'hann'.
+        delay : int, optional
+            Samples the recording lags the reference, e.g. from `LatencyEstimator`. The default is 0.
+        batch : int, optional
+            Most frames transformed at once. The default is 64.
+
+        Returns
+        -------
+        None.
+
+        """
+        self.samplerate = samplerate
+        self.nchannels = nchannels
+        self.blocksize = int(blocksize)
+        self.hop = self.blocksize // 2 if hop is None else int(hop)
+        self.delay = int(delay)
+        self.batch = int(batch)
+        self._window = _window(window, self.blocksize)[None, :, None]
+        self._gyy = np.zeros((self.nbins, nchannels))
+        self._gxy = np.zeros((self.nbins, nchannels), dtype=np.complex128)
+        self.reset()
+        return
+
+    @property
+    def nbins(self) -> int:
+        """Number of frequency bins."""
+        return self.blocksize // 2 + 1
+
+    @property
+    def freqs(self) -> np.ndarray:
+        """Frequency of each bin."""
+        return np.fft.rfftfreq(self.blocksize, 1 / self.samplerate)
+
+    @property
+    def count(self) -> int:
+        """Amount of averaged frames."""
+        return self._count
+
+    @property
+    def position(self) -> int:
+        """Reference sample where the next frame starts."""
+        return self._pos
+
+    @property
+    def gxx(self) -> np.ndarray:
+        """Averaged reference power spectrum, with shape (nbins, 1) or (nbins, nchannels)."""
+        return self._gxx / max(self._count, 1)
+
+    @property
+    def gyy(self) -> np.ndarray:
+        """Averaged recording power spectra, with shape (nbins, nchannels)."""
+        return self._gyy / max(self._count, 1)
+
+    @property
+    def gxy(self) -> np.ndarray:
+        """Averaged cross spectra, reference conjugated, with shape (nbins, nchannels)."""
+        return self._gxy / max(self._count, 1)
+
+    @property
+    def h1(self) -> np.ndarray:
+        """Transfer functions estimated with noise on the output, with shape (nbins, nchannels)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._gxy / self._gxx
+
+    @property
+    def h2(self) -> np.ndarray:
+        """Transfer functions estimated with noise on the input, with shape (nbins, nchannels)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._gyy / np.conj(self._gxy)
+
+    @property
+    def coherence(self) -> np.ndarray:
+        """Magnitude squared coherence, with shape (nbins, nchannels)."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (self._gxy.real**2 + self._gxy.imag**2) / (self._gxx * self._gyy)
+
+    def reset(self) -> None:
+        """Zero the accumulated spectra and restart at the first reference sample."""
+        self._gxx = np.zeros((self.nbins, 1))
+        self._gyy[:] = 0.
+        self._gxy[:] = 0.
+        self._count = 0
+        self._pos = 0
+        return
+
+    def frames(self, xfrms: np.ndarray, yfrms: np.ndarray) -> int:
+        """
+        Accumulate aligned frames of the reference and the recording.
+
+        Parameters
+        ----------
+        xfrms : np.ndarray
+            Reference frames with shape (nframes, blocksize, 1) or (nframes, blocksize, nchannels).
+        yfrms : np.ndarray
+            Recording frames with shape (nframes, blocksize, nchannels).
+
+        Returns
+        -------
+        int
+            The new `count`.
+
+        """
+        xspec = np.fft.rfft(xfrms * self._window, axis=1)
+        yspec = np.fft.rfft(yfrms * self._window, axis=1)
+        xpow = np.sum(xspec.real**2 + xspec.imag**2, axis=0)
+        if xpow.shape[1] != self._gxx.shape[1]:
+            self._gxx = np.broadcast_to(self._gxx, xpow.shape).copy()
+        self._gxx += xpow
+        self._gyy += np.sum(yspec.real**2 + yspec.imag**2, axis=0)
+        self._gxy += np.sum(np.conj(xspec) * yspec, axis=0)
+        self._count += xfrms.shape[0]
+        return self._count
+
+    def update(self, reference, recording) -> int:
+        """
+        Accumulate all frames available on both the reference and the recording.
+
+        Neither read index is changed. Reference samples go up to the `length` of a `Player`
+        and to `nsamples` otherwise. Recording samples go up to its `available` ones, the
+        written samples of a `Recorder` or of a `get_audio` view of one.
+
+        Parameters
+        ----------
+        reference : ossom.Audio
+            The played signal, e.g. a `Player`, with one channel or `nchannels`.
+        recording : ossom.Audio
+            The recorded signal, e.g. a `Recorder`, starting at the same time as the reference.
+
+        Returns
+        -------
+        int
+            Amount of frames added.
+
+        """
+        xstop = min(getattr(reference, 'length', reference.nsamples), reference.nsamples)
+        ystop = recording.available - self.delay
+        stop = min(xstop, ystop)
+        nframes = (stop - self._pos - self.blocksize) // self.hop + 1 if stop - self._pos >= self.blocksize else 0
+        added = 0
+        while added < nframes:
+            count = min(nframes - added, self.batch)
+            end = self._pos + (count - 1) * self.hop + self.blocksize
+            self.frames(reference.frames(self.blocksize, self.hop, self._pos, end),
+                        recording.frames(self.blocksize, self.hop, self._pos + self.delay, end + self.delay))
+            self._pos += count * self.hop
+            added += count
+        return added
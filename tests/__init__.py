@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the ossom package, run with `python -m pytest tests`.
+
+Created on Mon Oct 19 2026
+"""
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.audio`, frame views and reading up to the written samples.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom.audio import Audio, AudioBuffer
+
+
+@pytest.fixture
+def audio():
+    return Audio(np.arange(2000, dtype=np.float32).reshape((1000, 2)), 48000, 64)
+
+
+@pytest.mark.parametrize('size, hop, start, stop', [(100, 100, 0, None), (128, 32, 10, 900),
+                                                    (1000, 1, 0, None), (7, 3, 990, None)])
+def test_frames_are_views_of_the_slices(audio, size, hop, start, stop):
+    frms = audio.frames(size, hop, start, stop)
+    end = audio.nsamples if stop is None else stop
+    assert frms.shape == ((end - start - size) // hop + 1, size, 2)
+    for k in range(frms.shape[0]):
+        assert np.array_equal(frms[k], audio.data[start + k * hop:start + k * hop + size])
+    assert np.shares_memory(frms, audio.data) and not frms.flags.writeable
+
+
+def test_frames_pad_and_short_data(audio):
+    assert audio.frames(2000).shape == (0, 2000, 2)
+    frms = audio.frames(300, 200, pad=True)
+    assert frms.shape == (5, 300, 2)
+    assert np.array_equal(frms[-1, :200], audio.data[800:]) and not frms[-1, 200:].any()
+    with pytest.raises(ValueError):
+        audio.frames(0)
+
+
+def test_read_frames_keeps_overlap(audio):
+    first = audio.read_frames(100, 50)
+    assert first.shape[0] == 19 and audio.ridx == 950
+    second = audio.read_frames(100, 50)
+    assert second.shape[0] == 0 and audio.ridx == 950
+
+
+def test_buffer_view_reads_only_written_samples():
+    buffer = AudioBuffer(None, 48000, 1000, 1, 64, np.dtype('float32'))
+    view = buffer.get_audio()
+    assert view.available == 0 and view.read_frames(64).shape[0] == 0
+    buffer.write_next(np.ones((300, 1), dtype=np.float32))
+    frms = view.read_frames(64, 32)
+    assert frms.shape[0] == 8 and view.ridx == 256 and view.ready2read == 44
+    assert view.available == buffer.available == 300
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.clock`.
+
+Created on Mon Oct 19 2026
+"""
+
+import time
+import numpy as np
+import pytest
+from ossom.utils.clock import Clock
+
+
+def test_needs_an_anchor_and_uses_nominal_rate_with_one():
+    clock = Clock(48000)
+    with pytest.raises(ValueError):
+        clock.wall(0)
+    clock.anchor(4800, monotonic_ns=10**9, wall_ns=2 * 10**18)
+    assert clock.monotonic(9600) == 10**9 + 10**8
+    assert clock.wall([0, 4800]).tolist() == [2 * 10**18 - 10**8, 2 * 10**18]
+
+
+def test_fit_follows_actual_rate_over_recent_anchors():
+    clock = Clock(48000, nanchors=8)
+    # A device running 100 ppm fast, after a stretch at a very different rate that must be forgotten.
+    for k in range(20):
+        clock.anchor(k * 480, monotonic_ns=k * 10**7 // 2, wall_ns=k * 10**7 // 2)
+    actual = 48000 * 1.0001
+    jitter = np.random.default_rng(6).integers(-1000, 1000, 30)
+    for k in range(30):
+        sample = 20 * 480 + k * 4800
+        ns = int(10**8 + sample / actual * 1e9) + int(jitter[k])
+        clock.anchor(sample, monotonic_ns=ns, wall_ns=1_700_000_000 * 10**9 + ns)
+    assert clock.count == 50 and clock.anchors().shape == (7, 3)
+    assert clock.samplerate_estimate() == pytest.approx(actual, rel=1e-5)
+    samples = np.array([100000, 200000, 250000])
+    assert np.allclose(clock.sample_at_wall(clock.wall(samples)), samples, atol=1e-3)
+    assert np.allclose(clock.sample_at_monotonic(clock.monotonic(samples)), samples, atol=1e-3)
+    clock.reset()
+    assert clock.count == 0
+
+
+def test_restored_state_shares_anchors():
+    clock = Clock(48000)
+    # As a child process gets it, the shared arrays themselves are inherited.
+    other = Clock.__new__(Clock)
+    other.__setstate__(clock.__getstate__())
+    clock.anchor(0)
+    clock.anchor(48000)
+    assert other.count == 2 and np.array_equal(other.anchors(), clock.anchors())
+
+
+def test_format():
+    ns = 1_700_000_000 * 10**9 + 123_456_789
+    base = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(1_700_000_000))
+    assert Clock.format(ns) == base + '.123456'
+    assert Clock.format(np.array([ns, ns + 10**9]), 3) == [base + '.123', Clock.format(ns + 10**9, 3)]
+    assert Clock.format(ns, 0) == base
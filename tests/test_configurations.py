@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.configurations`, profiles and defaults taken when objects are created.
+
+Created on Mon Oct 19 2026
+"""
+
+import json
+import numpy as np
+import pytest
+from ossom import Audio, AudioBuffer, Configurations
+from ossom.measurement import SweepMeasurement
+from ossom.pipeline import Stage
+from ossom.tuner import AutoTuner, VirtualDevice
+from ossom.trigger import Trigger, LevelDetector
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CONFIG_HOME', str(tmp_path / 'config'))
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    config = Configurations()
+    config.reset()
+    yield config
+    config.reset()
+
+
+def _save(config, profile: str, **changes) -> None:
+    filename = config.save(profile)
+    with open(filename) as file:
+        values = json.load(file)
+    values.update(changes)
+    with open(filename, 'w') as file:
+        json.dump(values, file)
+
+
+def test_load_applies_profile(config):
+    config.samplerate = 44100
+    config.blocksize = 256
+    config.save('lab')
+    config.reset()
+    config.load('lab')
+    assert (config.samplerate, config.blocksize) == (44100, 256)
+
+
+def test_bad_profile_changes_nothing(config):
+    config.blocksize = 1024
+    _save(config, 'bad', samplerate=96000, blocksize=64, buffersize=960000)
+    with open(config.profile_path('bad')) as file:
+        values = json.load(file)
+    values['channels']['in'] = 'many'
+    with open(config.profile_path('bad'), 'w') as file:
+        json.dump(values, file)
+    with pytest.raises(ValueError):
+        config.load('bad')
+    assert (config.samplerate, config.blocksize, config.buffersize) == (48000, 1024, 480000)
+    _save(config, 'bad', samplerate=5)
+    with pytest.raises(ValueError):
+        config.load('bad')
+    assert config.samplerate == 48000
+
+
+def test_defaults_follow_config(config):
+    config.samplerate = 44100
+    config.blocksize = 128
+    config.inChannels = [0, 1, 2]
+    assert Audio(np.zeros(10), 44100).blocksize == 128
+    assert Stage('s', lambda x: x).blocksize == 128
+    assert SweepMeasurement(freqMax=20000.).samplerate == 44100
+    trg = Trigger(LevelDetector(-20.))
+    assert (trg.samplerate, trg.nchannels) == (44100, 3)
+    buffer = AudioBuffer(None, 44100, 100, 1, 10)
+    assert buffer.dtype == config.dtype
+
+
+def _anchors(blocksize: int, late: dict, nblocks: int = 100, samplerate: int = 48000) -> np.ndarray:
+    samples = np.arange(nblocks) * blocksize
+    times = samples / samplerate + np.array([late.get(k, 0.) for k in range(nblocks)])
+    return np.stack([samples, np.round(times * 1e9), np.zeros(nblocks)], axis=1).astype(np.int64)
+
+
+def test_tuner_counts_xruns_from_block_times(config):
+    tuner = AutoTuner(samplerate=48000, periods=2, load=0.)
+    steady = tuner._evaluate(480, _anchors(480, {}))
+    assert steady['clean'] and steady['xruns'] == 0 and steady['maxlate'] < 1e-6
+    # 15 ms late is within 2 periods of 10 ms, 25 ms late is not.
+    jittery = tuner._evaluate(480, _anchors(480, {10: 0.015}))
+    assert jittery['clean'] and jittery['maxjitter'] == pytest.approx(0.015, abs=1e-6)
+    stalled = tuner._evaluate(480, _anchors(480, {k: 0.025 for k in range(50, 100)}))
+    assert stalled['xruns'] == 1 and not stalled['clean']
+
+
+def test_tuner_stores_smallest_clean_block(config):
+    tuner = AutoTuner(samplerate=44100, buffertime=1., load=0.)
+    with pytest.raises(ValueError):
+        tuner.apply()
+    tuner.results = [dict(blocksize=bs, clean=bs != 128) for bs in (1024, 512, 256, 128, 64)]
+    assert tuner.best['blocksize'] == 64
+    tuner.results.pop()
+    assert tuner.best['blocksize'] == 256
+    tuner.save('tuned')
+    config.reset()
+    config.load('tuned')
+    assert (config.samplerate, config.blocksize, config.buffersize) == (44100, 256, 173 * 256)
+
+
+def test_virtual_device_paces_blocks():
+    stream = VirtualDevice(channels=3).recorder(48000, None, 480)
+    with stream:
+        start = stream._next
+        for _ in range(5):
+            assert stream.record(480).shape == (480, 3)
+        assert stream._next - start == pytest.approx(0.05)
+    with pytest.raises(ValueError):
+        AutoTuner('both')
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.devices`, on fake soundcard devices.
+
+Created on Mon Oct 19 2026
+"""
+
+import types
+import pytest
+from ossom import devices
+
+
+class _Stream(object):
+
+    def __init__(self, device, samplerate):
+        if samplerate not in device.rates:
+            raise RuntimeError("Unsupported sample rate.")
+        device.opened += 1
+        self.latency = 256 / samplerate
+        return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return
+
+    def record(self, nsamples):
+        return
+
+    def play(self, data):
+        return
+
+
+class _Device(object):
+
+    def __init__(self, id, name, channels, rates=(44100, 48000), isloopback=False):
+        self.id, self.name, self.channels, self.isloopback = id, name, channels, isloopback
+        self.rates = rates
+        self.opened = 0
+        return
+
+    def recorder(self, samplerate, channels, blocksize):
+        return _Stream(self, samplerate)
+
+    player = recorder
+
+
+@pytest.fixture
+def soundcard(monkeypatch):
+    card = types.SimpleNamespace(mics=[_Device('m0', 'Built-in Mic', 2), _Device('m1', 'USB Interface', 8),
+                                       _Device('l0', 'Monitor of Speakers', 2, isloopback=True)],
+                                 speakers=[_Device('s0', 'Speakers', 2)], calls=0)
+
+    def all_microphones(include_loopback=False):
+        card.calls += 1
+        return list(card.mics)
+
+    def all_speakers():
+        card.calls += 1
+        return list(card.speakers)
+
+    monkeypatch.setattr(devices, '_sc', types.SimpleNamespace(
+        all_microphones=all_microphones, all_speakers=all_speakers,
+        default_microphone=lambda: card.mics[1], default_speaker=lambda: card.speakers[0]))
+    return card
+
+
+def test_find_by_position_id_name_and_default(tmp_path, soundcard):
+    registry = devices.DeviceRegistry(str(tmp_path / 'devices.json'))
+    assert [info['id'] for info in registry.devices('in')] == ['m0', 'm1']
+    assert len(registry.devices('in', loopback=True)) == 3
+    assert registry.find(1)['id'] == 'm1'
+    assert registry.find('s0', 'out')['name'] == 'Speakers'
+    assert registry.find('USB')['channels'] == 8
+    assert registry.find()['id'] == 'm1'
+    with pytest.raises(ValueError):
+        registry.find('missing')
+    with pytest.raises(ValueError):
+        registry.find(kind='sideways')
+    assert '*  1  USB Interface  [8 ch, ?, ?]' in registry.table()
+
+
+def test_probe_results_are_cached_on_disk(tmp_path, soundcard):
+    cachefile = str(tmp_path / 'devices.json')
+    registry = devices.DeviceRegistry(cachefile, samplerates=(44100, 48000, 96000))
+    info = registry.validate('in', 'USB', samplerate=48000, channels=[0, 7])
+    assert info['samplerates'] == [44100, 48000]
+    assert info['latency'] == pytest.approx(256 / 48000)
+    with pytest.raises(ValueError):
+        registry.validate('in', 'USB', samplerate=96000)
+    with pytest.raises(ValueError):
+        registry.validate('in', 'USB', channels=[8])
+    opened, calls = soundcard.mics[1].opened, soundcard.calls
+    later = devices.DeviceRegistry(cachefile, samplerates=(44100, 48000, 96000))
+    assert later.validate('in', 'USB', samplerate=44100)['samplerates'] == [44100, 48000]
+    assert soundcard.mics[1].opened == opened and soundcard.calls == calls
+
+
+def test_refresh_finds_new_devices(tmp_path, soundcard):
+    registry = devices.DeviceRegistry(str(tmp_path / 'devices.json'))
+    registry.validate('out', 0, samplerate=48000)
+    soundcard.speakers.append(_Device('s1', 'Headphones', 2, rates=(96000,)))
+    assert registry.find('Headphones', 'out')['id'] == 's1'
+    assert registry.find('Speakers', 'out')['samplerates'] == [44100, 48000]
+    registry.refresh(probe=True)
+    assert registry.find('Speakers', 'out')['samplerates'] is None
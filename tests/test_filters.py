@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.filters.OctaveFilterBank`.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom.utils.filters import OctaveFilterBank
+
+
+def _sine(freq, nsamples=48000, samplerate=48000, nchannels=2):
+    t = np.arange(nsamples) / samplerate
+    return np.repeat(np.sin(2 * np.pi * freq * t)[:, None], nchannels, axis=1)
+
+
+def test_sine_energy_lands_in_its_band():
+    bank = OctaveFilterBank(1, (125., 8000.), samplerate=48000, nchannels=2)
+    power = bank.levels(_sine(1000.))
+    assert power.shape == (bank.nbands, 2)
+    band = int(np.argmax(power[:, 0]))
+    assert bank.center[band] == 1000.
+    assert power[band, 0] == pytest.approx(0.5, rel=0.05)
+    assert np.all(np.delete(power[:, 0], band) < 0.05 * power[band, 0])
+
+
+def test_blocks_filter_as_one_signal():
+    data = np.random.default_rng(0).standard_normal((4096, 1))
+    whole = OctaveFilterBank(3, (250., 4000.), nchannels=1).process(data)
+    bank = OctaveFilterBank(3, (250., 4000.), nchannels=1)
+    blocks = np.concatenate([bank.process(block) for block in np.split(data, [100, 1000, 1001, 3000])])
+    assert np.allclose(blocks, whole)
+    bank.reset()
+    assert np.allclose(bank.process(data), whole)
+
+
+def test_bands_above_nyquist_are_dropped():
+    with pytest.warns(UserWarning):
+        bank = OctaveFilterBank(1, (125., 16000.), samplerate=16000)
+    assert bank.center[-1] == 4000.
+    assert bank.sos.shape[0] == bank.nbands
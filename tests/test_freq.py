@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.freq`.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom.utils.freq import freq_to_band, fractional_octave_frequencies, band_table
+
+
+def test_third_octave_nominal_centers():
+    freqs = fractional_octave_frequencies(3, (20., 20000.))
+    assert freqs.shape == (31, 3)
+    assert freqs[0, 1] == 20. and freqs[-1, 1] == 20000. and 630. in freqs[:, 1]
+    assert np.allclose(freqs[:, 2] / freqs[:, 1], 10**(0.3 / 6))
+    assert np.allclose(freqs[:, 1] / freqs[:, 0], 10**(0.3 / 6))
+
+
+def test_octave_edges_touch():
+    freqs = fractional_octave_frequencies(1, (31.5, 16000.))
+    assert list(freqs[:, 1]) == [31.5, 63., 125., 250., 500., 1000., 2000., 4000., 8000., 16000.]
+    assert np.allclose(freqs[:, 2] / freqs[:, 0], 10**0.3)
+    exact = fractional_octave_frequencies(2, (100., 10000.), base=2)
+    assert np.allclose(exact[1:, 0], exact[:-1, 2])
+    assert np.allclose(exact[:, 2] / exact[:, 0], 2**0.5)
+
+
+@pytest.mark.parametrize('nthOct', [6, 12, 24])
+def test_fine_bands_use_exact_midbands(nthOct):
+    freqs = fractional_octave_frequencies(nthOct, (100., 10000.))
+    assert np.unique(freqs[:, 1]).shape[0] == freqs.shape[0]
+    assert np.allclose(np.diff(np.log10(freqs[:, 1])), 0.3 / nthOct)
+    assert np.allclose(freqs[1:, 0], freqs[:-1, 2])
+
+
+def test_freq_to_band_scalar_and_array():
+    assert freq_to_band(1000., 3, 1000., 10) == 0
+    assert freq_to_band(2000., 1, 1000., 2) == 1
+    bands = freq_to_band(np.array([[500., 1000.], [1250., 20000.]]), 3, 1000., 10)
+    assert bands.shape == (2, 2) and bands.tolist() == [[-3, 0], [1, 13]]
+    with pytest.raises(ValueError):
+        freq_to_band(1000., 3, 1000., 5)
+
+
+def test_band_table_is_cached_and_read_only():
+    table = band_table(3, (20., 20000.), samplerate=32000)
+    assert table is band_table(3, [20, 20000], samplerate=32000)
+    assert table.nbands == 31 and not table.valid[-1] and table.valid[:-3].all()
+    assert table.sos(3).shape == (table.valid.sum(), 3, 6)
+    assert table.sos(3) is table.sos(3)
+    with pytest.raises(ValueError):
+        table.center[0] = 1.
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.generators`.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom.audio import AudioBuffer
+from ossom.utils.generators import SignalGenerator, WhiteNoise, PinkNoise, Sine, Multitone, Sweep
+
+
+def _read_all(gen: SignalGenerator, blocks: list) -> np.ndarray:
+    out = []
+    for size in blocks:
+        out.append(gen.read(size))
+    return np.vstack(out)
+
+
+@pytest.mark.parametrize('kind', [WhiteNoise, PinkNoise])
+def test_seed_gives_same_samples_for_any_block_size(kind):
+    kwargs = dict(nchannels=2, seed=7, chunksize=1000)
+    whole = kind(**kwargs).read(5000)
+    assert np.array_equal(_read_all(kind(**kwargs), [333, 17, 1650, 3000]), whole)
+    assert not np.array_equal(whole[:, 0], whole[:, 1])
+    assert not np.array_equal(kind(nchannels=2, seed=8, chunksize=1000).read(5000), whole)
+
+
+@pytest.mark.parametrize('kind, tolerance', [(WhiteNoise, 0.1), (PinkNoise, 0.5),
+                                             (Sine, 0.01), (Multitone, 0.01)])
+def test_rms_level(kind, tolerance):
+    data = kind(48000, nchannels=1, level=-20., seed=1, dtype=np.float64).read(48000 * 4)
+    level = 10 * np.log10(np.mean(data**2))
+    assert abs(level + 20.) < tolerance
+
+
+def test_sweep_length_and_end():
+    gen = Sweep(8000, duration=0.5, freqMin=100., freqMax=1000.)
+    data = gen.read(10000)
+    assert data.shape == (4000, 1) and gen.left == 0
+    with pytest.raises(StopIteration):
+        next(gen)
+
+
+def test_base_generator_is_abstract():
+    with pytest.raises(TypeError):
+        SignalGenerator()
+
+
+def test_write_leaves_buffer_index_alone():
+    buffer = AudioBuffer(None, 48000, 1000, 1, 100, np.dtype('float32'))
+    gen = Sine(48000, nsamples=1500)
+    first = gen.write(buffer, 600)
+    second = gen.write(buffer)
+    assert buffer.widx == 0 and not buffer.is_full
+    assert first.nsamples == 600 and second.nsamples == 400
+    assert np.array_equal(buffer.data, Sine(48000).read(1000))
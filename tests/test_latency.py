@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.latency`.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom.audio import AudioBuffer
+from ossom.utils.latency import LatencyEstimator
+
+
+def _delayed(signal: np.ndarray, lag: float, length: int) -> np.ndarray:
+    """`signal` delayed by a fractional `lag`, by a phase shift on the frequency domain."""
+    nfft = 2 * length
+    freqs = np.fft.rfftfreq(nfft)
+    spec = np.fft.rfft(signal, n=nfft) * np.exp(-2j * np.pi * freqs * lag)
+    return np.fft.irfft(spec, n=nfft)[:length]
+
+
+@pytest.fixture
+def noise():
+    rng = np.random.default_rng(3)
+    # Band limited, so a fractional delay is well defined.
+    spec = np.fft.rfft(rng.standard_normal(20000))
+    spec[int(spec.shape[0] * 0.8):] = 0.
+    return np.fft.irfft(spec, n=20000)
+
+
+@pytest.mark.parametrize('lag', [0., 10.4, 123.5, 300.75])
+def test_fractional_lag_and_score(noise, lag):
+    recording = _delayed(noise, lag, noise.shape[0] + 500)
+    est = LatencyEstimator(noise, maxlag=480)
+    lags = est.estimate(recording)
+    assert lags == pytest.approx([lag], abs=0.02)
+    assert est.score[0] > 0.97
+
+
+def test_inverted_polarity(noise):
+    est = LatencyEstimator(noise, maxlag=480)
+    assert est.estimate(-_delayed(noise, 42., noise.shape[0] + 500)) == pytest.approx([42.], abs=0.02)
+
+
+def test_live_view_stops_at_written_samples(noise):
+    recording = _delayed(noise, 37.3, noise.shape[0] + 500).astype(np.float32)
+    buffer = AudioBuffer(None, 48000, recording.shape[0], 1, 256, np.dtype('float32'))
+    view = buffer.get_audio()
+    est = LatencyEstimator(noise, maxlag=480)
+    assert est.update(view) == 0
+    buffer.write_next(recording[:5000, None])
+    first = est.update(view)
+    assert 0 < first < est.nblocks
+    assert est.done * est.blocksize + est.maxlag <= 5000
+    buffer.write_next(recording[5000:, None])
+    est.update(view, finish=True)
+    assert est.complete
+    assert est.estimate() == pytest.approx([37.3], abs=0.02)
+    assert est.align(view).data[0, 0] == recording[37]
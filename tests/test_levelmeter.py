@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.levelmeter`.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom.utils.levelmeter import SoundLevelMeter, weighting_sos, _sos_response
+
+
+# IEC 61672-1 weightings, in decibel, at the exact base 10 frequencies of nominal
+# 31.5, 100, 1k, 4k, 10k and 16k Hz.
+_FREQS = 10**np.array([1.5, 2., 3., 3.6, 4., 4.2])
+_TABLE = {'A': [-39.4, -19.1, 0., 1.0, -2.5, -6.6],
+          'C': [-3.0, -0.3, 0., -0.8, -4.4, -8.5]}
+
+
+@pytest.mark.parametrize('samplerate', [44100, 48000, 96000])
+@pytest.mark.parametrize('frequency', ['A', 'C'])
+def test_weighting_matches_nominal_table(frequency, samplerate):
+    resp = 20 * np.log10(np.abs(_sos_response(weighting_sos(frequency, samplerate), _FREQS, samplerate)))
+    nominal = np.array(_TABLE[frequency])
+    low = _FREQS < 5000.
+    assert resp[low] == pytest.approx(nominal[low], abs=0.1)
+    # Well inside the class 1 tolerances close to Nyquist.
+    assert resp[~low] == pytest.approx(nominal[~low], abs=0.6)
+
+
+def test_unknown_weightings_raise():
+    with pytest.raises(ValueError):
+        weighting_sos('B')
+    with pytest.raises(ValueError):
+        SoundLevelMeter(time='peak')
+
+
+def test_level_of_a_sine():
+    t = np.arange(48000) / 48000
+    x = np.stack([np.sin(2 * np.pi * 1000. * t), 0.1 * np.sin(2 * np.pi * 100. * t)], axis=1)
+    slm = SoundLevelMeter(48000, nchannels=2, frequency='A', time='fast', decimation=4800)
+    traces = np.concatenate([slm.process(block).copy() for block in np.split(x, [1000, 30000])])
+    assert traces.shape == (10, 2) and slm.count == 48000
+    expected = [10 * np.log10(0.5), 10 * np.log10(0.005) - 19.1]
+    assert traces[-1] == pytest.approx(expected, abs=0.2)
+    assert slm.leq[0] == pytest.approx(expected, abs=0.2)
+    assert traces[0, 0] < traces[-1, 0]
+
+
+def test_blocks_match_one_call():
+    x = np.random.default_rng(2).standard_normal((9600, 1))
+    whole = SoundLevelMeter(48000, decimation=100).process(x).copy()
+    slm = SoundLevelMeter(48000, decimation=100)
+    parts = np.concatenate([slm.process(block).copy() for block in np.split(x, [37, 150, 5000])])
+    assert np.allclose(parts, whole)
+    slm.reset()
+    assert slm.count == 0 and np.all(slm.leq < -200)
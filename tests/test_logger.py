@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.logger`.
+
+Created on Mon Oct 19 2026
+"""
+
+import os
+import sys
+import subprocess
+import numpy as np
+import pytest
+from ossom.utils.logger import Logger, MetricsLog, load_metrics, log_segments, read_log, _append_index, _LogQueue
+
+
+def _rows(nrows: int, start: int = 0):
+    times = 1e9 + np.arange(start, start + nrows, dtype=np.float64)
+    values = np.arange(start * 6, (start + nrows) * 6, dtype=np.float32).reshape((nrows, 3, 2))
+    return times, values
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_metrics_round_trip(tmp_path, mmap):
+    name = str(tmp_path / 'levels')
+    mlog = MetricsLog(name, nchannels=2, metrics=('rms', 'peak', 'crest'), chunksize=4)
+    times, values = _rows(10)
+    for row in range(7):
+        mlog.append(values[row], times[row])
+    mlog.extend(values[7:], times[7:])
+    mlog.close()
+    mlog = MetricsLog(name, nchannels=2, metrics=('rms', 'peak', 'crest'), chunksize=4)
+    more, morevalues = _rows(3, 10)
+    for row in range(3):
+        mlog.append(morevalues[row], more[row])
+    assert mlog.pending == 3
+    mlog.close()
+    got, gotvalues, names = load_metrics(name + '.mlog', mmap=mmap)
+    assert names == ('rms', 'peak', 'crest')
+    assert np.array_equal(got, np.concatenate((times, more)))
+    assert np.array_equal(gotvalues, np.concatenate((values, morevalues)))
+    got, gotvalues, names = load_metrics(name + '.mlog', mmap=mmap, metrics=('crest', 'rms'))
+    assert names == ('crest', 'rms')
+    assert np.array_equal(gotvalues, np.concatenate((values, morevalues))[:, [2, 0]])
+
+
+def test_single_block_and_empty_file(tmp_path):
+    name = str(tmp_path / 'one')
+    mlog = MetricsLog(name, nchannels=2, metrics=('a', 'b', 'c'))
+    assert load_metrics(name + '.mlog')[1].shape == (0, 3, 2)
+    times, values = _rows(5)
+    mlog.extend(values, times)
+    mlog.close()
+    got, gotvalues, _ = load_metrics(name + '.mlog')
+    assert np.array_equal(got, times) and np.array_equal(gotvalues, values)
+
+
+def test_partial_block_is_dropped(tmp_path):
+    name = str(tmp_path / 'cut')
+    mlog = MetricsLog(name, nchannels=2, metrics=('a', 'b', 'c'))
+    times, values = _rows(8)
+    mlog.extend(values[:4], times[:4])
+    mlog.extend(values[4:], times[4:])
+    mlog.close()
+    with open(name + '.mlog', 'r+b') as file:
+        file.truncate(file.seek(0, 2) - 10)
+    assert np.array_equal(load_metrics(name + '.mlog')[0], times[:4])
+    mlog = MetricsLog(name, nchannels=2, metrics=('a', 'b', 'c'))
+    mlog.extend(values[4:], times[4:])
+    mlog.close()
+    assert np.array_equal(load_metrics(name + '.mlog')[1], values)
+
+
+def test_other_schema_is_refused(tmp_path):
+    name = str(tmp_path / 'schema')
+    MetricsLog(name, nchannels=2).close()
+    with pytest.raises(ValueError):
+        MetricsLog(name, nchannels=3)
+    with pytest.raises(ValueError):
+        load_metrics(name + '.mlog', metrics=('peak',))
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+def test_rotation_caps_segment_size(tmp_path, asynchronous):
+    name = str(tmp_path / 'r')
+    logger = Logger(name, asynchronous=asynchronous, flushtime=10., maxbytes=200, compress=False)
+    for k in range(50):
+        logger.log(f'message {k:02d}')
+    logger.fclose()
+    segments = log_segments(name)
+    assert len(segments) > 1
+    for entry in segments:
+        assert os.path.getsize(entry['file']) <= 200
+    lines = read_log(name).splitlines()
+    assert [line[-10:] for line in lines] == [f'message {k:02d}' for k in range(50)]
+
+
+def _dead_pid() -> int:
+    proc = subprocess.Popen([sys.executable, '-c', 'pass'])
+    proc.wait()
+    return proc.pid
+
+
+def test_recovery_skips_segments_of_live_processes(tmp_path):
+    name = str(tmp_path / 'c')
+    for seq, pid in ((1, os.getppid()), (2, _dead_pid())):
+        plain = f'{name}.{seq:06d}.log'
+        with open(plain, 'w') as file:
+            file.write(f'segment {seq}\n')
+        _append_index(name, 'log', {'seq': seq, 'file': plain + '.gz', 'start': 0., 'end': 1., 'pid': pid})
+    Logger(name, maxbytes=1000).fclose()
+    assert os.path.exists(f'{name}.000001.log') and not os.path.exists(f'{name}.000001.log.gz')
+    assert os.path.exists(f'{name}.000002.log.gz') and not os.path.exists(f'{name}.000002.log')
+    assert read_log(name) == 'segment 1\nsegment 2\n'
+
+
+def test_log_queue_is_bounded_and_ordered():
+    ring = _LogQueue(3)
+    assert [ring.put(k) for k in range(4)] == [True, True, True, False]
+    assert len(ring) == 3 and ring.get_all() == [0, 1, 2] and len(ring) == 0
+    assert ring.put(3) and ring.put(4)
+    assert ring.get_all() == [3, 4] and ring.get_all() == []
+
+
+def test_asynchronous_log_keeps_order_and_counts_drops(tmp_path):
+    name = str(tmp_path / 'a')
+    logger = Logger(name, title='async', asynchronous=True, queuesize=8, flushtime=10.)
+    logger.start_log()
+    queued = [logger.log(f'message {k:02d}') for k in range(10)]
+    assert queued == [1] * 7 + [0] * 3 and logger.dropped == 3
+    logger.flush()
+    assert [logger.log(f'message {k:02d}') for k in range(7, 10)] == [1, 1, 1]
+    logger.end_log()
+    logger.fclose()
+    with open(f'{name}.log') as file:
+        text = file.read()
+    assert text.startswith(logger.header) and text.endswith(logger.logend)
+    lines = [line for line in text.splitlines() if ' : message ' in line]
+    assert [line[-10:] for line in lines] == [f'message {k:02d}' for k in range(10)]
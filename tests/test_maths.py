@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.maths`, against numpy.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom.utils import maths
+from ossom.utils.maths import max_abs, rms, mean, mean_square, crest_factor, MeanSquare, Leq, PeakHold, MinMax
+
+
+def _reference(data: np.ndarray) -> dict:
+    data = data.astype(np.float64)
+    msq = (data**2).mean(axis=0, keepdims=True)
+    peak = np.abs(data).max(axis=0, keepdims=True)
+    return {max_abs: peak, rms: msq**0.5, mean: data.mean(axis=0, keepdims=True),
+            mean_square: msq, crest_factor: peak / msq**0.5}
+
+
+@pytest.mark.parametrize('shape', [(1, 1), (1000, 1), (1024, 2), (5000, 3), (3000, 17)])
+@pytest.mark.parametrize('dtype', [np.float32, np.float64])
+def test_reductions_match_numpy(shape, dtype):
+    data = np.random.default_rng(0).standard_normal(shape).astype(dtype)
+    for func, expected in _reference(data).items():
+        result = func(data)
+        assert result.shape == (1, shape[1]) and result.dtype == np.float64
+        assert np.allclose(result, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize('outtype', [np.float32, np.float64])
+def test_reductions_write_out(outtype):
+    data = np.random.default_rng(1).standard_normal((2048, 4)).astype(np.float32)
+    for func, expected in _reference(data).items():
+        out = np.zeros((1, 4), dtype=outtype)
+        result = func(data, out)
+        assert result is out
+        assert np.allclose(out, expected, rtol=1e-5)
+
+
+def test_reductions_on_strided_views():
+    data = np.random.default_rng(2).standard_normal((4000, 6))
+    view = data[::3, 1::2]
+    for func, expected in _reference(view).items():
+        assert np.allclose(func(view), expected)
+
+
+def test_crest_factor_of_silence_is_zero():
+    assert np.array_equal(crest_factor(np.zeros((100, 2))), np.zeros((1, 2)))
+
+
+def test_warmup_covers_each_dtype_once():
+    maths.warmup((np.float32, np.float64), 3)
+    assert {(np.dtype(np.float32), 3), (np.dtype(np.float64), 3)} <= maths._warmed
+    calls = []
+    maths._warmups.append(calls.append)
+    try:
+        maths.warmup(np.float64, 3)
+    finally:
+        maths._warmups.remove(calls.append)
+    assert calls == []
+
+
+def test_streaming_meters_match_whole_signal():
+    data = np.random.default_rng(6).standard_normal((10000, 3)).astype(np.float32)
+    msq, leq, minmax = MeanSquare(3), Leq(3, ref=0.5), MinMax(3)
+    for start in range(0, 10000, 777):
+        block = data[start:start + 777]
+        msq.update(block)
+        leq.update(block)
+        minmax.update(block)
+    expected = (data.astype(np.float64)**2).mean(axis=0, keepdims=True)
+    assert msq.count == 10000 and np.allclose(msq.value, expected)
+    assert np.allclose(msq.rms, expected**0.5)
+    assert np.allclose(leq.level, 10 * np.log10(expected / 0.25))
+    assert np.array_equal(minmax.min, data.min(axis=0, keepdims=True))
+    assert np.array_equal(minmax.max, data.max(axis=0, keepdims=True))
+    msq.reset()
+    assert msq.count == 0 and not msq.value.any()
+
+
+def test_peak_hold_and_decay():
+    meter = PeakHold(1, samplerate=1000, holdtime=0.1, decay=20.)
+    block = np.zeros((1000, 1))
+    block[0] = -0.5
+    meter.update(block[:101])
+    assert meter.value[0, 0] == 0.5
+    meter.update(block[101:])
+    # Held for 100 samples, then 20 dB per second over the remaining 899.
+    assert meter.value[0, 0] == pytest.approx(0.5 * 10**(-20 / 20 * 0.899), rel=1e-3)
+    meter.update(np.full((1, 1), 0.9))
+    assert meter.value[0, 0] == 0.9
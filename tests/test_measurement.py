@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.measurement`.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom import Audio
+from ossom.measurement import SweepMeasurement
+
+
+def _delayed(signal: np.ndarray, delay: int, nsamples: int) -> np.ndarray:
+    out = np.zeros(nsamples)
+    out[delay:delay + signal.shape[0]] = signal
+    return out
+
+
+def test_deconvolution_recovers_delay_and_gain():
+    meas = SweepMeasurement(48000, freqMin=50., freqMax=20000., duration=1., silence=0.5)
+    sweep = meas.sweep
+    recording = np.stack([_delayed(0.5 * sweep, 100, meas.nrecord),
+                          _delayed(-0.25 * sweep, 1234, meas.nrecord)], axis=1)
+    ir = meas.deconvolve(Audio(recording, 48000))
+    assert ir is meas.ir and ir.nsamples == meas.nfft(meas.nrecord)
+    assert np.argmax(np.abs(ir.data), axis=0).tolist() == [100, 1234]
+    spec = np.fft.rfft(ir.data, axis=0)
+    freqs = np.fft.rfftfreq(ir.nsamples, 1 / 48000)
+    band = (freqs > 200.) & (freqs < 10000.)
+    expected = np.stack([0.5 * np.exp(-2j * np.pi * freqs * 100 / 48000),
+                         -0.25 * np.exp(-2j * np.pi * freqs * 1234 / 48000)], axis=1)
+    assert np.allclose(spec[band], expected[band], rtol=0.02, atol=5e-3)
+
+
+def test_harmonics_are_separated():
+    meas = SweepMeasurement(48000, freqMin=50., freqMax=10000., duration=2., silence=0.5)
+    x = _delayed(meas.sweep, 0, meas.nrecord)
+    meas.deconvolve(x + 0.1 * x**2)
+    linear, second, third = meas.harmonics(3, length=2048)
+    energy = [np.sum(h.data**2) for h in (linear, second, third)]
+    assert energy[0] > 100 * energy[1] > 100 * energy[2]
+    assert np.argmax(np.abs(linear.data[:, 0])) == 0
+    assert meas.rate * 50. == pytest.approx(round(meas.rate * 50.))
+
+
+def test_excitation_and_errors():
+    meas = SweepMeasurement(48000, duration=0.5, silence=0.25, level=-6.)
+    exc = meas.excitation(3, blocksize=256)
+    assert exc.data.shape == (meas.nrecord, 3) and exc.blocksize == 256
+    assert np.max(np.abs(exc.data)) == pytest.approx(10**(-6 / 20), rel=1e-3)
+    assert not np.any(exc.data[meas.nsamples:])
+    assert meas.inverse(1 << 16) is meas.inverse(1 << 16)
+    with pytest.raises(ValueError):
+        SweepMeasurement(48000, freqMin=1000., freqMax=500.)
+    with pytest.raises(ValueError):
+        SweepMeasurement(48000, freqMax=30000.)
+    with pytest.raises(ValueError):
+        SweepMeasurement(48000).harmonics()
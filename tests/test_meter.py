@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.meter` and `ossom.utils.colore`.
+
+Created on Mon Oct 19 2026
+"""
+
+import io
+import numpy as np
+import pytest
+from ossom.utils import TerminalMeter, colorir
+from ossom.utils.colore import ColorNameError
+
+
+def _meter(**kwargs) -> tuple:
+    stream = io.StringIO()
+    return TerminalMeter(stream=stream, **kwargs), stream
+
+
+def test_first_frame_draws_all_rows():
+    meter, stream = _meter(nchannels=2, width=10, labels=['left', 'right'])
+    assert meter.update([-30., -np.inf], force=True)
+    frame = stream.getvalue()
+    assert frame.startswith('\x1b[?25l') and frame.count('\n') == 2
+    assert 'left  [' in frame and 'right [' in frame
+    assert ' -30.0 dB' in frame and '  -inf dB' in frame
+    assert meter.frames == 1 and meter.bytes == len(frame.encode())
+
+
+def test_only_changes_are_redrawn():
+    meter, stream = _meter(nchannels=4, width=20, fps=1e-3)
+    meter.update(np.full(4, -30.), force=True)
+    size = len(stream.getvalue())
+    # Frames are rate limited, but the update is kept.
+    assert not meter.update(np.full(4, -30.))
+    meter.draw()
+    assert len(stream.getvalue()) == size and meter.frames == 1
+    meter.update([-30., -30., -27., -30.], force=True)
+    frame = stream.getvalue()[size:]
+    assert frame.count('\x1b[') < 12 and ' -27.0 dB' in frame
+    assert frame.count('█') == 1
+
+
+def test_peak_hold_and_clip():
+    meter, stream = _meter(width=10, holdtime=60.)
+    meter.update([-30.], [0.], force=True)
+    frame = stream.getvalue()
+    assert '|' in frame and 'CLIP' in frame
+    meter.update([-30.], [-50.], force=True)
+    assert 'CLIP' not in stream.getvalue()[len(frame):]
+    assert meter._hold[0] == 0.
+    meter.close()
+    assert stream.getvalue().endswith('\x1b[?25h')
+
+
+def test_colorir_defaults_and_errors():
+    assert colorir('text') == 'text'
+    assert colorir('text', 'red') == '\x1b[31mtext\x1b[0m'
+    assert colorir('text', bgrclr='red').endswith('text\x1b[0m')
+    with pytest.raises(ColorNameError):
+        colorir('text', 'ultraviolet')
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.monitor.MonitorStats`.
+
+Created on Mon Oct 19 2026
+"""
+
+import io
+import numpy as np
+import pytest
+from ossom.monitor import MonitorStats
+
+
+def test_record_and_summary():
+    stats = MonitorStats(48000, nbins=16, minduration=1e-6)
+    for duration, lag, jitter in ((1e-3, 480, 1e-4), (3e-3, 4800, 2e-4), (2e-3, -5, 0.)):
+        stats.record(duration, lag, jitter)
+    summary = stats.summary()
+    assert summary['count'] == 3 and summary['underruns'] == 1
+    assert summary['mean_duration'] == pytest.approx(2e-3)
+    assert (summary['max_duration'], summary['last_duration']) == (3e-3, 2e-3)
+    assert (summary['max_lag'], summary['last_lag']) == (4800, 0)
+    assert summary['max_jitter'] == 2e-4 and summary['latency'] == 0.
+    stats.reset()
+    assert stats.count == 0 and not stats.duration_histogram()[1].any()
+
+
+@pytest.mark.parametrize('value', [0, 1, 2, 3, 1000, 1024, 2**20])
+def test_lag_bins_follow_edges(value):
+    stats = MonitorStats(48000, nbins=16)
+    stats.record(1e-3, value)
+    edges, counts = stats.lag_histogram()
+    k = int(np.flatnonzero(counts)[0])
+    assert counts.sum() == 1
+    assert value < edges[k] or k == stats.nbins - 1
+    assert k == 0 or value >= edges[k - 1]
+
+
+@pytest.mark.parametrize('value', [1e-7, 1e-6, 1.5e-5, 1e-3, 10.])
+def test_duration_bins_follow_edges(value):
+    stats = MonitorStats(48000, nbins=24, minduration=1e-6)
+    stats.record(value, 0)
+    edges, counts = stats.duration_histogram()
+    k = int(np.flatnonzero(counts)[0])
+    assert value < edges[k] or k == stats.nbins - 1
+    assert k == 0 or value >= edges[k - 1]
+
+
+def test_dump_writes_one_line():
+    stats = MonitorStats(48000)
+    stats.record(1e-3, 10)
+    out = io.StringIO()
+    stats.dump(out)
+    assert out.getvalue().count('\n') == 1 and 'count=1' in out.getvalue()
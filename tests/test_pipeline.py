@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.pipeline`, with stages on threads.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom.pipeline import Pipeline, Stage, StageBuffer
+
+
+def _source(nsamples: int = 5000) -> StageBuffer:
+    return StageBuffer(48000, nsamples, 2, 256, np.dtype('float64'))
+
+
+def test_stages_process_every_sample_in_order():
+    source = _source()
+    seen = []
+    pipe = Pipeline(source, [Stage('sum', lambda x: x.sum(axis=1), 'gain', nchannels=1, process=False),
+                             Stage('gain', lambda x: 2 * x, blocksize=100, process=False),
+                             Stage('store', lambda x: seen.append(x.copy()), 'sum', nchannels=None,
+                                   blocksize=300, process=False)])
+    assert [stg.name for stg in pipe.stages] == ['gain', 'sum', 'store']
+    data = np.random.default_rng(5).standard_normal((4321, 2))
+    pipe.start(timeout=5.)
+    source.running.set()
+    for start in range(0, data.shape[0], 1000):
+        source.write_next(data[start:start + 1000])
+    source.finished.set()
+    pipe.wait()
+    assert np.allclose(pipe['gain'].data[:4321], 2 * data)
+    assert np.allclose(np.vstack(seen)[:, 0], 2 * data.sum(axis=1))
+    metrics = pipe.metrics()
+    assert metrics['store']['read'] == 4321 and metrics['store']['written'] is None
+    assert all(entry['depth'] == 0 and entry['dropped'] == 0 for entry in metrics.values())
+
+
+def test_full_output_counts_dropped_samples():
+    source = _source()
+    pipe = Pipeline(source, [Stage('copy', lambda x: x, process=False)], buffersize=1000)
+    pipe.start(timeout=5.)
+    source.running.set()
+    source.write_next(np.ones((3000, 2)))
+    pipe.stop()
+    assert pipe['copy'].widx == 1000 and pipe.metrics()['copy']['dropped'] == 2000
+
+
+@pytest.mark.parametrize('stages', [
+    [Stage('a', None), Stage('a', None)],
+    [Stage('a', None, 'missing')],
+    [Stage('a', None, 'b'), Stage('b', None, 'a')],
+])
+def test_bad_graphs(stages):
+    with pytest.raises(ValueError):
+        Pipeline(_source(), stages)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.results.ResultRing`.
+
+Created on Mon Oct 19 2026
+"""
+
+import gc
+import threading as td
+import time
+import numpy as np
+import pytest
+from ossom.results import ResultRing
+
+
+unraisable = pytest.mark.filterwarnings('error::pytest.PytestUnraisableExceptionWarning')
+
+
+def test_publish_latest_history():
+    ring = ResultRing(None, shape=(2,), dtype='float32', nslots=4)
+    for value in range(6):
+        ring.publish([value, -value], timestamp=float(value))
+    assert ring.count == 6 and len(ring) == 4
+    assert np.array_equal(ring.latest(), [5, -5])
+    assert np.array_equal(ring.history()[:, 0], [2, 3, 4, 5])
+    assert np.array_equal(ring.timestamps(2), [4., 5.])
+
+
+def test_extend_keeps_the_latest_slots():
+    ring = ResultRing(None, shape=(1,), dtype='float64', nslots=4)
+    ring.publish(0.)
+    ring.extend(np.arange(1., 11.)[:, None])
+    assert ring.count == 11
+    assert np.array_equal(ring.history()[:, 0], [7., 8., 9., 10.])
+
+
+def test_attach_by_name():
+    ring = ResultRing(None, shape=(3,), dtype='int32', nslots=8)
+    ring.publish([1, 2, 3])
+    other = ResultRing(ring.name)
+    assert other.shape == (3,) and other.dtype == np.int32 and other.nslots == 8
+    assert np.array_equal(other.latest(), [1, 2, 3])
+    del other
+    ring.publish([4, 5, 6])
+    assert np.array_equal(ring.latest(), [4, 5, 6])
+
+
+def test_latest_is_a_copy():
+    ring = ResultRing(None, shape=(1,), nslots=2)
+    ring.publish(1.)
+    value = ring.latest()
+    ring.extend(np.full((2, 1), 9.))
+    assert value[0] == 1.
+
+
+def test_latest_waits_for_a_write_in_progress():
+    ring = ResultRing(None, shape=(1,), nslots=2)
+    ring.publish(1.)
+    ring._header[8] += 1  # a producer started writing
+
+    def finish():
+        time.sleep(0.05)
+        ring._data[1] = ring._data[3] = 2.
+        ring._header[0] += 1
+        ring._header[8] += 1
+
+    thread = td.Thread(target=finish)
+    thread.start()
+    assert ring.latest()[0] == 2.
+    thread.join()
+
+
+@unraisable
+def test_del_with_arrays_in_use():
+    ring = ResultRing(None, shape=(2,), nslots=4)
+    ring.publish([1., 2.])
+    hist = ring.history()
+    del ring
+    gc.collect()
+    assert np.array_equal(hist[-1], [1., 2.])
+
+
+@unraisable
+def test_del_after_failed_init():
+    with pytest.raises(ValueError):
+        ResultRing(None)
+    gc.collect()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.shmpool` and of `AudioBuffer`s on its segments.
+
+Created on Mon Oct 19 2026
+"""
+
+import gc
+import numpy as np
+import pytest
+from ossom import shmpool
+from ossom.audio import AudioBuffer
+from ossom.shmpool import SegmentPool
+
+
+@pytest.fixture
+def pool():
+    pool = SegmentPool()
+    yield pool
+    pool.clear()
+
+
+def test_segments_are_reused_and_zeroed(pool):
+    name, lease = pool.acquire(10000)
+    lease[:] = 7
+    del lease
+    gc.collect()
+    again, lease = pool.acquire(9000)
+    assert again == name and pool.reused == 1
+    assert not lease.any()
+
+
+def test_views_keep_the_lease(pool):
+    name, lease = pool.acquire(10000)
+    view = lease[100:200]
+    del lease
+    gc.collect()
+    assert pool.acquire(10000)[0] != name
+    assert pool.leased == 2
+    del view
+
+
+def test_segments_leased_on_fork_are_not_reused(pool):
+    name, lease = pool.acquire(10000)
+    shmpool._before_fork()
+    del lease
+    gc.collect()
+    assert pool.acquire(10000)[0] != name
+    assert not shmpool._exists(name)
+
+
+def test_attached_segment_outlives_its_pool(pool):
+    name, lease = pool.acquire(1000)
+    lease[:] = 3
+    seg, data = SegmentPool.attach(name, 1000)
+    del lease
+    gc.collect()
+    assert pool.acquire(1000)[0] != name
+    pool.clear()
+    assert shmpool._exists(name) and np.all(data == 3)
+    del data
+    SegmentPool.detach(seg)
+    assert not shmpool._exists(name)
+
+
+def test_attached_buffer_sees_the_data():
+    buffer = AudioBuffer(None, 48000, 1000, 2, 100, np.dtype('float32'))
+    buffer.write_next(np.ones((10, 2), dtype=np.float32))
+    other = AudioBuffer(buffer.name, 48000, 1000, 2, 100, np.dtype('float32'))
+    assert np.array_equal(other.data[:10], np.ones((10, 2)))
+    name = buffer.name
+    del buffer
+    gc.collect()
+    fresh = AudioBuffer(None, 48000, 1000, 2, 100, np.dtype('float32'))
+    assert fresh.name != name and not fresh.data.any()
+    assert np.array_equal(other.data[:10], np.ones((10, 2)))
+    del other
+    assert not shmpool._exists(name)
+
+
+@pytest.mark.parametrize('pooled', [True, False])
+def test_buffer_deleted_under_views(pooled):
+    buffer = AudioBuffer(None, 48000, 1000, 1, 100, np.dtype('float32'), pooled=pooled)
+    view = buffer.get_audio()
+    buffer.write_next(np.full((5, 1), 2., dtype=np.float32))
+    del buffer
+    gc.collect()
+    assert np.all(view.data[:5] == 2.)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.utils.spectral`.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom.audio import Audio, AudioBuffer
+from ossom.utils.spectral import FFTBandEstimator, STFT, TransferFunction
+
+
+def _system(nsamples: int = 48000, delay: int = 0):
+    x = np.random.default_rng(4).standard_normal(nsamples)
+    y = np.zeros((nsamples + delay, 2))
+    y[delay:, 0] = 0.5 * x
+    y[delay + 1:, 1] = -x[:-1]
+    return x, y
+
+
+def test_transfer_function_of_known_system():
+    x, y = _system(delay=100)
+    tf = TransferFunction(48000, nchannels=2, blocksize=1024, delay=100)
+    assert tf.update(Audio(x, 48000), Audio(y, 48000)) == (48000 - 1024) // 512 + 1
+    expected = np.stack([np.full(tf.nbins, 0.5), -np.exp(-2j * np.pi * tf.freqs / 48000)], axis=1)
+    assert np.allclose(tf.h1, expected, atol=1e-2)
+    assert np.allclose(tf.h2, expected, atol=1e-2)
+    assert np.all(tf.coherence > 0.99)
+
+
+def test_live_view_stops_at_written_samples():
+    x, y = _system()
+    buffer = AudioBuffer(None, 48000, y.shape[0], 2, 256, np.dtype('float64'))
+    view = buffer.get_audio()
+    reference = Audio(x, 48000)
+    tf = TransferFunction(48000, nchannels=2, blocksize=1024)
+    assert tf.update(reference, view) == 0
+    buffer.write_next(y[:10000])
+    tf.update(reference, view)
+    assert tf.position - tf.hop + tf.blocksize <= 10000
+    buffer.write_next(y[10000:])
+    tf.update(reference, view)
+    whole = TransferFunction(48000, nchannels=2, blocksize=1024)
+    whole.update(reference, Audio(y, 48000))
+    assert tf.count == whole.count
+    assert np.allclose(tf.h1, whole.h1) and np.allclose(tf.coherence, whole.coherence)
+
+
+def test_band_power_of_a_sine():
+    t = np.arange(16384) / 48000
+    x = np.stack([np.sin(2 * np.pi * 1000. * t), 0.1 * np.sin(2 * np.pi * 4000. * t)], axis=1)
+    est = FFTBandEstimator(3, (100., 10000.), samplerate=48000, blocksize=16384)
+    power = est.powers(x)
+    assert est.center[np.argmax(power[:, 0])] == 1000.
+    assert est.center[np.argmax(power[:, 1])] == 4000.
+    assert power.sum(axis=0) == pytest.approx([0.5, 0.005], rel=0.01)
+
+
+def test_bins_sum_to_signal_power():
+    x = np.random.default_rng(1).standard_normal((8192, 1))
+    est = FFTBandEstimator(2, (20., 20000.), base=2, samplerate=48000, blocksize=8192, window='rect')
+    assert est.matrix.sum(axis=0)[10:3400] == pytest.approx(2 / 8192**2)
+    wide = FFTBandEstimator(2, (1., 24000.), base=2, samplerate=48000, blocksize=8192, window='rect')
+    assert wide.powers(x).sum() == pytest.approx(np.mean(x**2), rel=1e-3)
+    blocks = est.powers(np.concatenate([x, x]))
+    assert np.allclose(blocks, est.powers(x))
+
+
+def _hann(size: int) -> np.ndarray:
+    return 0.5 - 0.5 * np.cos(2 * np.pi * np.arange(size) / size)
+
+
+def test_stft_matches_windowed_rfft():
+    x = np.random.default_rng(3).standard_normal((5000, 2))
+    stft = STFT(48000, nchannels=2, blocksize=512, hop=128, scale='power', nslots=64)
+    spectra = stft.update(Audio(x, 48000)).copy()
+    nframes = (5000 - 512) // 128 + 1
+    win = _hann(512)
+    frames = np.stack([x[k*128:k*128+512] * (2 * win / win.sum())[:, None] for k in range(nframes)])
+    assert spectra.shape == (nframes, 257, 2)
+    assert np.allclose(spectra, np.abs(np.fft.rfft(frames, axis=1))**2)
+    assert stft.ring.count == nframes
+    assert np.allclose(stft.ring.history(1)[0], spectra[-1])
+
+
+def test_stft_scales_a_sine_to_unit_peak():
+    t = np.arange(4096) / 48000
+    x = np.sin(2 * np.pi * 48000 / 1024 * 40 * t)[:, None]
+    mag = STFT(48000, blocksize=1024, scale='magnitude').update(Audio(x, 48000))
+    assert np.allclose(mag[:, 40, 0], 1.)
+    level = STFT(48000, blocksize=1024, scale='dB').update(Audio(x, 48000))
+    assert np.allclose(level[:, 40, 0], 0., atol=1e-6)
+    with pytest.raises(ValueError):
+        STFT(scale='phase')
+
+
+def test_stft_keeps_overlap_across_updates():
+    x = np.random.default_rng(5).standard_normal((6000, 1))
+    buffer = AudioBuffer(None, 48000, 6000, 1, 256, np.dtype('float64'))
+    view = buffer.get_audio()
+    stft = STFT(48000, blocksize=1024, hop=256)
+    parts = []
+    for stop in (700, 1500, 1501, 6000):
+        buffer.write_next(x[buffer.widx:stop])
+        parts.append(stft.update(view).copy())
+    whole = STFT(48000, blocksize=1024, hop=256).update(Audio(x, 48000))
+    assert np.allclose(np.concatenate(parts), whole)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of `ossom.trigger`, on known event positions.
+
+Created on Mon Oct 19 2026
+"""
+
+import numpy as np
+import pytest
+from ossom import Recorder, Trigger, LevelDetector, CrestDetector
+
+
+FS = 8000
+FRAME = 64
+SCALE = 1e-7  # channel 0 carries the sample index, far below the trigger level
+
+
+def _signal(nsamples: int, bursts: list, burstsize: int = 200) -> np.ndarray:
+    data = np.zeros((nsamples, 2))
+    data[:, 0] = np.arange(nsamples) * SCALE
+    for start in bursts:
+        data[start:start + burstsize, 1] = 1.
+    return data
+
+
+def _feed(trigger: Trigger, data: np.ndarray, blocksizes: list) -> None:
+    pos, k = 0, 0
+    while pos < data.shape[0]:
+        size = blocksizes[k % len(blocksizes)]
+        trigger(data[pos:pos + size])
+        pos, k = pos + size, k + 1
+    return
+
+
+@pytest.mark.parametrize('blocksizes', [[FRAME], [100], [333, 17, 1024], [5000]])
+def test_pre_and_post_trigger_boundaries(blocksizes):
+    bursts = [FRAME * 40, FRAME * 100 + 10 * FRAME, FRAME * 300]
+    data = _signal(FRAME * 400, bursts)
+    trg = Trigger(LevelDetector(on=-20., off=-40., framesize=FRAME), FS, 2,
+                  pretime=1000 / FS, posttime=1500 / FS, dtype=np.float64)
+    _feed(trg, data, blocksizes)
+    assert [index for _, index in trg.events] == bursts
+    for (audio, index) in trg.events:
+        assert audio.data.shape == (trg.npre + trg.npost, 2)
+        expected = np.arange(index - trg.npre, index + trg.npost)
+        # Samples before the stream started are zeros.
+        expected[expected < 0] = 0
+        assert np.array_equal(np.round(audio.data[:, 0] / SCALE), expected)
+        assert np.all(audio.data[trg.npre:trg.npre + 200, 1] == 1.)
+        assert np.all(audio.data[:trg.npre, 1] == 0.)
+
+
+def test_triggers_during_capture_are_ignored():
+    data = _signal(FRAME * 100, [FRAME * 10, FRAME * 20])
+    trg = Trigger(LevelDetector(on=-20., off=-40., framesize=FRAME), FS, 2,
+                  pretime=0.01, posttime=FRAME * 30 / FS, dtype=np.float64)
+    _feed(trg, data, [256])
+    assert [index for _, index in trg.events] == [FRAME * 10]
+
+
+def test_event_at_stream_start_and_unfinished_capture():
+    data = _signal(FRAME * 20, [0])
+    trg = Trigger(LevelDetector(on=-20., framesize=FRAME), FS, 2,
+                  pretime=0.05, posttime=1., dtype=np.float64)
+    _feed(trg, data, [128])
+    assert trg.capturing and not trg.events
+    assert trg.count == FRAME * 20
+
+
+def test_crest_detector_finds_an_impulse():
+    rng = np.random.default_rng(1)
+    data = 0.01 * rng.standard_normal((FRAME * 50, 1))
+    data[FRAME * 30 + 5] = 1.
+    det = CrestDetector(on=12., framesize=FRAME)
+    offsets = np.concatenate([det(data[k:k + 100]) + k for k in range(0, data.shape[0], 100)])
+    assert list(offsets) == [FRAME * 30]
+
+
+class _BurstStream(object):
+
+    def __init__(self, data):
+        self.data, self.pos = data, 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return
+
+    def record(self, nsamples):
+        block = self.data[self.pos:self.pos + nsamples]
+        self.pos += nsamples
+        return np.pad(block, ((0, nsamples - block.shape[0]), (0, 0)))
+
+    def flush(self):
+        return self.data[:0]
+
+
+class _BurstDevice(object):
+    name = id = 'burst'
+    channels = 2
+
+    def __init__(self, data):
+        self.data = data
+
+    def recorder(self, samplerate, channels, blocksize):
+        return _BurstStream(self.data)
+
+
+def test_trigger_as_recorder_hook():
+    data = _signal(FRAME * 200, [FRAME * 120]).astype(np.float32)
+    trg = Trigger(LevelDetector(on=-20., framesize=FRAME), FS, 2,
+                  pretime=0.02, posttime=0.05, dtype=np.float32)
+    rec = Recorder(_BurstDevice(data), FS, 256, [0, 1], FRAME * 200, np.dtype('float32'), hook=trg)
+    rec(FRAME * 200 / FS, blocking=True)
+    assert [index for _, index in trg.events] == [FRAME * 120]
+    assert np.array_equal(trg.events[0][0].data[:, 1], data[FRAME * 120 - trg.npre:FRAME * 120 + trg.npost, 1])